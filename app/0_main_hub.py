@@ -2,6 +2,8 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime
 
+from theme import apply_theme
+
 # Configure page
 st.set_page_config(
     page_title="🧠 Personality Discovery Hub",
@@ -11,155 +13,7 @@ st.set_page_config(
 )
 
 # Custom CSS for the hub
-st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-    
-    .main {
-        font-family: 'Inter', sans-serif;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        min-height: 100vh;
-        padding: 2rem 1rem;
-    }
-    
-    .hub-header {
-        text-align: center;
-        font-size: 3.5rem;
-        font-weight: 700;
-        margin-bottom: 1rem;
-        text-shadow: 3px 3px 6px rgba(0,0,0,0.3);
-        background: linear-gradient(45deg, #ff6b6b, #4ecdc4, #45b7d1, #96ceb4, #ff9a56);
-        background-size: 400% 400%;
-        animation: gradient 5s ease infinite;
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-    }
-    
-    .hub-subtitle {
-        text-align: center;
-        font-size: 1.3rem;
-        margin-bottom: 3rem;
-        color: rgba(255, 255, 255, 0.9);
-        font-weight: 300;
-    }
-    
-    @keyframes gradient {
-        0% { background-position: 0% 50%; }
-        50% { background-position: 100% 50%; }
-        100% { background-position: 0% 50%; }
-    }
-    
-    .app-card {
-        background: rgba(255, 255, 255, 0.95);
-        color: #2d3748;
-        padding: 2.5rem;
-        border-radius: 20px;
-        margin: 2rem 0;
-        box-shadow: 0 15px 35px rgba(0,0,0,0.2);
-        backdrop-filter: blur(10px);
-        border: 1px solid rgba(255, 255, 255, 0.3);
-        transition: all 0.3s ease;
-        cursor: pointer;
-        min-height: 380px;
-        display: flex;
-        flex-direction: column;
-        justify-content: space-between;
-        overflow: hidden;
-    }
-    
-    .app-card:hover {
-        transform: translateY(-10px);
-        box-shadow: 0 25px 50px rgba(0,0,0,0.3);
-    }
-    
-    .app-icon {
-        font-size: 4.5rem;
-        text-align: center;
-        margin-bottom: 1rem;
-    }
-    
-    .app-title {
-        font-size: 1.8rem;
-        font-weight: 600;
-        color: #2c3e50;
-        text-align: center;
-        margin-bottom: 1rem;
-        word-wrap: break-word;
-        overflow-wrap: break-word;
-    }
-    
-    .app-description {
-        font-size: 1.05rem;
-        line-height: 1.5;
-        color: #4a5568;
-        text-align: center;
-        flex-grow: 1;
-        word-wrap: break-word;
-        overflow-wrap: break-word;
-        display: -webkit-box;
-        -webkit-line-clamp: 4;
-        -webkit-box-orient: vertical;
-        overflow: hidden;
-    }
-    
-    .app-features {
-        font-size: 0.95rem;
-        color: #718096;
-        margin-top: 1rem;
-        line-height: 1.4;
-        word-wrap: break-word;
-        overflow-wrap: break-word;
-    }
-    
-    .welcome-section {
-        background: rgba(255, 255, 255, 0.1);
-        padding: 2.5rem;
-        border-radius: 20px;
-        margin: 2rem 0;
-        text-align: center;
-        backdrop-filter: blur(10px);
-    }
-    
-    .stats-container {
-        background: rgba(255, 255, 255, 0.1);
-        padding: 2rem;
-        border-radius: 15px;
-        margin: 2rem 0;
-        backdrop-filter: blur(10px);
-    }
-    
-    .stat-box {
-        background: rgba(255, 255, 255, 0.2);
-        padding: 1.5rem;
-        border-radius: 10px;
-        text-align: center;
-        margin: 0.5rem;
-    }
-    
-    .stat-number {
-        font-size: 2rem;
-        font-weight: 700;
-        color: #fff;
-    }
-    
-    .stat-label {
-        font-size: 0.9rem;
-        color: rgba(255, 255, 255, 0.8);
-        margin-top: 0.5rem;
-    }
-    
-    .footer-section {
-        background: rgba(255, 255, 255, 0.1);
-        padding: 2rem;
-        border-radius: 15px;
-        margin-top: 3rem;
-        text-align: center;
-        backdrop-filter: blur(10px);
-    }
-</style>
-""", unsafe_allow_html=True)
+apply_theme('0_main_hub')
 
 def main():
     # Header
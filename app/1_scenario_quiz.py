@@ -2,11 +2,13 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import joblib
-import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime
 import random
 
+import chart_templates
+from theme import apply_theme
+
 # Configure page
 st.set_page_config(
     page_title="🎮 Personality Scenarios",
@@ -16,113 +18,7 @@ st.set_page_config(
 )
 
 # Custom CSS for game-like interface
-st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-    
-    .main {
-        font-family: 'Inter', sans-serif;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        min-height: 100vh;
-    }
-    
-    .game-header {
-        text-align: center;
-        font-size: 2.5rem;
-        font-weight: 700;
-        margin-bottom: 2rem;
-        text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-        background: linear-gradient(45deg, #ff6b6b, #4ecdc4, #45b7d1, #96ceb4);
-        background-size: 400% 400%;
-        animation: gradient 3s ease infinite;
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-    }
-    
-    @keyframes gradient {
-        0% { background-position: 0% 50%; }
-        50% { background-position: 100% 50%; }
-        100% { background-position: 0% 50%; }
-    }
-    
-    .scenario-card {
-        background: rgba(255, 255, 255, 0.95);
-        color: #2d3748;
-        padding: 2.5rem;
-        border-radius: 20px;
-        margin: 2rem auto;
-        max-width: 900px;
-        box-shadow: 0 20px 40px rgba(0,0,0,0.2);
-        backdrop-filter: blur(10px);
-        border: 1px solid rgba(255, 255, 255, 0.3);
-    }
-    
-    .scenario-title {
-        font-size: 1.8rem;
-        font-weight: 600;
-        color: #2c3e50;
-        margin-bottom: 1rem;
-        text-align: center;
-    }
-    
-    .scenario-story {
-        font-size: 1.2rem;
-        line-height: 1.6;
-        color: #4a5568;
-        margin-bottom: 2rem;
-        text-align: center;
-        font-style: italic;
-    }
-    
-    .result-card {
-        background: linear-gradient(135deg, #4ecdc4 0%, #44a08d 100%);
-        color: white;
-        padding: 3rem;
-        border-radius: 20px;
-        margin: 2rem auto;
-        text-align: center;
-        box-shadow: 0 20px 40px rgba(0,0,0,0.3);
-        max-width: 800px;
-    }
-    
-    .progress-bar {
-        background: rgba(255, 255, 255, 0.3);
-        height: 10px;
-        border-radius: 5px;
-        overflow: hidden;
-        margin: 1rem 0;
-    }
-    
-    .progress-fill {
-        background: linear-gradient(90deg, #ff6b6b, #4ecdc4);
-        height: 100%;
-        transition: width 0.3s ease;
-    }
-    
-    .emoji-large {
-        font-size: 4rem;
-        margin: 1rem 0;
-    }
-    
-    .stButton > button {
-        background: linear-gradient(135deg, #4ecdc4 0%, #44a08d 100%);
-        color: white;
-        border: none;
-        border-radius: 10px;
-        padding: 0.75rem 2rem;
-        font-weight: 600;
-        transition: all 0.3s ease;
-        box-shadow: 0 5px 15px rgba(0,0,0,0.2);
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 8px 20px rgba(0,0,0,0.3);
-    }
-</style>
-""", unsafe_allow_html=True)
+apply_theme('1_scenario_quiz')
 
 def get_scenarios():
     """Define the social scenarios with personality mappings"""
@@ -266,26 +162,7 @@ def create_trait_radar_chart(user_traits):
     traits = list(user_traits.keys())
     values = list(user_traits.values())
     
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatterpolar(
-        r=values,
-        theta=traits,
-        fill='toself',
-        name='Your Profile',
-        line_color='#ff6b6b',
-        fillcolor='rgba(255, 107, 107, 0.3)'
-    ))
-    
-    fig.update_layout(
-        polar=dict(radialaxis=dict(visible=True, range=[0, 4])),
-        showlegend=False,
-        title="Your Behavioral Trait Profile",
-        font=dict(size=14),
-        height=500
-    )
-    
-    return fig
+    return chart_templates.figure('trait_radar', r=values, theta=traits)
 
 def main():
     # Initialize session state
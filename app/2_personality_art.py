@@ -1,14 +1,14 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.graph_objects as go
-import plotly.express as px
-from PIL import Image, ImageDraw, ImageFilter
 import io
-import random
-import math
 from datetime import datetime
 
+import art_renderer
+import chart_templates
+from results_cache import ART_CACHE
+from theme import apply_theme
+
 # Configure page
 st.set_page_config(
     page_title="🎨 Personality Art Generator",
@@ -18,188 +18,31 @@ st.set_page_config(
 )
 
 # Custom CSS for artistic interface
-st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-    
-    .main {
-        font-family: 'Inter', sans-serif;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        min-height: 100vh;
-    }
-    
-    .art-header {
-        text-align: center;
-        font-size: 2.8rem;
-        font-weight: 700;
-        margin-bottom: 2rem;
-        text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-        background: linear-gradient(45deg, #ff9a56, #ff6b9d, #c44cff, #8b5dff);
-        background-size: 400% 400%;
-        animation: gradient 4s ease infinite;
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-    }
-    
-    @keyframes gradient {
-        0% { background-position: 0% 50%; }
-        50% { background-position: 100% 50%; }
-        100% { background-position: 0% 50%; }
-    }
-    
-    .art-card {
-        background: rgba(255, 255, 255, 0.95);
-        color: #2d3748;
-        padding: 2.5rem;
-        border-radius: 20px;
-        margin: 2rem auto;
-        max-width: 900px;
-        box-shadow: 0 20px 40px rgba(0,0,0,0.2);
-        backdrop-filter: blur(10px);
-        border: 1px solid rgba(255, 255, 255, 0.3);
-    }
-    
-    .palette-box {
-        width: 100px;
-        height: 100px;
-        border-radius: 15px;
-        margin: 10px;
-        box-shadow: 0 8px 20px rgba(0,0,0,0.2);
-        transition: transform 0.3s ease;
-    }
-    
-    .palette-box:hover {
-        transform: scale(1.1);
-    }
-    
-    .artwork-frame {
-        background: #ffffff;
-        padding: 20px;
-        border-radius: 15px;
-        box-shadow: 0 15px 35px rgba(0,0,0,0.3);
-        margin: 20px auto;
-        max-width: 600px;
-    }
-    
-    .trait-slider {
-        margin: 20px 0;
-        padding: 15px;
-        background: rgba(255, 255, 255, 0.1);
-        border-radius: 10px;
-        color: white;
-    }
-    
-    .stButton > button {
-        background: linear-gradient(135deg, #ff9a56 0%, #ff6b9d 100%);
-        color: white;
-        border: none;
-        border-radius: 10px;
-        padding: 0.75rem 2rem;
-        font-weight: 600;
-        transition: all 0.3s ease;
-        box-shadow: 0 5px 15px rgba(0,0,0,0.2);
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 8px 20px rgba(0,0,0,0.3);
-    }
-</style>
-""", unsafe_allow_html=True)
+apply_theme('2_personality_art')
 
-def generate_personality_colors(traits):
+def generate_personality_colors(traits, seed=None):
     """Generate a color palette based on personality traits"""
-    # Base colors for different traits
-    extrovert_base = [255, 107, 107]  # Warm red
-    introvert_base = [107, 152, 255]  # Cool blue
-    
-    # Calculate personality lean
-    extrovert_traits = ['social_energy', 'confidence', 'spontaneity', 'attention_seeking']
-    introvert_traits = ['reflection', 'depth', 'calm', 'focus']
-    
-    extrovert_score = sum(traits.get(trait, 50) for trait in extrovert_traits) / len(extrovert_traits)
-    
-    # Blend colors based on personality
-    if extrovert_score > 60:
-        primary_color = extrovert_base
-        secondary_colors = [
-            [255, 154, 86],   # Orange
-            [255, 107, 157],  # Pink
-            [255, 193, 107],  # Yellow
-        ]
-    else:
-        primary_color = introvert_base
-        secondary_colors = [
-            [107, 255, 193],  # Mint
-            [157, 107, 255],  # Purple
-            [107, 193, 255],  # Light blue
-        ]
-    
-    # Add some randomness based on other traits
-    creativity = traits.get('creativity', 50)
-    if creativity > 70:
-        secondary_colors.append([random.randint(100, 255) for _ in range(3)])
-    
-    colors = [primary_color] + secondary_colors
-    return [(f"rgb({r},{g},{b})", f"#{r:02x}{g:02x}{b:02x}") for r, g, b in colors]
+    return art_renderer.personality_colors(traits, seed)
 
-def create_abstract_art(traits, width=600, height=600):
+def create_abstract_art(traits, width=600, height=600, seed=None):
     """Generate abstract art based on personality traits"""
-    # Create image
-    img = Image.new('RGB', (width, height), (240, 240, 240))
-    draw = ImageDraw.Draw(img)
-    
+    seed = art_renderer.art_seed(traits) if seed is None else seed
     # Get personality colors
-    colors = generate_personality_colors(traits)
+    colors = generate_personality_colors(traits, seed)
     hex_colors = [color[1] for color in colors]
-    
-    # Personality-based parameters
-    extrovert_score = traits.get('social_energy', 50)
-    creativity = traits.get('creativity', 50)
-    organization = traits.get('organization', 50)
-    
-    # Number of shapes based on extroversion
-    num_shapes = int(10 + (extrovert_score / 10))
-    
-    # Draw shapes
-    for i in range(num_shapes):
-        color_idx = i % len(hex_colors)
-        color = hex_colors[color_idx]
-        
-        # Shape size based on confidence
-        confidence = traits.get('confidence', 50)
-        max_size = int(50 + confidence * 2)
-        size = random.randint(20, max_size)
-        
-        # Position
-        x = random.randint(0, width - size)
-        y = random.randint(0, height - size)
-        
-        # Shape type based on organization
-        if organization > 60:
-            # More geometric shapes
-            if random.random() > 0.5:
-                draw.rectangle([x, y, x + size, y + size], fill=color)
-            else:
-                draw.ellipse([x, y, x + size, y + size], fill=color)
-        else:
-            # More organic shapes
-            points = []
-            center_x, center_y = x + size//2, y + size//2
-            for angle in range(0, 360, 30):
-                radius = random.randint(size//4, size//2)
-                px = center_x + radius * math.cos(math.radians(angle))
-                py = center_y + radius * math.sin(math.radians(angle))
-                points.append((px, py))
-            draw.polygon(points, fill=color)
-    
-    # Apply filters based on personality
-    if traits.get('calm', 50) > 70:
-        img = img.filter(ImageFilter.BLUR)
-    
-    return img
+    return art_renderer.abstract_art(traits, hex_colors, width, height, rng=np.random.default_rng(seed))
+
+def get_artwork_png(traits, width=600, height=600, seed=None):
+    """PNG bytes of the artwork, rendered and encoded once per (traits, seed, size) and shared across reruns and sessions"""
+    seed = art_renderer.art_seed(traits) if seed is None else seed
+    key = ('art', tuple(sorted(traits.items())), seed, width, height)
+
+    def render():
+        img_buffer = io.BytesIO()
+        create_abstract_art(traits, width, height, seed).save(img_buffer, format='PNG')
+        return img_buffer.getvalue()
+
+    return ART_CACHE.get_or_compute(key, render)
 
 def personality_quiz():
     """Simple personality trait assessment"""
@@ -245,32 +88,7 @@ def create_mood_chart(traits):
     categories = list(traits.keys())
     values = list(traits.values())
     
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatterpolar(
-        r=values,
-        theta=categories,
-        fill='toself',
-        name='Your Personality Profile',
-        line_color='#ff6b9d',
-        fillcolor='rgba(255, 107, 157, 0.3)'
-    ))
-    
-    fig.update_layout(
-        polar=dict(
-            radialaxis=dict(
-                visible=True,
-                range=[0, 100]
-            )),
-        showlegend=False,
-        title="Your Personality Mood Chart",
-        font=dict(size=14),
-        height=500,
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)'
-    )
-    
-    return fig
+    return chart_templates.figure('mood_radar', r=values, theta=categories)
 
 def main():
     # Header
@@ -323,7 +141,7 @@ def main():
         # Generate artwork
         st.markdown("### 🖼️ Your Personal Artwork")
         with st.spinner("Creating your unique artwork..."):
-            artwork = create_abstract_art(traits)
+            artwork = get_artwork_png(traits)
             
             # Display artwork
             col1, col2, col3 = st.columns([1, 2, 1])
@@ -376,14 +194,9 @@ def main():
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            # Save artwork as bytes
-            img_buffer = io.BytesIO()
-            artwork.save(img_buffer, format='PNG')
-            img_bytes = img_buffer.getvalue()
-            
             st.download_button(
                 label="🖼️ Download Artwork",
-                data=img_bytes,
+                data=artwork,
                 file_name=f"personality_art_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png",
                 mime="image/png",
                 use_container_width=True
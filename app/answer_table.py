@@ -0,0 +1,156 @@
+import argparse
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from model_registry import MODELS_DIR
+from personality_predictor import PersonalityPredictor
+from quiz_features import ASSESSMENT_MAPPING, QUIZ_MAPPING, answers_to_features, scores_to_features
+
+TABLES_DIR = os.path.join(MODELS_DIR, 'answer_tables')
+
+# Question sets with a finite answer space, by table name
+MAPPINGS = {'quiz': QUIZ_MAPPING, 'assessment': ASSESSMENT_MAPPING}
+
+N_OPTIONS = 4
+
+TABLE_DTYPE = np.dtype([('label', np.uint8), ('confidence', np.float16)])
+
+# Loaded tables keyed by file path and modification times, so a rebuilt table is picked up
+_tables = {}
+
+
+def mapping_sha256(mapping):
+    return hashlib.sha256(json.dumps(mapping, sort_keys=True).encode()).hexdigest()
+
+
+_MAPPING_SHA256 = {name: mapping_sha256(mapping) for name, mapping in MAPPINGS.items()}
+
+
+def answer_index(answers, mapping):
+    """Base-4 index of a complete answer dict (first question most significant), or None
+
+    Partial answers or scores outside 1-4 have no table entry.
+    """
+    index = 0
+    for question in mapping['question_ids']:
+        score = answers.get(question)
+        if score not in range(1, N_OPTIONS + 1):
+            return None
+        index = index * N_OPTIONS + int(score) - 1
+    return index
+
+
+def all_scores(n_questions):
+    """Every answer combination as an (N_OPTIONS**n, n) score matrix, in index order"""
+    digits = np.indices((N_OPTIONS,) * n_questions).reshape(n_questions, -1).T
+    return digits + 1
+
+
+def _model_identity(predictor):
+    return {
+        'model': predictor.model_name,
+        'version': predictor.version,
+        'model_sha256': predictor.record['artifacts']['model']['sha256']
+    }
+
+
+def build_table(name, predictor, tables_dir=TABLES_DIR):
+    """Score every possible answer vector of one question set and save the results
+
+    Writes <name>.npy (one label/confidence record per answer index) and
+    <name>.json describing the model version and question mapping it was built from.
+    """
+    mapping = MAPPINGS[name]
+    proba = predictor.predict_proba(scores_to_features(all_scores(len(mapping['question_ids'])), mapping))
+
+    table = np.empty(len(proba), dtype=TABLE_DTYPE)
+    table['label'] = proba.argmax(axis=1)
+    table['confidence'] = proba.max(axis=1) * 100
+
+    os.makedirs(tables_dir, exist_ok=True)
+    path = os.path.join(tables_dir, f'{name}.npy')
+    with open(path + '.tmp', 'wb') as f:
+        np.save(f, table)
+    os.replace(path + '.tmp', path)
+
+    meta = {
+        'classes': list(predictor.classes),
+        'question_ids': mapping['question_ids'],
+        'mapping_sha256': mapping_sha256(mapping),
+        **_model_identity(predictor)
+    }
+    with open(os.path.join(tables_dir, f'{name}.json.tmp'), 'w') as f:
+        json.dump(meta, f, indent=2)
+    os.replace(os.path.join(tables_dir, f'{name}.json.tmp'), os.path.join(tables_dir, f'{name}.json'))
+    return path
+
+
+def load_table(name, tables_dir=TABLES_DIR):
+    """(memory-mapped table, metadata) of a question set, or (None, None) if it has not been built"""
+    path = os.path.join(tables_dir, f'{name}.npy')
+    meta_path = os.path.join(tables_dir, f'{name}.json')
+    try:
+        key = (path, os.stat(path).st_mtime_ns, os.stat(meta_path).st_mtime_ns)
+    except FileNotFoundError:
+        return None, None
+
+    if key not in _tables:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        _tables[key] = (np.load(path, mmap_mode='r'), meta)
+    return _tables[key]
+
+
+def lookup(answers, name, predictor, tables_dir=TABLES_DIR):
+    """(personality, confidence) from the precomputed table, or None if it cannot answer
+
+    The table is only used when it was built from the predictor's current
+    model version and the current question mapping.
+    """
+    table, meta = load_table(name, tables_dir)
+    if table is None:
+        return None
+    mapping = MAPPINGS[name]
+    if meta['mapping_sha256'] != _MAPPING_SHA256[name]:
+        return None
+    # Read once, in case a live model swaps versions between the checks
+    predictor = getattr(predictor, 'current', predictor)
+    if {key: meta[key] for key in ('model', 'version', 'model_sha256')} != _model_identity(predictor):
+        return None
+
+    index = answer_index(answers, mapping)
+    if index is None:
+        return None
+    row = table[index]
+    return meta['classes'][row['label']], float(row['confidence'])
+
+
+def predict_answers(answers, name, predictor):
+    """(personality, confidence) for one answer dict: a table lookup, else a model call"""
+    result = lookup(answers, name, predictor)
+    if result is not None:
+        return result
+    row = predictor.predict_batch(answers_to_features(answers, MAPPINGS[name])).iloc[0]
+    return row['Predicted_Personality'], float(row['Confidence'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute predictions for every possible quiz answer")
+    parser.add_argument('--model', default='naive_bayes')
+    parser.add_argument('--version', help="Registered model version (default: latest)")
+    parser.add_argument('--tables', nargs='+', default=sorted(MAPPINGS), choices=sorted(MAPPINGS))
+    parser.add_argument('--output-dir', default=TABLES_DIR)
+    args = parser.parse_args()
+
+    predictor = PersonalityPredictor(args.model, version=args.version)
+    for name in args.tables:
+        path = build_table(name, predictor, args.output_dir)
+        print(f"Wrote {N_OPTIONS ** len(MAPPINGS[name]['question_ids']):,} {name} answers "
+              f"({args.model} v{predictor.version}) to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+import hashlib
+import json
+import math
+import random
+
+import numpy as np
+from PIL import Image, ImageColor, ImageDraw
+
+BACKGROUND = (240, 240, 240)
+
+RECTANGLE, ELLIPSE, POLYGON = 0, 1, 2
+
+# Organic shapes have one vertex every 30 degrees; math.cos keeps the
+# vertices bit-identical to the original per-shape loop
+N_VERTICES = 12
+_COS = np.array([math.cos(math.radians(angle)) for angle in range(0, 360, 30)])
+_SIN = np.array([math.sin(math.radians(angle)) for angle in range(0, 360, 30)])
+
+# ImageFilter.BLUR reaches 2 pixels around each pixel
+BLUR_RADIUS = 2
+
+
+def art_seed(traits):
+    """Seed derived from a trait profile, so the same traits always give the same art"""
+    canonical = json.dumps(sorted(traits.items()), separators=(',', ':'))
+    return int.from_bytes(hashlib.sha256(canonical.encode()).digest()[:8], 'big')
+
+
+def personality_colors(traits, seed=None):
+    """(css rgb, hex) palette for a trait profile; the accent color of creative profiles comes from the seed"""
+    rng = random.Random(art_seed(traits) if seed is None else seed)
+    # Base colors for different traits
+    extrovert_base = [255, 107, 107]  # Warm red
+    introvert_base = [107, 152, 255]  # Cool blue
+
+    # Calculate personality lean
+    extrovert_traits = ['social_energy', 'confidence', 'spontaneity', 'attention_seeking']
+    introvert_traits = ['reflection', 'depth', 'calm', 'focus']
+
+    extrovert_score = sum(traits.get(trait, 50) for trait in extrovert_traits) / len(extrovert_traits)
+
+    # Blend colors based on personality
+    if extrovert_score > 60:
+        primary_color = extrovert_base
+        secondary_colors = [
+            [255, 154, 86],   # Orange
+            [255, 107, 157],  # Pink
+            [255, 193, 107],  # Yellow
+        ]
+    else:
+        primary_color = introvert_base
+        secondary_colors = [
+            [107, 255, 193],  # Mint
+            [157, 107, 255],  # Purple
+            [107, 193, 255],  # Light blue
+        ]
+
+    # Add some randomness based on other traits
+    creativity = traits.get('creativity', 50)
+    if creativity > 70:
+        secondary_colors.append([rng.randint(100, 255) for _ in range(3)])
+
+    colors = [primary_color] + secondary_colors
+    return [(f"rgb({r},{g},{b})", f"#{r:02x}{g:02x}{b:02x}") for r, g, b in colors]
+
+
+def _layout(traits):
+    """(number of shapes, largest shape size, geometric shapes?) for a trait profile"""
+    num_shapes = int(10 + (traits.get('social_energy', 50) / 10))
+    max_size = int(50 + traits.get('confidence', 50) * 2)
+    return num_shapes, max_size, traits.get('organization', 50) > 60
+
+
+def shape_params(traits, n_colors, width, height, rng=None):
+    """Every shape's parameters as arrays, drawn at once from a NumPy generator
+
+    Returns a dict of 'kind', 'x', 'y', 'size', 'color' (palette index),
+    'radii' (N_VERTICES vertex distances, organic shapes only).
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    num_shapes, max_size, geometric = _layout(traits)
+
+    size = rng.integers(20, max_size, num_shapes, endpoint=True)
+    x = rng.integers(0, width - size, endpoint=True)
+    y = rng.integers(0, height - size, endpoint=True)
+    if geometric:
+        kind = np.where(rng.random(num_shapes) > 0.5, RECTANGLE, ELLIPSE)
+        radii = np.zeros((num_shapes, N_VERTICES), dtype=np.int64)
+    else:
+        kind = np.full(num_shapes, POLYGON)
+        radii = rng.integers((size // 4)[:, None], (size // 2)[:, None], (num_shapes, N_VERTICES), endpoint=True)
+
+    return {
+        'kind': kind,
+        'x': x,
+        'y': y,
+        'size': size,
+        'color': np.arange(num_shapes) % n_colors,
+        'radii': radii
+    }
+
+
+def polygon_vertices(shapes):
+    """(x, y) vertex arrays of shape (n, N_VERTICES) around each shape's centre"""
+    center_x = shapes['x'] + shapes['size'] // 2
+    center_y = shapes['y'] + shapes['size'] // 2
+    radii = shapes['radii']
+    return center_x[:, None] + radii * _COS, center_y[:, None] + radii * _SIN
+
+
+def _pack(color):
+    """An RGB color as the uint32 value of one RGBX pixel"""
+    return np.array([*color, 255], dtype=np.uint8).view(np.uint32)[0]
+
+
+def new_canvas(width, height, background=BACKGROUND):
+    """uint8 (height, width, 4) RGBX canvas filled with the background color
+
+    Each pixel can be written as a single uint32, which is much faster than
+    masked writes across three channels.
+    """
+    canvas = np.empty((height, width, 4), dtype=np.uint8)
+    canvas.view(np.uint32)[..., 0] = _pack(background)
+    return canvas
+
+
+def canvas_image(canvas):
+    """PIL RGBX image sharing an RGBX canvas's memory, so ImageDraw draws straight into the canvas"""
+    height, width = canvas.shape[:2]
+    img = Image.frombuffer('RGBX', (width, height), canvas, 'raw', 'RGBX', 0, 1)
+    # frombuffer marks shared images read-only, and drawing would then work on a copy
+    img.readonly = 0
+    return img
+
+
+def to_image(canvas):
+    """PIL RGB image of an RGB or RGBX canvas"""
+    if canvas.shape[2] == 3:
+        return Image.fromarray(canvas)
+    height, width = canvas.shape[:2]
+    return Image.frombytes('RGB', (width, height), np.ascontiguousarray(canvas), 'raw', 'RGBX')
+
+
+def shape_boxes(shapes, width, height, origin=(0, 0)):
+    """(x0, y0, x1, y1) pixel box each shape can cover, clipped to the window at origin
+
+    Boxes are in image coordinates; empty boxes have x1 <= x0 or y1 <= y0.
+    """
+    left, top = origin
+    # Filled shapes include their far edge; polygons are bounded by their
+    # vertices, which after scaling can lie a pixel outside (x, y, size)
+    x0, y0 = shapes['x'].copy(), shapes['y'].copy()
+    x1, y1 = x0 + shapes['size'] + 1, y0 + shapes['size'] + 1
+    polygons = shapes['kind'] == POLYGON
+    if polygons.any():
+        vx, vy = polygon_vertices({key: value[polygons] for key, value in shapes.items()})
+        x0[polygons] = np.floor(vx.min(axis=1)) - 1
+        y0[polygons] = np.floor(vy.min(axis=1)) - 1
+        x1[polygons] = np.ceil(vx.max(axis=1)) + 2
+        y1[polygons] = np.ceil(vy.max(axis=1)) + 2
+    return np.stack([np.clip(x0, left, left + width), np.clip(y0, top, top + height),
+                     np.clip(x1, left, left + width), np.clip(y1, top, top + height)], axis=1)
+
+
+def _draw_cut_polygon(img, xs, ys, color, origin):
+    """Draw a polygon that the window at origin cuts on its top or left edge
+
+    ImageDraw fills vertices at negative coordinates differently, so the
+    polygon is filled into a mask whose corner is above and left of it, then
+    pasted. Shifting by whole pixels keeps the vertices exact.
+    """
+    left, top = origin
+    width, height = img.size
+    shift_x = min(left, max(math.floor(xs.min()), 0))
+    shift_y = min(top, max(math.floor(ys.min()), 0))
+    right = min(left + width, math.ceil(xs.max()) + 1)
+    bottom = min(top + height, math.ceil(ys.max()) + 1)
+    if right <= left or bottom <= top:
+        return
+    mask = Image.new('L', (right - shift_x, bottom - shift_y))
+    ImageDraw.Draw(mask).polygon(list(zip((xs - shift_x).tolist(), (ys - shift_y).tolist())), fill=255)
+    img.paste(color, (0, 0), mask.crop((left - shift_x, top - shift_y, mask.width, mask.height)))
+
+
+def _draw(img, shapes, colors, origin):
+    left, top = origin
+    draw = ImageDraw.Draw(img)
+    vx, vy = polygon_vertices(shapes)
+    for i in range(len(shapes['kind'])):
+        x, y, size = int(shapes['x'][i]) - left, int(shapes['y'][i]) - top, int(shapes['size'][i])
+        color = tuple(colors[shapes['color'][i]])
+        if shapes['kind'][i] == RECTANGLE:
+            draw.rectangle([x, y, x + size, y + size], fill=color)
+        elif shapes['kind'][i] == ELLIPSE:
+            draw.ellipse([x, y, x + size, y + size], fill=color)
+        elif vx[i].min() < left or vy[i].min() < top:
+            _draw_cut_polygon(img, vx[i], vy[i], color, origin)
+        else:
+            draw.polygon(list(zip((vx[i] - left).tolist(), (vy[i] - top).tolist())), fill=color)
+
+
+def draw_shapes(shapes, colors, width, height, background=BACKGROUND, origin=(0, 0)):
+    """PIL RGB image of the width x height window at origin with the shapes drawn through ImageDraw"""
+    img = Image.new('RGB', (width, height), background)
+    _draw(img, shapes, colors, origin)
+    return img
+
+
+def render(shapes, colors, width, height, origin=(0, 0)):
+    """RGBX canvas (see new_canvas) of the width x height window at origin, drawn through ImageDraw"""
+    canvas = new_canvas(width, height)
+    _draw(canvas_image(canvas), shapes, colors, origin)
+    return canvas
+
+
+def _blur_window(src, y0, y1, x0, x1):
+    """ImageFilter.BLUR of src[y0:y1, x0:x1], which must lie 2 pixels inside src"""
+    x = src[y0 - 2:y1 + 2, x0 - 2:x1 + 2, :3].astype(np.uint16)
+    rows5 = x[:, :-4] + x[:, 1:-3] + x[:, 2:-2] + x[:, 3:-1] + x[:, 4:]
+    rows3 = rows5 - x[:, :-4] - x[:, 4:]
+    box5 = rows5[:-4] + rows5[1:-3] + rows5[2:-2] + rows5[3:-1] + rows5[4:]
+    box3 = rows3[1:-3] + rows3[2:-2] + rows3[3:-1]
+    # The 5x5 ring kernel sums to 16; PIL rounds half up
+    return ((box5 - box3 + 8) >> 4).astype(np.uint8)
+
+
+def blur(canvas, boxes=None):
+    """Pixel-exact NumPy version of ImageFilter.BLUR on an RGB or RGBX uint8 canvas
+
+    Like PIL, the 2-pixel border is left as is. The kernel leaves flat areas
+    unchanged, so when boxes (x0, y0, x1, y1) are given, only pixels near
+    them are filtered; every pixel that differs from a flat background must
+    lie inside a box.
+    """
+    height, width = canvas.shape[:2]
+    out = canvas.copy()
+    if height <= 2 * BLUR_RADIUS or width <= 2 * BLUR_RADIUS:
+        return out
+    lo_y, hi_y = BLUR_RADIUS, height - BLUR_RADIUS
+    lo_x, hi_x = BLUR_RADIUS, width - BLUR_RADIUS
+
+    if boxes is not None:
+        boxes = np.asarray(boxes)
+        grown = np.stack([
+            np.clip(boxes[:, 0] - BLUR_RADIUS, lo_x, hi_x),
+            np.clip(boxes[:, 1] - BLUR_RADIUS, lo_y, hi_y),
+            np.clip(boxes[:, 2] + BLUR_RADIUS, lo_x, hi_x),
+            np.clip(boxes[:, 3] + BLUR_RADIUS, lo_y, hi_y)
+        ], axis=1)
+        area = ((grown[:, 2] - grown[:, 0]) * (grown[:, 3] - grown[:, 1])).sum()
+        if area < (hi_x - lo_x) * (hi_y - lo_y):
+            # Windows are read from the unfiltered canvas, so overlaps are harmless
+            for x0, y0, x1, y1 in grown:
+                if x1 > x0 and y1 > y0:
+                    out[y0:y1, x0:x1, :3] = _blur_window(canvas, y0, y1, x0, x1)
+            return out
+
+    out[lo_y:hi_y, lo_x:hi_x, :3] = _blur_window(canvas, lo_y, hi_y, lo_x, hi_x)
+    return out
+
+
+def scale_shapes(shapes, factor):
+    """Shapes laid out for an image factor times larger in each dimension"""
+    scaled = dict(shapes)
+    for key in ('x', 'y', 'size'):
+        scaled[key] = np.rint(shapes[key] * factor).astype(np.int64)
+    scaled['radii'] = shapes['radii'] * factor
+    return scaled
+
+
+def render_rows(shapes, colors, width, height, top, bottom, blurred=False):
+    """uint8 (bottom - top, width, 3) RGB rows of the full width x height image
+
+    The rows are rasterized with BLUR_RADIUS rows of overlap on each side,
+    so a blurred band matches the same rows of a blurred full image exactly.
+    """
+    margin = BLUR_RADIUS if blurred else 0
+    y0, y1 = max(top - margin, 0), min(bottom + margin, height)
+    canvas = render(shapes, colors, width, y1 - y0, origin=(0, y0))
+    if blurred:
+        canvas = blur(canvas, shape_boxes(shapes, width, y1 - y0, (0, y0)) - [0, y0, 0, y0])
+    return canvas[top - y0:bottom - y0, :, :3]
+
+
+def abstract_art(traits, colors, width=600, height=600, rng=None):
+    """Abstract art for a trait profile as a PIL image
+
+    colors is the palette as hex strings; the shapes come from a NumPy
+    generator (rng).
+    """
+    palette = [ImageColor.getrgb(color) for color in colors]
+    shapes = shape_params(traits, len(palette), width, height, rng)
+
+    # Apply filters based on personality
+    if traits.get('calm', 50) <= 70:
+        # Nothing to filter, so skip the round trip through NumPy
+        return draw_shapes(shapes, palette, width, height)
+    canvas = render(shapes, palette, width, height)
+    return to_image(blur(canvas, shape_boxes(shapes, width, height)))
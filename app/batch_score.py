@@ -0,0 +1,148 @@
+import argparse
+import multiprocessing
+import os
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+import ingest
+from features import BEHAVIORAL_FEATURES, BINARY_FEATURES, build_feature_matrix, clip_behavioral, input_columns
+from personality_predictor import PersonalityPredictor
+from shared_models import SharedScorer, scorer_for
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+TRAINING_DATA = os.path.join(DATA_DIR, 'processed', 'personality_dataset_cleaned.csv')
+
+
+def imputation_values(training_csv=TRAINING_DATA):
+    """Median of each behavioral feature and mode of each binary feature in the training data
+
+    Chunks cannot be imputed from their own statistics without the results
+    depending on the chunk size, so every chunk is filled with these values.
+    """
+    inputs = clip_behavioral(input_columns(pd.read_csv(training_csv)))
+    values = {feature: float(np.nanmedian(inputs[feature])) for feature in BEHAVIORAL_FEATURES}
+    for feature in BINARY_FEATURES:
+        values[feature] = float(pd.Series(inputs[feature]).mode().iloc[0])
+    return values
+
+
+def clean_inputs(chunk, fill_values):
+    """Clean one chunk as in 02_Data_Preparation and return its seven input columns"""
+    inputs = clip_behavioral(input_columns(chunk))
+    for feature, value in fill_values.items():
+        inputs[feature][np.isnan(inputs[feature])] = value
+    return inputs
+
+
+def add_predictions(chunk, proba, classes):
+    """Append Predicted_Personality and Confidence (%) to a chunk"""
+    chunk['Predicted_Personality'] = np.asarray(classes)[proba.argmax(axis=1)]
+    chunk['Confidence'] = (proba.max(axis=1) * 100).round(2)
+    return chunk
+
+
+def score_chunk(chunk, predictor, fill_values):
+    """Clean one chunk and return it with its predictions appended"""
+    inputs = clean_inputs(chunk, fill_values)
+    proba = predictor.predict_proba(pd.DataFrame(inputs, index=chunk.index))
+    return add_predictions(chunk, proba, predictor.classes)
+
+
+# Per-process state of pool workers, set once by _init_worker
+_worker = {}
+
+
+def _init_worker(spec, feature_names, classes, fill_values):
+    scorer, shm = SharedScorer.attach(spec)
+    _worker.update(scorer=scorer, shm=shm, feature_names=feature_names, classes=classes, fill_values=fill_values)
+
+
+def _score_chunk_in_worker(chunk):
+    """Score a chunk with the shared scorer and return it already formatted as CSV"""
+    inputs = clean_inputs(chunk, _worker['fill_values'])
+    X = build_feature_matrix(inputs, feature_names=_worker['feature_names'], clip=False)
+    chunk = add_predictions(chunk, _worker['scorer'].predict_proba(X), _worker['classes'])
+    return len(chunk), chunk.to_csv(header=False, index=False)
+
+
+def _score_parallel(chunks, write, predictor, fill_values, workers):
+    """Score chunks on a process pool, writing results in input order
+
+    Chunks are handed out round-robin as workers free up. At most two chunks
+    per worker are in flight, so memory stays bounded however large the input is.
+    """
+    with SharedScorer(scorer_for(predictor)) as shared:
+        initargs = (shared.spec, predictor.feature_names, predictor.classes, fill_values)
+        with multiprocessing.Pool(workers, initializer=_init_worker, initargs=initargs) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.apply_async(_score_chunk_in_worker, (chunk,)))
+                if len(pending) >= 2 * workers:
+                    write(*pending.popleft().get())
+            while pending:
+                write(*pending.popleft().get())
+
+
+def score_csv(input_path, output_path, predictor, fill_values, chunksize=100_000, workers=1, verbose=True):
+    """Stream input_path through the model in chunks, appending predictions to output_path
+
+    Only a bounded number of chunks is held in memory at a time, so memory
+    use depends on chunksize and workers rather than on the size of the input file.
+    """
+    total_rows = 0
+    start = time.perf_counter()
+
+    with open(output_path, 'w', newline='', encoding='utf-8') as output:
+        def write(n_rows, text):
+            nonlocal total_rows
+            output.write(text)
+            total_rows += n_rows
+            if verbose:
+                rate = total_rows / (time.perf_counter() - start)
+                print(f"  {total_rows:,} rows scored ({rate:,.0f} rows/s)")
+
+        reader = ingest.read_csv(input_path, chunksize=chunksize)
+        first = next(reader, None)
+        if first is None:
+            return 0
+
+        # The first chunk is scored here so the header is written exactly once
+        first = score_chunk(first, predictor, fill_values)
+        write(len(first), first.to_csv(index=False))
+
+        if workers > 1:
+            _score_parallel(reader, write, predictor, fill_values, workers)
+        else:
+            for chunk in reader:
+                chunk = score_chunk(chunk, predictor, fill_values)
+                write(len(chunk), chunk.to_csv(header=False, index=False))
+
+    return total_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a large CSV of survey answers in fixed-size chunks")
+    parser.add_argument('input', help="CSV with the behavioral and Stage_fear/Drained_after_socializing columns")
+    parser.add_argument('output', help="Where to write the input rows plus Predicted_Personality and Confidence")
+    parser.add_argument('--model', default='naive_bayes', help="naive_bayes, logistic_regression or random_forest")
+    parser.add_argument('--version', help="Registered model version (default: latest)")
+    parser.add_argument('--chunksize', type=int, default=100_000, help="Rows read and scored at a time")
+    parser.add_argument('--workers', type=int, default=1, help="Scoring processes; 0 uses every CPU core")
+    parser.add_argument('--training-data', default=TRAINING_DATA, help="Cleaned dataset used for imputation values")
+    parser.add_argument('--quiet', action='store_true')
+    args = parser.parse_args()
+
+    predictor = PersonalityPredictor(args.model, version=args.version)
+    fill_values = imputation_values(args.training_data)
+    workers = args.workers or os.cpu_count()
+
+    total_rows = score_csv(args.input, args.output, predictor, fill_values, args.chunksize, workers,
+                           verbose=not args.quiet)
+    print(f"Saved predictions for {total_rows:,} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
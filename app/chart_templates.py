@@ -0,0 +1,117 @@
+import copy
+import functools
+
+import plotly.graph_objects as go
+
+
+def _personality_bar():
+    fig = go.Figure(go.Bar(
+        x=['Extrovert', 'Introvert'],
+        marker_color=['#ff7f0e', '#9467bd'],
+        textposition='auto',
+    ))
+    fig.update_layout(
+        title="Your Personality Profile",
+        yaxis_title="Percentage",
+        showlegend=False,
+        height=400,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+    )
+    return fig
+
+
+def _scenario_bar():
+    fig = go.Figure(go.Bar(textposition='outside'))
+    fig.update_layout(
+        title="Your Response Pattern Across Scenarios",
+        xaxis_title="Scenarios",
+        yaxis_title="Extroversion Score",
+        yaxis=dict(range=[0, 4.5]),
+        height=400,
+        showlegend=False
+    )
+    return fig
+
+
+def _trait_radar():
+    fig = go.Figure(go.Scatterpolar(
+        fill='toself',
+        name='Your Profile',
+        line_color='#ff6b6b',
+        fillcolor='rgba(255, 107, 107, 0.3)'
+    ))
+    fig.update_layout(
+        polar=dict(radialaxis=dict(visible=True, range=[0, 4])),
+        showlegend=False,
+        title="Your Behavioral Trait Profile",
+        font=dict(size=14),
+        height=500
+    )
+    return fig
+
+
+def _mood_radar():
+    fig = go.Figure(go.Scatterpolar(
+        fill='toself',
+        name='Your Personality Profile',
+        line_color='#ff6b9d',
+        fillcolor='rgba(255, 107, 157, 0.3)'
+    ))
+    fig.update_layout(
+        polar=dict(radialaxis=dict(visible=True, range=[0, 100])),
+        showlegend=False,
+        title="Your Personality Mood Chart",
+        font=dict(size=14),
+        height=500,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
+
+
+# Chart type -> builder of its styled figure without per-user data
+TEMPLATES = {
+    'personality_bar': _personality_bar,
+    'scenario_bar': _scenario_bar,
+    'trait_radar': _trait_radar,
+    'mood_radar': _mood_radar
+}
+
+
+@functools.lru_cache(maxsize=None)
+def base_figure(chart_type):
+    """Validated figure dict of a chart type, built through plotly once per process"""
+    return TEMPLATES[chart_type]().to_dict()
+
+
+def figure_dict(chart_type, **trace_data):
+    """The chart type's base figure with the first trace's data arrays replaced
+
+    Keys use plotly's underscore paths, e.g. ``marker_color``. Only the
+    patched trace is copied; the layout is shared with the cached base, so
+    the result must not be modified in place.
+    """
+    base = base_figure(chart_type)
+    trace = copy.copy(base['data'][0])
+    for key, value in trace_data.items():
+        *parents, leaf = key.split('_')
+        target = trace
+        for parent in parents:
+            target[parent] = target = dict(target.get(parent, {}))
+        target[leaf] = list(value)
+    return {'data': [trace], 'layout': base['layout']}
+
+
+def to_figure(fig_dict):
+    """Wrap a figure dict from figure_dict() without plotly re-validating it
+
+    Passing the Figure (not the dict) to st.plotly_chart also keeps Streamlit
+    from validating it again before serializing.
+    """
+    return go.Figure(fig_dict, _validate=False)
+
+
+def figure(chart_type, **trace_data):
+    """Figure of a chart type with per-user data, skipping property validation"""
+    return to_figure(figure_dict(chart_type, **trace_data))
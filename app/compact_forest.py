@@ -0,0 +1,188 @@
+import argparse
+import json
+import os
+
+import joblib
+import numpy as np
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'models')
+COMPACT_FOREST_DIR = os.path.join(MODELS_DIR, 'random_forest_compact')
+
+ARRAY_NAMES = ['roots', 'feature', 'threshold', 'left', 'right', 'value']
+
+
+def _float32_thresholds(threshold):
+    """Round split thresholds down to float32 without changing any split decision
+
+    sklearn compares float32 inputs against float64 thresholds. Rounding each
+    threshold down to the nearest float32 keeps ``x <= threshold`` identical
+    for every float32 x.
+    """
+    threshold32 = threshold.astype(np.float32)
+    too_high = threshold32.astype(np.float64) > threshold
+    threshold32[too_high] = np.nextafter(threshold32[too_high], np.float32(-np.inf))
+    return threshold32
+
+
+def flatten_forest(model):
+    """Flatten a fitted RandomForestClassifier into contiguous node arrays
+
+    Nodes of all trees are concatenated and child pointers are global node
+    indices, so traversal reads the arrays as they are mapped. Leaves point
+    to themselves so a fixed number of traversal steps lands every row on a
+    leaf.
+    """
+    trees = [estimator.tree_ for estimator in model.estimators_]
+    counts = np.array([tree.node_count for tree in trees])
+
+    roots = np.zeros(len(trees), dtype=np.int32)
+    roots[1:] = np.cumsum(counts)[:-1]
+
+    feature, threshold, left, right, value = [], [], [], [], []
+    for root, tree in zip(roots, trees):
+        local = np.arange(tree.node_count)
+        is_leaf = tree.children_left == -1
+
+        feature.append(np.where(is_leaf, 0, tree.feature))
+        threshold.append(np.where(is_leaf, 0.0, tree.threshold))
+        left.append(root + np.where(is_leaf, local, tree.children_left))
+        right.append(root + np.where(is_leaf, local, tree.children_right))
+
+        counts_per_class = tree.value[:, 0, :]
+        value.append(counts_per_class / counts_per_class.sum(axis=1, keepdims=True))
+
+    arrays = {
+        'roots': roots,
+        'feature': np.concatenate(feature).astype(np.int16),
+        'threshold': _float32_thresholds(np.concatenate(threshold)),
+        'left': np.concatenate(left).astype(np.int32),
+        'right': np.concatenate(right).astype(np.int32),
+        'value': np.concatenate(value).astype(np.float32)
+    }
+    meta = {
+        'n_trees': len(trees),
+        'n_features': int(model.n_features_in_),
+        'max_depth': int(max(tree.max_depth for tree in trees)),
+        'classes': [int(c) for c in model.classes_],
+        'feature_names': [str(f) for f in getattr(model, 'feature_names_in_', [])],
+        'child_pointers': 'global'
+    }
+    return arrays, meta
+
+
+def export_forest(model, output_dir=COMPACT_FOREST_DIR):
+    """Write a fitted forest as .npy arrays plus a small JSON header"""
+    arrays, meta = flatten_forest(model)
+    os.makedirs(output_dir, exist_ok=True)
+    for name in ARRAY_NAMES:
+        np.save(os.path.join(output_dir, f'{name}.npy'), np.ascontiguousarray(arrays[name]))
+    with open(os.path.join(output_dir, 'forest.json'), 'w') as f:
+        json.dump(meta, f, indent=2)
+
+
+class CompactForest:
+    """Batch evaluator for a forest stored as flat node arrays"""
+
+    def __init__(self, arrays, meta):
+        self.roots = arrays['roots']
+        self.feature = arrays['feature']
+        self.threshold = arrays['threshold']
+        self.left = arrays['left']
+        self.right = arrays['right']
+        self.value = arrays['value']
+        self.max_depth = meta['max_depth']
+        self.n_features_in_ = meta['n_features']
+        self.classes_ = np.asarray(meta['classes'])
+        self.feature_names_in_ = meta.get('feature_names') or None
+
+        if meta.get('child_pointers') != 'global':
+            # Older exports store int16 pointers local to each tree; these are
+            # widened into private copies until the forest is exported again
+            tree_start = np.repeat(self.roots, np.diff(np.append(self.roots, len(self.feature))))
+            self.left = self.left + tree_start
+            self.right = self.right + tree_start
+
+    @classmethod
+    def load(cls, model_dir=COMPACT_FOREST_DIR, mmap=True):
+        """Open an exported forest, memory-mapping the node arrays by default"""
+        with open(os.path.join(model_dir, 'forest.json')) as f:
+            meta = json.load(f)
+        mmap_mode = 'r' if mmap else None
+        # np.asarray keeps the mapping but drops the memmap subclass overhead on indexing
+        arrays = {
+            name: np.asarray(np.load(os.path.join(model_dir, f'{name}.npy'), mmap_mode=mmap_mode))
+            for name in ARRAY_NAMES
+        }
+        return cls(arrays, meta)
+
+    def to_arrays(self):
+        """Node arrays plus the JSON header, as written by export_forest()"""
+        arrays = {name: getattr(self, name) for name in ARRAY_NAMES}
+        meta = {
+            'n_trees': len(self.roots),
+            'n_features': self.n_features_in_,
+            'max_depth': self.max_depth,
+            'classes': self.classes_.tolist(),
+            'feature_names': list(self.feature_names_in_ or []),
+            'child_pointers': 'global'
+        }
+        return arrays, meta
+
+    @classmethod
+    def from_arrays(cls, arrays, meta):
+        """Rebuild a forest from to_arrays() output without copying the node arrays"""
+        return cls(arrays, meta)
+
+    def _leaves(self, X):
+        """Global leaf index reached by every row in every tree
+
+        Row/tree pairs are kept in one flat array and only pairs that have not
+        reached a leaf yet are advanced on each step.
+        """
+        n_rows, n_features = X.shape
+        flat_X = X.ravel()
+        nodes = np.tile(self.roots, n_rows)
+        row_offset = np.repeat(np.arange(0, n_rows * n_features, n_features, dtype=np.int32), len(self.roots))
+        active = np.arange(len(nodes), dtype=np.int32)
+
+        for _ in range(self.max_depth):
+            current = nodes[active]
+            go_left = flat_X[row_offset[active] + self.feature[current]] <= self.threshold[current]
+            child = np.where(go_left, self.left[current], self.right[current])
+
+            moved = child != current
+            nodes[active] = child
+            active = active[moved]
+            if not len(active):
+                break
+        return nodes.reshape(n_rows, len(self.roots))
+
+    def predict_proba(self, X, batch_size=4096):
+        """Average leaf class distributions over all trees, like RandomForestClassifier"""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected an array with {self.n_features_in_} columns")
+
+        proba = np.empty((len(X), self.value.shape[1]), dtype=np.float64)
+        for start in range(0, len(X), batch_size):
+            leaves = self._leaves(X[start:start + batch_size])
+            proba[start:start + batch_size] = self.value[leaves].mean(axis=1)
+        return proba
+
+    def predict(self, X):
+        """Most likely class for every row"""
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export random_forest_model.pkl as memory-mappable arrays")
+    parser.add_argument('--model', default=os.path.join(MODELS_DIR, 'random_forest_model.pkl'))
+    parser.add_argument('--output', default=COMPACT_FOREST_DIR)
+    args = parser.parse_args()
+
+    export_forest(joblib.load(args.model), args.output)
+    print(f"Saved compact Random Forest to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+import argparse
+import os
+
+import joblib
+import numpy as np
+
+from compact_forest import CompactForest
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'models')
+
+
+class GaussianNBScorer:
+    """Closed-form GaussianNB scorer that needs only NumPy at inference time
+
+    The per-class Gaussian log-likelihood is expanded into
+    ``x**2 @ quadratic + x @ linear + constant`` so that scoring a batch is a
+    single matrix product over the stacked ``[x**2, x]`` block.
+    """
+
+    def __init__(self, weights, constant, classes, dtype=np.float32):
+        self.dtype = np.dtype(dtype)
+        self.weights = np.ascontiguousarray(weights, dtype=self.dtype)
+        self.constant = np.ascontiguousarray(constant, dtype=self.dtype)
+        self.classes = np.asarray(classes)
+        self.n_features = self.weights.shape[0] // 2
+
+    @classmethod
+    def from_model(cls, model, dtype=np.float32):
+        """Precompute the scorer weights from a fitted GaussianNB"""
+        theta = np.asarray(model.theta_, dtype=np.float64)
+        var = np.asarray(model.var_, dtype=np.float64)
+
+        quadratic = -0.5 / var
+        linear = theta / var
+        constant = (
+            np.log(model.class_prior_)
+            - 0.5 * np.log(2 * np.pi * var).sum(axis=1)
+            - 0.5 * (theta ** 2 / var).sum(axis=1)
+        )
+        weights = np.vstack([quadratic.T, linear.T])
+        return cls(weights, constant, model.classes_, dtype=dtype)
+
+    @classmethod
+    def load(cls, path, dtype=np.float32):
+        """Load scorer weights written by save()"""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data['weights'], data['constant'], data['classes'], dtype=dtype)
+
+    def save(self, path):
+        """Write the scorer weights to an .npz file"""
+        np.savez(path, weights=self.weights, constant=self.constant, classes=self.classes)
+
+    def to_arrays(self):
+        """Scorer weights as plain arrays plus the small metadata needed to rebuild it"""
+        arrays = {'weights': self.weights, 'constant': self.constant}
+        return arrays, {'classes': self.classes.tolist(), 'dtype': self.dtype.name}
+
+    @classmethod
+    def from_arrays(cls, arrays, meta):
+        """Rebuild a scorer from to_arrays() output without copying the weights"""
+        return cls(arrays['weights'], arrays['constant'], meta['classes'], dtype=meta['dtype'])
+
+    def joint_log_likelihood(self, X):
+        """Unnormalized log posterior for every row and class"""
+        X = np.asarray(X, dtype=self.dtype)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected an array with {self.n_features} columns")
+        return np.hstack([X * X, X]) @ self.weights + self.constant
+
+    def predict_proba(self, X):
+        """Normalized class probabilities for every row"""
+        jll = self.joint_log_likelihood(X)
+        jll -= jll.max(axis=1, keepdims=True)
+        proba = np.exp(jll)
+        proba /= proba.sum(axis=1, keepdims=True)
+        return proba
+
+    def predict(self, X):
+        """Most likely class for every row"""
+        return self.classes[self.joint_log_likelihood(X).argmax(axis=1)]
+
+
+class LogisticScorer:
+    """Binary LogisticRegression with the StandardScaler folded into its weights
+
+    ``((x - mean) / scale) @ coef + intercept`` is rewritten as
+    ``x @ (coef / scale) + (intercept - (mean / scale) @ coef)`` so raw
+    features are scored with one matrix-vector product.
+    """
+
+    def __init__(self, weights, intercept, classes, dtype=np.float64):
+        self.dtype = np.dtype(dtype)
+        self.weights = np.ascontiguousarray(weights, dtype=self.dtype)
+        self.intercept = np.ascontiguousarray(intercept, dtype=self.dtype)
+        self.classes = np.asarray(classes)
+        self.n_features = self.weights.shape[0]
+
+    @classmethod
+    def from_model(cls, model, scaler=None, dtype=np.float64):
+        """Fold a fitted StandardScaler into a fitted binary LogisticRegression"""
+        if model.coef_.shape[0] != 1:
+            raise ValueError("LogisticScorer only supports binary LogisticRegression models")
+        coef = np.asarray(model.coef_[0], dtype=np.float64)
+        intercept = np.asarray(model.intercept_, dtype=np.float64)
+
+        if scaler is not None:
+            mean = scaler.mean_ if scaler.with_mean else np.zeros_like(coef)
+            scale = scaler.scale_ if scaler.with_std else np.ones_like(coef)
+            coef = coef / scale
+            intercept = intercept - mean @ coef
+        return cls(coef, intercept, model.classes_, dtype=dtype)
+
+    def to_arrays(self):
+        """Scorer weights as plain arrays plus the small metadata needed to rebuild it"""
+        arrays = {'weights': self.weights, 'intercept': self.intercept}
+        return arrays, {'classes': self.classes.tolist(), 'dtype': self.dtype.name}
+
+    @classmethod
+    def from_arrays(cls, arrays, meta):
+        """Rebuild a scorer from to_arrays() output without copying the weights"""
+        return cls(arrays['weights'], arrays['intercept'], meta['classes'], dtype=meta['dtype'])
+
+    def decision_function(self, X):
+        """Log-odds of the second class for every row"""
+        X = np.asarray(X, dtype=self.dtype)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected an array with {self.n_features} columns")
+        return X @ self.weights + self.intercept
+
+    def predict_proba(self, X):
+        """Normalized class probabilities for every row"""
+        positive = 1 / (1 + np.exp(-self.decision_function(X)))
+        return np.column_stack([1 - positive, positive])
+
+    def predict(self, X):
+        """Most likely class for every row"""
+        return self.classes[(self.decision_function(X) > 0).astype(int)]
+
+
+class StandardizedScorer:
+    """A scorer for a model trained on StandardScaler output, fed raw features
+
+    The scaler's mean and scale are applied to every batch before it is
+    passed on, so the scaler travels with the scorer (e.g. into shared memory).
+    """
+
+    def __init__(self, scorer, mean, scale):
+        self.scorer = scorer
+        self.mean = np.ascontiguousarray(mean, dtype=np.float64)
+        self.scale = np.ascontiguousarray(scale, dtype=np.float64)
+
+    @classmethod
+    def from_scaler(cls, scorer, scaler):
+        """Wrap a scorer with a fitted StandardScaler"""
+        n_features = len(scaler.scale_ if scaler.scale_ is not None else scaler.mean_)
+        mean = scaler.mean_ if scaler.with_mean else np.zeros(n_features)
+        scale = scaler.scale_ if scaler.with_std else np.ones(n_features)
+        return cls(scorer, mean, scale)
+
+    def to_arrays(self):
+        """Wrapped scorer's arrays (prefixed 'scorer.') plus the mean and scale"""
+        arrays, meta = self.scorer.to_arrays()
+        arrays = {f'scorer.{name}': array for name, array in arrays.items()}
+        arrays.update(mean=self.mean, scale=self.scale)
+        return arrays, {'scorer': type(self.scorer).__name__, 'scorer_meta': meta}
+
+    @classmethod
+    def from_arrays(cls, arrays, meta):
+        """Rebuild a scorer from to_arrays() output without copying the weights"""
+        inner = {name[len('scorer.'):]: array for name, array in arrays.items() if name.startswith('scorer.')}
+        scorer = _WRAPPED_TYPES[meta['scorer']].from_arrays(inner, meta['scorer_meta'])
+        return cls(scorer, arrays['mean'], arrays['scale'])
+
+    def transform(self, X):
+        return (np.asarray(X, dtype=np.float64) - self.mean) / self.scale
+
+    def predict_proba(self, X):
+        """Normalized class probabilities for every row"""
+        return self.scorer.predict_proba(self.transform(X))
+
+    def predict(self, X):
+        """Most likely class for every row"""
+        return self.scorer.predict(self.transform(X))
+
+
+_WRAPPED_TYPES = {cls.__name__: cls for cls in [GaussianNBScorer, LogisticScorer, CompactForest]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export naive_bayes_model.pkl as NumPy scorer weights")
+    parser.add_argument('--model', default=os.path.join(MODELS_DIR, 'naive_bayes_model.pkl'))
+    parser.add_argument('--output', default=os.path.join(MODELS_DIR, 'naive_bayes_compiled.npz'))
+    args = parser.parse_args()
+
+    scorer = GaussianNBScorer.from_model(joblib.load(args.model))
+    scorer.save(args.output)
+    print(f"Saved compiled Naive Bayes scorer to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
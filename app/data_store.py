@@ -0,0 +1,233 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+import ingest
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+PROCESSED_DIR = os.path.join(DATA_DIR, 'processed')
+CLEANED_DATA = os.path.join(PROCESSED_DIR, 'personality_dataset_cleaned.csv')
+RAW_DATA = os.path.join(PROCESSED_DIR, 'raw_personality_data.csv')
+
+CACHE_SUFFIX = '.arrow'
+FINGERPRINT_SUFFIX = '.arrow.json'
+
+# Bump when the cached column types change so old caches are rebuilt
+CACHE_VERSION = 1
+
+# String columns with at most this many distinct values (Yes/No answers,
+# Personality) are stored as categoricals
+MAX_CATEGORIES = 100
+
+
+def file_sha256(path, block_size=1 << 20):
+    """Hex SHA-256 of a file's contents, read in blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_path(csv_path):
+    """Path of the Arrow cache written next to a CSV"""
+    return os.path.splitext(csv_path)[0] + CACHE_SUFFIX
+
+
+def _fingerprint_path(csv_path):
+    return os.path.splitext(csv_path)[0] + FINGERPRINT_SUFFIX
+
+
+def _stat_fingerprint(csv_path):
+    stat = os.stat(csv_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def cache_is_valid(csv_path):
+    """Whether the Arrow cache was built from the CSV's current contents
+
+    An unchanged size and mtime are trusted. Otherwise the content hash
+    decides, so a touched but identical CSV keeps its cache.
+    """
+    fingerprint_path = _fingerprint_path(csv_path)
+    if not (os.path.exists(cache_path(csv_path)) and os.path.exists(fingerprint_path)):
+        return False
+
+    with open(fingerprint_path) as f:
+        fingerprint = json.load(f)
+    if fingerprint.get('version') != CACHE_VERSION:
+        return False
+
+    stat = _stat_fingerprint(csv_path)
+    if all(fingerprint.get(key) == value for key, value in stat.items()):
+        return True
+    if stat['size'] != fingerprint.get('size') or file_sha256(csv_path) != fingerprint.get('sha256'):
+        return False
+
+    # Same contents with a new mtime (e.g. after a checkout): skip rehashing next time
+    fingerprint.update(stat)
+    _write_fingerprint(csv_path, fingerprint)
+    return True
+
+
+def _write_fingerprint(csv_path, fingerprint):
+    path = _fingerprint_path(csv_path)
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump(fingerprint, f, indent=2)
+    os.replace(temp_path, path)
+
+
+def infer_column_types(csv_path, chunksize=1_000_000, encoding=None):
+    """Scan a CSV once and choose a compact dtype for every column
+
+    0/1 integer columns become int8, low-cardinality strings become
+    categoricals and remaining numbers are int64 or float64. Types are fixed
+    for the whole file so every cached record batch shares one schema.
+    """
+    kinds = {}
+    categories = {}
+    binary = {}
+
+    for chunk in ingest.read_csv(csv_path, encoding=encoding, chunksize=chunksize):
+        for column in chunk.columns:
+            values = chunk[column]
+            if pd.api.types.is_integer_dtype(values):
+                kind = 'int'
+                binary[column] = binary.get(column, True) and bool(values.isin([0, 1]).all())
+            elif pd.api.types.is_float_dtype(values):
+                kind = 'float'
+            else:
+                kind = 'str'
+                seen = categories.setdefault(column, set())
+                if seen is not None:
+                    seen.update(values.dropna().astype(str).unique())
+                    if len(seen) > MAX_CATEGORIES:
+                        categories[column] = None
+
+            # A column widens from int to float to str as later chunks demand
+            previous = kinds.get(column, kind)
+            kinds[column] = max(previous, kind, key=['int', 'float', 'str'].index)
+
+    types = {}
+    for column, kind in kinds.items():
+        if kind == 'int':
+            types[column] = 'int8' if binary[column] else 'int64'
+        elif kind == 'float':
+            types[column] = 'float64'
+        elif categories.get(column) is not None:
+            types[column] = pd.CategoricalDtype(sorted(categories[column]))
+        else:
+            types[column] = 'object'
+    return types
+
+
+def _read_dtypes(types):
+    """Dtypes to pass to read_csv so every chunk parses the same way"""
+    dtypes = {}
+    for column, dtype in types.items():
+        if isinstance(dtype, pd.CategoricalDtype) or dtype == 'object':
+            dtypes[column] = str
+        elif dtype == 'float64':
+            dtypes[column] = 'float64'
+    return dtypes
+
+
+def _arrow_schema(types):
+    fields = []
+    for column, dtype in types.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            arrow_type = pa.dictionary(pa.int8() if len(dtype.categories) < 128 else pa.int16(), pa.string())
+        elif dtype == 'object':
+            arrow_type = pa.string()
+        else:
+            arrow_type = pa.from_numpy_dtype(np.dtype(dtype))
+        fields.append(pa.field(column, arrow_type))
+    return pa.schema(fields)
+
+
+def _record_batch(chunk, types, schema):
+    arrays = []
+    for column, dtype in types.items():
+        values = chunk[column]
+        if isinstance(dtype, pd.CategoricalDtype):
+            codes = pd.Categorical(values, dtype=dtype).codes
+            index_type = schema.field(column).type.index_type
+            indices = pa.array(codes, type=index_type, mask=codes < 0)
+            arrays.append(pa.DictionaryArray.from_arrays(indices, pa.array(dtype.categories, pa.string())))
+        elif dtype == 'object':
+            arrays.append(pa.array(values.astype(object), type=pa.string(), from_pandas=True))
+        else:
+            # Plain NumPy buffers keep NaN as a value rather than a null, which
+            # lets float columns be read back without copying
+            arrays.append(pa.array(values.to_numpy(dtype=dtype)))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def build_cache(csv_path, chunksize=1_000_000, encoding=None):
+    """Convert a CSV into a typed Arrow IPC file next to it, one record batch per chunk"""
+    if pa is None:
+        raise ImportError("pyarrow is required to build the columnar cache: pip install pyarrow")
+
+    # Both passes decode with the same encoding, sniffed once up front
+    encoding = encoding or ingest.sniff_encoding(csv_path)
+    types = infer_column_types(csv_path, chunksize, encoding)
+    schema = _arrow_schema(types)
+    sha256 = file_sha256(csv_path)
+    stat = _stat_fingerprint(csv_path)
+
+    target = cache_path(csv_path)
+    # Per-process temp files let several processes build the same cache at once
+    temp_path = f'{target}.{os.getpid()}.tmp'
+    with pa.OSFile(temp_path, 'wb') as sink, pa.ipc.new_file(sink, schema) as writer:
+        reader = ingest.read_csv(csv_path, encoding=encoding, chunksize=chunksize, dtype=_read_dtypes(types))
+        for chunk in reader:
+            writer.write_batch(_record_batch(chunk, types, schema))
+    # Readers never see a half-written cache
+    os.replace(temp_path, target)
+
+    _write_fingerprint(csv_path, {'version': CACHE_VERSION, 'sha256': sha256, **stat})
+    return target
+
+
+def load_table(csv_path, columns=None, rebuild=True):
+    """Memory-mapped Arrow table for a CSV, (re)building the cache when it is stale
+
+    Column buffers point straight into the mapped file, so only the pages
+    of the columns that are actually touched are read from disk.
+    """
+    if pa is None:
+        raise ImportError("pyarrow is required to read the columnar cache: pip install pyarrow")
+    if not cache_is_valid(csv_path):
+        if not rebuild:
+            raise FileNotFoundError(f"No up-to-date cache for {csv_path}")
+        build_cache(csv_path)
+
+    source = pa.memory_map(cache_path(csv_path), 'r')
+    table = pa.ipc.open_file(source).read_all()
+    return table.select(columns) if columns is not None else table
+
+
+def load_dataset(csv_path=CLEANED_DATA, columns=None):
+    """Load a dataset as a DataFrame with compact dtypes, through the Arrow cache when available
+
+    Numeric columns of a single-batch cache are zero-copy, read-only views
+    onto the mapped file. Without pyarrow the CSV is parsed and given the same
+    dtypes.
+    """
+    if pa is None:
+        encoding = ingest.sniff_encoding(csv_path)
+        types = infer_column_types(csv_path, encoding=encoding)
+        df = ingest.read_csv(csv_path, encoding=encoding, usecols=columns, dtype=_read_dtypes(types))
+        return df.astype({column: types[column] for column in df.columns})
+
+    table = load_table(csv_path, columns)
+    return table.to_pandas(split_blocks=True, self_destruct=False)
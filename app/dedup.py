@@ -0,0 +1,271 @@
+import argparse
+import json
+import math
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+import ingest
+
+# Hashes buffered in memory before they are written out as a sorted segment
+FLUSH_SIZE = 4_000_000
+
+# Rows merged per block when two segments are combined
+MERGE_BLOCK = 1_000_000
+
+DEFAULT_BLOOM_CAPACITY = 10_000_000
+DEFAULT_BLOOM_ERROR_RATE = 0.001
+
+# Changed whenever row_hashes() does, so sets saved by older versions are rebuilt
+ROW_HASH_VERSION = 2
+
+
+def normalize_rows(chunk, columns=None):
+    """Canonical form of each row: every value as a string, with numbers written as float64
+
+    Values that read as numbers are compared by value whatever dtype pandas
+    inferred for their chunk, so ``4`` and ``4.0`` hash the same in a float
+    column and in a column that also holds text. Other strings lose their
+    surrounding whitespace and missing values stay missing.
+    """
+    chunk = chunk if columns is None else chunk[list(columns)]
+    normalized = {}
+    for column in chunk.columns:
+        # Columns hold few distinct values, so only those are converted
+        codes, uniques = pd.factorize(chunk[column])
+        uniques = pd.Series(uniques)
+        if pd.api.types.is_numeric_dtype(uniques):
+            text = numbers = uniques.astype('float64')
+        else:
+            text = uniques.astype(str).str.strip()
+            numbers = pd.to_numeric(text, errors='coerce')
+        canonical = text.astype(str).astype(object).where(numbers.isna(), numbers.astype(str).astype(object))
+        values = np.append(canonical.to_numpy(), None)
+        normalized[column] = values[codes]
+    return pd.DataFrame(normalized, index=chunk.index)
+
+
+def row_hashes(chunk, columns=None):
+    """64-bit hash of every normalized row"""
+    return pd.util.hash_pandas_object(normalize_rows(chunk, columns), index=False).to_numpy()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over 64-bit row hashes
+
+    Bit positions come from double hashing the two 32-bit halves of each
+    hash. With ``path`` the bits live in a memory-mapped .npy file.
+    """
+
+    def __init__(self, capacity=DEFAULT_BLOOM_CAPACITY, error_rate=DEFAULT_BLOOM_ERROR_RATE, path=None):
+        self.n_bits = int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.n_hashes = max(1, round(self.n_bits / capacity * math.log(2)))
+        n_bytes = (self.n_bits + 7) // 8
+
+        if path is None:
+            self.bits = np.zeros(n_bytes, dtype=np.uint8)
+        elif os.path.exists(path):
+            self.bits = np.load(path, mmap_mode='r+')
+            if len(self.bits) != n_bytes:
+                raise ValueError(f"{path} was created with a different capacity or error rate")
+        else:
+            self.bits = np.lib.format.open_memmap(path, mode='w+', dtype=np.uint8, shape=(n_bytes,))
+
+    def _positions(self, hashes):
+        low = hashes & np.uint64(0xFFFFFFFF)
+        high = (hashes >> np.uint64(32)) | np.uint64(1)
+        steps = np.arange(self.n_hashes, dtype=np.uint64)
+        return (low[:, None] + steps * high[:, None]) % np.uint64(self.n_bits)
+
+    def contains(self, hashes):
+        """False where a hash was certainly never added, True where it may have been"""
+        positions = self._positions(hashes)
+        bits = self.bits[positions >> np.uint64(3)] >> (positions & np.uint64(7)).astype(np.uint8)
+        return (bits & 1).all(axis=1)
+
+    def add(self, hashes):
+        positions = self._positions(hashes).ravel()
+        np.bitwise_or.at(self.bits, positions >> np.uint64(3), (1 << (positions & np.uint64(7))).astype(np.uint8))
+
+
+def merge_sorted(a, b, path):
+    """Merge two sorted arrays into a new .npy file without loading either into memory
+
+    Each element's final position is its own index plus the number of
+    elements of the other array before it, so both inputs are scattered into
+    the memory-mapped output block by block.
+    """
+    out = np.lib.format.open_memmap(path, mode='w+', dtype=np.uint64, shape=(len(a) + len(b),))
+    for source, other, side in [(a, b, 'left'), (b, a, 'right')]:
+        for start in range(0, len(source), MERGE_BLOCK):
+            block = np.asarray(source[start:start + MERGE_BLOCK])
+            positions = np.arange(start, start + len(block)) + np.searchsorted(other, block, side=side)
+            out[positions] = block
+    out.flush()
+    return out
+
+
+class SeenHashes:
+    """Exact on-disk set of row hashes, fronted by a Bloom filter
+
+    New hashes are buffered in memory and written as sorted, memory-mapped
+    ``.npy`` segments. A segment is merged into the previous one whenever that
+    one is at most twice its size, which keeps the number of segments
+    logarithmic in the number of rows. The Bloom filter answers most lookups
+    for unseen rows without touching the segments at all.
+    """
+
+    def __init__(self, directory, segments=None, flush_size=FLUSH_SIZE, bloom_capacity=DEFAULT_BLOOM_CAPACITY):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.flush_size = flush_size
+        if segments is None:
+            segments = self._read_manifest()
+        self.segments = list(segments)
+        self.pending = []
+        self.bloom = None
+        if bloom_capacity:
+            self.bloom = BloomFilter(bloom_capacity, path=os.path.join(directory, 'bloom.npy'))
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.directory, 'segments.json')
+
+    def _read_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return []
+        with open(self.manifest_path) as f:
+            return json.load(f)
+
+    def _segment(self, name):
+        return np.load(os.path.join(self.directory, name), mmap_mode='r')
+
+    def __len__(self):
+        return sum(len(self._segment(name)) for name in self.segments) + sum(len(p) for p in self.pending)
+
+    def contains(self, hashes):
+        """Mask of hashes that are already in the set"""
+        found = np.zeros(len(hashes), dtype=bool)
+        candidates = np.arange(len(hashes))
+        if self.bloom is not None:
+            candidates = candidates[self.bloom.contains(hashes)]
+
+        for segment in [self._segment(name) for name in self.segments] + self.pending:
+            if not len(candidates) or not len(segment):
+                continue
+            probe = hashes[candidates]
+            positions = np.minimum(np.searchsorted(segment, probe), len(segment) - 1)
+            hit = np.asarray(segment[positions]) == probe
+            found[candidates[hit]] = True
+            candidates = candidates[~hit]
+        return found
+
+    def add(self, hashes):
+        """Add hashes that are not in the set yet"""
+        if not len(hashes):
+            return
+        self.pending.append(np.sort(hashes))
+        if self.bloom is not None:
+            self.bloom.add(hashes)
+        if sum(len(p) for p in self.pending) >= self.flush_size:
+            self.flush()
+
+    def _new_name(self):
+        existing = [int(name[5:-4]) for name in os.listdir(self.directory) if name.startswith('seen_')]
+        return f'seen_{max(existing, default=0) + 1:06d}.npy'
+
+    def flush(self):
+        """Write buffered hashes to disk; returns the current segment list
+
+        Files of segments that were merged away are left for remove_unused(),
+        so a caller that records the segment list elsewhere can save it first.
+        """
+        if self.pending:
+            name = self._new_name()
+            np.save(os.path.join(self.directory, name), np.sort(np.concatenate(self.pending)))
+            self.pending = []
+            self.segments.append(name)
+
+            while len(self.segments) > 1:
+                newer, older = self._segment(self.segments[-1]), self._segment(self.segments[-2])
+                if len(older) > 2 * len(newer):
+                    break
+                name = self._new_name()
+                merge_sorted(older, newer, os.path.join(self.directory, name))
+                self.segments[-2:] = [name]
+
+        if self.bloom is not None:
+            self.bloom.bits.flush()
+        return list(self.segments)
+
+    def save(self):
+        """Flush, record the segment list in this directory and delete merged-away files"""
+        self.flush()
+        temp_path = self.manifest_path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(self.segments, f)
+        os.replace(temp_path, self.manifest_path)
+        self.remove_unused()
+
+    def remove_unused(self):
+        """Delete segment files that are no longer part of the set"""
+        for name in os.listdir(self.directory):
+            if name.startswith('seen_') and name not in self.segments:
+                os.remove(os.path.join(self.directory, name))
+
+
+def new_row_mask(hashes, seen):
+    """Rows that are neither in ``seen`` nor repeats of an earlier row in the same batch"""
+    _, first = np.unique(hashes, return_index=True)
+    is_first = np.zeros(len(hashes), dtype=bool)
+    is_first[first] = True
+    is_first[is_first] = ~seen.contains(hashes[is_first])
+    return is_first
+
+
+def unique_rows(chunks, seen=None, columns=None):
+    """Yield each chunk with rows already seen earlier in the stream removed
+
+    Memory use is bounded by the chunk size and the seen-set's flush size.
+    Without ``seen``, a temporary on-disk set is used and removed afterwards.
+    """
+    directory = None
+    if seen is None:
+        directory = tempfile.mkdtemp(prefix='dedup_')
+        seen = SeenHashes(directory)
+    try:
+        for chunk in chunks:
+            hashes = row_hashes(chunk, columns)
+            keep = new_row_mask(hashes, seen)
+            seen.add(hashes[keep])
+            yield chunk[keep]
+    finally:
+        if directory is not None:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Remove duplicate rows from a CSV of any size")
+    parser.add_argument('input')
+    parser.add_argument('output')
+    parser.add_argument('--columns', nargs='+', help="Columns that identify a row (default: all)")
+    parser.add_argument('--chunksize', type=int, default=500_000)
+    parser.add_argument('--seen-dir', help="Keep the seen-set here so later files are deduplicated against this one")
+    args = parser.parse_args()
+
+    seen = SeenHashes(args.seen_dir) if args.seen_dir else None
+    kept = 0
+    with open(args.output, 'w', newline='', encoding='utf-8') as output:
+        for i, chunk in enumerate(unique_rows(ingest.read_csv(args.input, chunksize=args.chunksize), seen, args.columns)):
+            chunk.to_csv(output, header=(i == 0), index=False)
+            kept += len(chunk)
+    if seen is not None:
+        seen.save()
+    print(f"Wrote {kept:,} unique rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
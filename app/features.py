@@ -0,0 +1,142 @@
+import numpy as np
+import pandas as pd
+
+BEHAVIORAL_FEATURES = [
+    'Time_spent_Alone',
+    'Social_event_attendance',
+    'Going_outside',
+    'Friends_circle_size',
+    'Post_frequency'
+]
+
+# Yes/No survey answers and the 0/1 columns the models are trained on
+PSYCHOLOGICAL_FEATURES = ['Stage_fear', 'Drained_after_socializing']
+BINARY_FEATURES = ['Has_Stage_Fear', 'Gets_Drained_Socializing']
+BINARY_SOURCES = dict(zip(BINARY_FEATURES, PSYCHOLOGICAL_FEATURES))
+
+# The seven answers every other feature is derived from
+INPUT_FEATURES = BEHAVIORAL_FEATURES + BINARY_FEATURES
+
+ENGINEERED_FEATURES = [
+    'Social_Activity_Score',
+    'Introversion_Score',
+    'Social_Comfort',
+    'Digital_vs_Physical_Social',
+    'Social_Energy_Balance'
+]
+
+# Column order of feature_names.pkl, as selected in 04_Data_Modelling
+MODEL_FEATURES = [
+    'Time_spent_Alone',
+    'Social_event_attendance',
+    'Going_outside',
+    'Friends_circle_size',
+    'Post_frequency',
+    'Social_Activity_Score',
+    'Introversion_Score',
+    'Social_Comfort',
+    'Social_Energy_Balance',
+    'Has_Stage_Fear',
+    'Gets_Drained_Socializing'
+]
+
+YES_NO_VALUES = {'yes': 1.0, 'y': 1.0, 'no': 0.0, 'n': 0.0}
+
+
+def yes_no_to_binary(values):
+    """Encode Yes/No answers as 1.0/0.0, leaving anything unrecognised as NaN"""
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+    lookup = np.array(
+        [YES_NO_VALUES.get(str(value).strip().lower(), np.nan) for value in uniques] + [np.nan]
+    )
+    # factorize marks missing values with -1, which indexes the trailing NaN
+    return lookup[codes]
+
+
+def input_columns(columns, dtype=np.float64):
+    """Pull the seven input features out of a DataFrame or dict of columns
+
+    Binary features may be given either as 0/1 columns (``Has_Stage_Fear``) or
+    as the raw Yes/No survey columns (``Stage_fear``).
+    """
+    inputs = {}
+    missing = []
+
+    for feature in BEHAVIORAL_FEATURES:
+        if feature in columns:
+            inputs[feature] = pd.to_numeric(np.asarray(columns[feature]), errors='coerce').astype(dtype)
+        else:
+            missing.append(feature)
+
+    for feature in BINARY_FEATURES:
+        source = BINARY_SOURCES[feature]
+        if feature in columns:
+            inputs[feature] = pd.to_numeric(np.asarray(columns[feature]), errors='coerce').astype(dtype)
+        elif source in columns:
+            inputs[feature] = yes_no_to_binary(columns[source]).astype(dtype)
+        else:
+            missing.append(feature)
+
+    if missing:
+        raise ValueError(f"Missing required features: {missing}")
+    return inputs
+
+
+def clip_behavioral(inputs):
+    """Cap behavioral features to the 0-10 survey scale, as in 02_Data_Preparation"""
+    for feature in BEHAVIORAL_FEATURES:
+        np.clip(inputs[feature], 0, 10, out=inputs[feature])
+    return inputs
+
+
+def engineer_features(inputs):
+    """Compute the engineered features from the seven input columns"""
+    alone = inputs['Time_spent_Alone']
+    events = inputs['Social_event_attendance']
+    outside = inputs['Going_outside']
+    friends = inputs['Friends_circle_size']
+    posts = inputs['Post_frequency']
+    fear = inputs['Has_Stage_Fear']
+    drained = inputs['Gets_Drained_Socializing']
+
+    features = dict(inputs)
+    features['Social_Activity_Score'] = (events + outside + posts) / 3
+    features['Introversion_Score'] = (alone + fear * 10 + drained * 10) / 3
+    features['Social_Comfort'] = (friends + (1 - fear) * 10) / 2
+    features['Digital_vs_Physical_Social'] = posts - events
+    features['Social_Energy_Balance'] = events - drained * 5
+    return features
+
+
+def build_feature_matrix(columns, feature_names=MODEL_FEATURES, dtype=np.float32, clip=True):
+    """Build the contiguous (n, 11) model input matrix from raw answers"""
+    inputs = input_columns(columns)
+    if clip:
+        clip_behavioral(inputs)
+    features = engineer_features(inputs)
+
+    X = np.empty((len(inputs[INPUT_FEATURES[0]]), len(feature_names)), dtype=dtype)
+    for i, name in enumerate(feature_names):
+        X[:, i] = features[name]
+    return X
+
+
+def add_engineered_features(df, target_column='Personality'):
+    """Add the engineered and binary feature columns to a cleaned survey DataFrame"""
+    features = engineer_features(input_columns(df))
+    for feature in ENGINEERED_FEATURES:
+        df[feature] = features[feature]
+
+    # Unrecognised answers count as "No", matching (df[col] == 'Yes').astype(int)
+    for feature in BINARY_FEATURES:
+        df[feature] = (features[feature] == 1).astype(int)
+
+    if target_column in df.columns:
+        df['Is_Introvert'] = (df[target_column] == 'Introvert').astype(int)
+    return df
+
+
+def iter_feature_matrices(csv_path, chunksize=100_000, **read_csv_kwargs):
+    """Yield (chunk, feature matrix) pairs from a CSV without loading it whole"""
+    for chunk in pd.read_csv(csv_path, chunksize=chunksize, **read_csv_kwargs):
+        yield chunk, build_feature_matrix(chunk)
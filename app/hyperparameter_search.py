@@ -0,0 +1,268 @@
+import argparse
+import json
+import math
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+
+import training_harness
+from training_harness import METRICS, FoldCache, candidate_models, evaluate_fold, load_training_data
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+TRIAL_DB = os.path.join(DATA_DIR, 'processed', 'hyperparameter_trials.sqlite')
+
+# Parameter distributions per candidate: a list is a choice, ('log', low, high)
+# is log-uniform and ('int', low, high) an inclusive integer range
+SEARCH_SPACES = {
+    'Logistic Regression': {'C': ('log', 1e-3, 1e2)},
+    'Naive Bayes': {'var_smoothing': ('log', 1e-12, 1e-3)},
+    'Random Forest': {
+        'max_depth': [None, 5, 10, 20],
+        'min_samples_leaf': [1, 2, 4, 8],
+        'max_features': ['sqrt', 'log2', None]
+    },
+    'SVM': {'C': ('log', 1e-2, 1e2), 'gamma': ['scale', 0.001, 0.01, 0.1, 1.0]},
+    'XGBoost': {
+        'max_depth': ('int', 2, 10),
+        'learning_rate': ('log', 0.01, 0.3),
+        'subsample': [0.6, 0.8, 1.0],
+        'colsample_bytree': [0.6, 0.8, 1.0]
+    },
+    'Decision Tree': {
+        'max_depth': [3, 5, 8, 10, 15, None],
+        'min_samples_leaf': [1, 2, 4, 8, 16],
+        'criterion': ['gini', 'entropy']
+    },
+    'KNN': {'n_neighbors': ('int', 1, 50), 'weights': ['uniform', 'distance']}
+}
+
+# What each candidate's budget buys: (resource, smallest budget, full budget).
+# Ensembles grow with more trees; the others see a larger share of each fold.
+BUDGETS = {
+    'Random Forest': ('n_estimators', 50, 450),
+    'XGBoost': ('n_estimators', 50, 450)
+}
+DEFAULT_BUDGET = ('train_fraction', 1 / 9, 1.0)
+
+
+def sample_params(space, rng):
+    """Draw one configuration from a search space"""
+    params = {}
+    for name, distribution in space.items():
+        if isinstance(distribution, list):
+            value = distribution[rng.integers(len(distribution))]
+        elif distribution[0] == 'log':
+            value = float(math.exp(rng.uniform(math.log(distribution[1]), math.log(distribution[2]))))
+        else:
+            value = int(rng.integers(distribution[1], distribution[2] + 1))
+        params[name] = value.item() if isinstance(value, np.generic) else value
+    return params
+
+
+def rung_budgets(model_name, eta):
+    """Budget of every successive-halving rung, growing by eta up to the full budget"""
+    _, low, high = BUDGETS.get(model_name, DEFAULT_BUDGET)
+    n_rungs = int(math.floor(math.log(high / low) / math.log(eta) + 1e-9)) + 1
+    budgets = [low * eta ** rung for rung in range(n_rungs - 1)] + [high]
+    if BUDGETS.get(model_name, DEFAULT_BUDGET)[0] == 'n_estimators':
+        budgets = [int(round(budget)) for budget in budgets]
+    return budgets
+
+
+class TrialStore:
+    """SQLite record of every finished trial, so an interrupted search can resume
+
+    Trials are keyed by (study, model, config, rung). Only the process that
+    runs the search writes to the database.
+    """
+
+    def __init__(self, path=TRIAL_DB):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS studies (
+                study TEXT PRIMARY KEY,
+                settings TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS trials (
+                study TEXT NOT NULL,
+                model TEXT NOT NULL,
+                config INTEGER NOT NULL,
+                rung INTEGER NOT NULL,
+                params TEXT NOT NULL,
+                budget REAL NOT NULL,
+                score REAL NOT NULL,
+                score_std REAL NOT NULL,
+                metrics TEXT NOT NULL,
+                fit_time REAL NOT NULL,
+                PRIMARY KEY (study, model, config, rung)
+            );
+        """)
+
+    def open_study(self, study, settings):
+        """Register a study, or check that an existing one was run with the same settings"""
+        settings = json.dumps(settings, sort_keys=True)
+        row = self.connection.execute("SELECT settings FROM studies WHERE study = ?", (study,)).fetchone()
+        if row is None:
+            with self.connection:
+                self.connection.execute("INSERT INTO studies VALUES (?, ?)", (study, settings))
+        elif row[0] != settings:
+            raise ValueError(f"Study '{study}' was started with different data or settings; use a new study name")
+
+    def finished(self, study, model):
+        """{(config, rung): score} of the model's finished trials"""
+        rows = self.connection.execute(
+            "SELECT config, rung, score FROM trials WHERE study = ? AND model = ?", (study, model))
+        return {(config, rung): score for config, rung, score in rows}
+
+    def record(self, study, model, config, rung, params, budget, result):
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO trials VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (study, model, config, rung, json.dumps(params), budget, result['score'], result['score_std'],
+                 json.dumps({metric: result[metric] for metric in METRICS}), result['fit_time']))
+
+    def trials(self, study):
+        """Every finished trial of a study as a DataFrame"""
+        return pd.read_sql_query("SELECT * FROM trials WHERE study = ? ORDER BY model, rung, config",
+                                 self.connection, params=(study,))
+
+    def close(self):
+        self.connection.close()
+
+
+def evaluate_trial(cache, model_name, estimator, scaled, budget, scoring='Accuracy'):
+    """Mean cross-validated metrics of one configuration at one budget"""
+    resource = BUDGETS.get(model_name, DEFAULT_BUDGET)[0]
+    if resource == 'n_estimators':
+        estimator, train_fraction = clone(estimator).set_params(n_estimators=budget), 1.0
+    else:
+        train_fraction = budget
+
+    folds = pd.DataFrame([evaluate_fold(cache, model_name, estimator, scaled, fold, train_fraction)
+                          for fold in range(cache.n_splits)])
+    result = {metric: float(folds[metric].mean()) for metric in METRICS}
+    result['score'] = result[scoring]
+    result['score_std'] = float(folds[scoring].std(ddof=0))
+    result['fit_time'] = float(folds['Fit_Time'].sum())
+    return result
+
+
+def _evaluate_trial_in_worker(model_name, estimator, scaled, budget, scoring):
+    return evaluate_trial(training_harness._worker['cache'], model_name, estimator, scaled, budget, scoring)
+
+
+def search(X, y, models=None, n_configs=27, eta=3, n_splits=5, n_jobs=-1, scoring='Accuracy',
+           seed=42, study='default', db_path=TRIAL_DB, cache_dir=training_harness.CACHE_DIR):
+    """Successive-halving search over every candidate's hyperparameters
+
+    Each model starts ``n_configs`` random configurations on its smallest
+    budget; after every rung only the best 1/eta go on to a budget eta times
+    larger, so weak configurations are stopped early. Rungs of all models
+    run together on one process pool. Finished trials are stored in SQLite
+    and skipped when the same study is run again. Returns (best configuration
+    per model at full budget, all trials).
+    """
+    models = models if models is not None else candidate_models()
+    cache = FoldCache.build(X, y, n_splits=n_splits, cache_dir=cache_dir)
+    store = TrialStore(db_path)
+    store.open_study(study, {
+        'data': os.path.basename(cache.directory), 'n_configs': n_configs, 'eta': eta,
+        'scoring': scoring, 'seed': seed, 'models': sorted(models)
+    })
+
+    # Configurations are drawn from a fixed seed, so a resumed study sees the same ones
+    configs = {}
+    for i, name in enumerate(sorted(models)):
+        rng = np.random.default_rng([seed, i])
+        configs[name] = [sample_params(SEARCH_SPACES.get(name, {}), rng) for _ in range(n_configs)]
+    budgets = {name: rung_budgets(name, eta) for name in models}
+    alive = {name: list(range(n_configs)) for name in models}
+
+    n_jobs = os.cpu_count() if n_jobs in (None, -1) else n_jobs
+    pool = None
+    if n_jobs != 1:
+        pool = ProcessPoolExecutor(max_workers=n_jobs, initializer=training_harness._init_worker,
+                                   initargs=(cache.directory,))
+    try:
+        for rung in range(max(len(b) for b in budgets.values())):
+            pending = []
+            scores = {}
+            for name, (estimator, scaled) in models.items():
+                if rung >= len(budgets[name]):
+                    continue
+                done = store.finished(study, name)
+                for config in alive[name]:
+                    if (config, rung) in done:
+                        scores[name, config] = done[config, rung]
+                        continue
+                    trial = (name, clone(estimator).set_params(**configs[name][config]), scaled,
+                             budgets[name][rung], scoring)
+                    pending.append((name, config, trial))
+
+            if pool is None:
+                results = (evaluate_trial(cache, *trial) for _, _, trial in pending)
+            else:
+                results = pool.map(_evaluate_trial_in_worker, *zip(*[trial for _, _, trial in pending])) \
+                    if pending else []
+            # Each result is stored as soon as it arrives, so an interruption loses only running trials
+            for (name, config, trial), result in zip(pending, results):
+                store.record(study, name, config, rung, configs[name][config], trial[3], result)
+                scores[name, config] = result['score']
+
+            for name in models:
+                if rung < len(budgets[name]) - 1:
+                    ranked = sorted(alive[name], key=lambda config: (-scores[name, config], config))
+                    alive[name] = ranked[:max(1, len(ranked) // eta)]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    trials = store.trials(study)
+    store.close()
+    final = trials[trials['rung'] == trials['model'].map(lambda name: len(budgets[name]) - 1)]
+    best = (final.sort_values(['score', 'config'], ascending=[False, True])
+            .groupby('model', sort=False).head(1)
+            .sort_values('score', ascending=False).reset_index(drop=True))
+    return best[['model', 'params', 'budget', 'score', 'score_std']], trials
+
+
+def main():
+    models = candidate_models()
+    parser = argparse.ArgumentParser(description="Successive-halving hyperparameter search for every candidate model")
+    parser.add_argument('--data', help="Cleaned CSV (default: personality_dataset_cleaned.csv)")
+    parser.add_argument('--models', nargs='+', choices=list(models), metavar='MODEL',
+                        help=f"Subset of candidate names to search: {', '.join(models)}")
+    parser.add_argument('--configs', type=int, default=27, help="Configurations started per model")
+    parser.add_argument('--eta', type=int, default=3, help="Budget growth and survivor ratio between rungs")
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--n-jobs', type=int, default=-1, help="Worker processes; -1 uses every core")
+    parser.add_argument('--scoring', default='Accuracy', choices=METRICS)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--study', default='default', help="Rerunning a study resumes it")
+    parser.add_argument('--db', default=TRIAL_DB, help="SQLite trial store")
+    args = parser.parse_args()
+    if args.n_jobs == 0 or args.n_jobs < -1:
+        parser.error("--n-jobs must be a positive number of processes or -1 for every core")
+
+    X, y = load_training_data(args.data)
+    if args.models:
+        models = {name: models[name] for name in args.models}
+
+    start = time.perf_counter()
+    best, trials = search(X, y, models, n_configs=args.configs, eta=args.eta, n_splits=args.folds,
+                          n_jobs=args.n_jobs, scoring=args.scoring, seed=args.seed, study=args.study,
+                          db_path=args.db)
+    with pd.option_context('display.max_colwidth', None):
+        print(best.round(4).to_string(index=False))
+    print(f"\n{len(trials)} trials in study '{args.study}' ({time.perf_counter() - start:.1f}s this run)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+import argparse
+import asyncio
+import base64
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from image_store import ImageStore
+
+DEFAULT_MODEL = os.environ.get('IMAGE_MODEL', 'gpt-4o-mini')
+# None uses the OpenAI API; point it at image_stub_server.py to test without one
+DEFAULT_BASE_URL = os.environ.get('OPENAI_BASE_URL')
+DEFAULT_TIMEOUT = float(os.environ.get('IMAGE_TIMEOUT', 120))
+MAX_CONNECTIONS = int(os.environ.get('IMAGE_MAX_CONNECTIONS', 8))
+# API keys whose connection pools are kept open
+MAX_CLIENTS = int(os.environ.get('IMAGE_MAX_CLIENTS', 32))
+
+IMAGE_TOOL = {"type": "image_generation"}
+
+
+class NoImageError(Exception):
+    """The API answered without an image"""
+
+
+class ImageClient:
+    """Image generation over persistent, pooled connections, with identical in-flight requests coalesced
+
+    Requests run on the client's own event loop, on a daemon thread, so the
+    connection pools outlive Streamlit reruns and are shared by every
+    session. Each API key gets one AsyncOpenAI client with its own pool. A
+    request for a (model, prompt) that is already in flight waits for that
+    request's image instead of sending another. With a store, requests it
+    already holds enough images for are answered from disk.
+    """
+
+    def __init__(self, base_url=DEFAULT_BASE_URL, model=DEFAULT_MODEL, timeout=DEFAULT_TIMEOUT,
+                 max_connections=MAX_CONNECTIONS, max_clients=MAX_CLIENTS, store=None):
+        self.base_url = base_url
+        self.model = model
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_clients = max_clients
+        self.store = store
+        self.requests = 0
+        self.coalesced = 0
+        # Only touched on the loop thread
+        self._clients = OrderedDict()
+        self._busy = {}
+        self._retired = set()
+        self._in_flight = {}
+        self._loop = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self):
+        """The client's event loop, started on first use"""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name='image-client', daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def _client(self, api_key):
+        client = self._clients.get(api_key)
+        if client is not None:
+            self._clients.move_to_end(api_key)
+            return client
+
+        import httpx
+        import openai
+
+        http_client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=self.max_connections,
+                                max_keepalive_connections=self.max_connections)
+        )
+        client = openai.AsyncOpenAI(api_key=api_key, base_url=self.base_url, http_client=http_client)
+        self._clients[api_key] = client
+        while len(self._clients) > self.max_clients:
+            _, evicted = self._clients.popitem(last=False)
+            if self._busy.get(evicted):
+                # Closed by _release() once its requests finish
+                self._retired.add(evicted)
+            else:
+                asyncio.ensure_future(evicted.close())
+        return client
+
+    def _release(self, client):
+        self._busy[client] -= 1
+        if not self._busy[client]:
+            del self._busy[client]
+            if client in self._retired:
+                self._retired.discard(client)
+                asyncio.ensure_future(client.close())
+
+    async def _request(self, api_key, prompt):
+        self.requests += 1
+        client = self._client(api_key)
+        self._busy[client] = self._busy.get(client, 0) + 1
+        try:
+            response = await client.responses.create(
+                model=self.model,
+                input=prompt,
+                tools=[IMAGE_TOOL],
+            )
+        finally:
+            self._release(client)
+        for output in response.output:
+            if output.type == "image_generation_call" and output.result:
+                image = base64.b64decode(output.result)
+                if self.store is not None:
+                    await asyncio.to_thread(self.store.put, self.model, prompt, image, IMAGE_TOOL)
+                return image
+        raise NoImageError("No image data found in response")
+
+    async def agenerate(self, api_key, prompt):
+        """Image bytes for a prompt; must be awaited on self.loop
+
+        Joins an identical request already in flight. If that request fails
+        and was sent with a different API key, this one is retried with its
+        own key, so one user's bad key or quota never fails another's image.
+        """
+        if self.store is not None:
+            image = await asyncio.to_thread(self.store.get, self.model, prompt, IMAGE_TOOL)
+            if image is not None:
+                return image
+
+        key = (self.model, prompt)
+        entry = self._in_flight.get(key)
+        if entry is None:
+            task = asyncio.ensure_future(self._request(api_key, prompt))
+            self._in_flight[key] = entry = (task, api_key)
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.coalesced += 1
+
+        task, leader_key = entry
+        try:
+            # Shielded so a waiter that gives up does not cancel the request for the others
+            return await asyncio.shield(task)
+        except (asyncio.CancelledError, NoImageError):
+            raise
+        except Exception:
+            if leader_key == api_key:
+                raise
+            return await self._request(api_key, prompt)
+
+    def generate(self, api_key, prompt, timeout=None):
+        """Blocking agenerate() for synchronous callers such as Streamlit scripts"""
+        future = asyncio.run_coroutine_threadsafe(self.agenerate(api_key, prompt), self.loop)
+        return future.result(self.timeout if timeout is None else timeout)
+
+    def stats(self):
+        stats = {'requests': self.requests, 'coalesced': self.coalesced, 'clients': len(self._clients)}
+        if self.store is not None:
+            stats['store'] = self.store.stats()
+        return stats
+
+    def close(self):
+        """Close every connection pool and stop the loop"""
+        if self._loop is None:
+            return
+
+        async def close_all():
+            for client in [*self._clients.values(), *self._retired]:
+                await client.close()
+            self._clients.clear()
+            self._retired.clear()
+
+        asyncio.run_coroutine_threadsafe(close_all(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop = None
+
+
+# One client per process, shared by every Streamlit session
+IMAGE_CLIENT = ImageClient(store=ImageStore())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Send concurrent image requests through the pooled client")
+    parser.add_argument('prompts', nargs='+')
+    parser.add_argument('--api-key', default=os.environ.get('OPENAI_API_KEY'))
+    parser.add_argument('--base-url', default=DEFAULT_BASE_URL, help="e.g. http://127.0.0.1:8765/v1 for the stub server")
+    parser.add_argument('--model', default=DEFAULT_MODEL)
+    parser.add_argument('--repeat', type=int, default=1, help="Concurrent copies of each prompt")
+    parser.add_argument('--no-store', action='store_true', help="Always call the API, bypassing the image store")
+    args = parser.parse_args()
+
+    client = ImageClient(args.base_url, args.model, store=None if args.no_store else ImageStore())
+
+    async def run_all():
+        return await asyncio.gather(*(client.agenerate(args.api_key, prompt)
+                                      for prompt in args.prompts for _ in range(args.repeat)))
+
+    start = time.perf_counter()
+    images = asyncio.run_coroutine_threadsafe(run_all(), client.loop).result()
+    elapsed = time.perf_counter() - start
+    print(f"{len(images)} images ({sum(map(len, images)):,} bytes) in {elapsed:.2f}s: {client.stats()}")
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
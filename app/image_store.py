@@ -0,0 +1,185 @@
+import argparse
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+STORE_DIR = os.environ.get('IMAGE_STORE_DIR', os.path.join(DATA_DIR, 'processed', 'image_store'))
+DEFAULT_MAX_BYTES = int(os.environ.get('IMAGE_STORE_MB', 512)) * 2 ** 20
+# Distinct images kept per prompt; 0 turns the store off
+DEFAULT_VARIANTS = int(os.environ.get('IMAGE_STORE_VARIANTS', 3))
+
+
+def request_key(model, prompt, params=None):
+    """Content address of a generation request: the same model, prompt and parameters give the same key"""
+    request = {'model': model, 'prompt': prompt, 'params': params or {}}
+    return hashlib.sha256(json.dumps(request, sort_keys=True).encode()).hexdigest()
+
+
+class ImageStore:
+    """Disk store of generated images, keyed by request and kept under max_bytes by LRU eviction
+
+    Images are stored once per content hash under blobs/ and indexed in
+    SQLite, so every process on the host shares them. Up to `variants`
+    images are kept per request; until a request has that many, get()
+    misses so callers generate another, and after that every hit returns
+    one of them at random. A request that is given an image it already
+    has is served from what it has, since more calls add no variety.
+    """
+
+    def __init__(self, root=STORE_DIR, max_bytes=DEFAULT_MAX_BYTES, variants=DEFAULT_VARIANTS):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.variants = variants
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._connection = None
+        self._lock = threading.Lock()
+
+    @property
+    def connection(self):
+        """The SQLite index, created on first use"""
+        if self._connection is None:
+            os.makedirs(os.path.join(self.root, 'blobs'), exist_ok=True)
+            connection = sqlite3.connect(os.path.join(self.root, 'index.sqlite'), timeout=30,
+                                         check_same_thread=False)
+            connection.executescript("""
+                CREATE TABLE IF NOT EXISTS blobs (
+                    digest TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    last_used REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS variants (
+                    request TEXT NOT NULL,
+                    digest TEXT NOT NULL,
+                    PRIMARY KEY (request, digest)
+                );
+                CREATE TABLE IF NOT EXISTS repeated (
+                    request TEXT PRIMARY KEY
+                );
+                CREATE INDEX IF NOT EXISTS blobs_by_use ON blobs (last_used);
+                CREATE INDEX IF NOT EXISTS variants_by_digest ON variants (digest);
+            """)
+            self._connection = connection
+        return self._connection
+
+    def _blob_path(self, digest):
+        return os.path.join(self.root, 'blobs', digest[:2], f'{digest}.png')
+
+    def get(self, model, prompt, params=None):
+        """Stored image bytes for the request, or None while it has fewer than `variants` images"""
+        if self.variants <= 0:
+            return None
+        key = request_key(model, prompt, params)
+        with self._lock:
+            digests = [row[0] for row in self.connection.execute(
+                "SELECT digest FROM variants WHERE request = ?", (key,))]
+            if not digests or (len(digests) < self.variants and self.connection.execute(
+                    "SELECT 1 FROM repeated WHERE request = ?", (key,)).fetchone() is None):
+                self.misses += 1
+                return None
+            digest = random.choice(digests)
+            try:
+                with open(self._blob_path(digest), 'rb') as f:
+                    data = f.read()
+            except FileNotFoundError:
+                # Removed behind the index's back; regenerate it
+                self._forget(digest)
+                self.misses += 1
+                return None
+            with self.connection:
+                self.connection.execute("UPDATE blobs SET last_used = ? WHERE digest = ?", (time.time(), digest))
+            self.hits += 1
+            return data
+
+    def put(self, model, prompt, data, params=None):
+        """Add an image as a variant of the request, then evict least recently used images over max_bytes"""
+        if self.variants <= 0:
+            return
+        key = request_key(model, prompt, params)
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+        with self._lock:
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f'{path}.{os.getpid()}.tmp'
+                with open(tmp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            with self.connection:
+                self.connection.execute("INSERT OR REPLACE INTO blobs VALUES (?, ?, ?)", (digest, len(data), time.time()))
+                added = self.connection.execute("INSERT OR IGNORE INTO variants VALUES (?, ?)", (key, digest)).rowcount
+                if not added:
+                    self.connection.execute("INSERT OR IGNORE INTO repeated VALUES (?)", (key,))
+            self._evict()
+
+    def _forget(self, digest):
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM repeated WHERE request IN (SELECT request FROM variants WHERE digest = ?)", (digest,))
+            self.connection.execute("DELETE FROM variants WHERE digest = ?", (digest,))
+            self.connection.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+        try:
+            os.remove(self._blob_path(digest))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self):
+        total = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for digest, size in self.connection.execute("SELECT digest, size FROM blobs ORDER BY last_used").fetchall():
+            self._forget(digest)
+            self.evictions += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        with self._lock:
+            for (digest,) in self.connection.execute("SELECT digest FROM blobs").fetchall():
+                self._forget(digest)
+
+    def stats(self):
+        with self._lock:
+            images, size = self.connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs").fetchone()
+            requests = self.connection.execute("SELECT COUNT(DISTINCT request) FROM variants").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                'images': images,
+                'requests': requests,
+                'bytes': size,
+                'max_bytes': self.max_bytes,
+                'variants': self.variants,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions
+            }
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or empty the generated image store")
+    parser.add_argument('--root', default=STORE_DIR)
+    parser.add_argument('--clear', action='store_true', help="Delete every stored image")
+    args = parser.parse_args()
+
+    store = ImageStore(args.root)
+    if args.clear:
+        store.clear()
+    print(json.dumps(store.stats(), indent=2))
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
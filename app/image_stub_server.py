@@ -0,0 +1,92 @@
+import argparse
+import asyncio
+import base64
+import hashlib
+import io
+import json
+
+from PIL import Image
+
+
+class ImageStubServer:
+    """Local stand-in for the OpenAI Responses API's image generation tool
+
+    POST /v1/responses answers after ``delay`` seconds with a small PNG whose
+    color is derived from the prompt, with one pixel that differs between
+    requests so repeated prompts get distinct images. Keys containing "invalid" get a 401.
+    GET /stats reports how many requests and client connections it has seen.
+    """
+
+    def __init__(self, delay=1.0, size=64):
+        self.delay = delay
+        self.size = size
+        self.requests = 0
+        self.connections = set()
+
+    def image_base64(self, prompt):
+        color = tuple(hashlib.sha256(prompt.encode()).digest()[:3])
+        buffer = io.BytesIO()
+        image = Image.new('RGB', (self.size, self.size), color)
+        image.putpixel((0, 0), tuple(self.requests.to_bytes(3, 'big')))
+        image.save(buffer, format='PNG')
+        return base64.b64encode(buffer.getvalue()).decode()
+
+    async def respond(self, headers, body):
+        self.requests += 1
+        if b'invalid' in headers.get(b'authorization', b''):
+            return 401, {'error': {'message': "Incorrect API key provided", 'type': 'invalid_request_error',
+                                   'code': 'invalid_api_key'}}
+        await asyncio.sleep(self.delay)
+        return 200, {
+            'id': f'resp_stub_{self.requests}',
+            'object': 'response',
+            'status': 'completed',
+            'model': body.get('model'),
+            'output': [{
+                'id': f'ig_stub_{self.requests}',
+                'type': 'image_generation_call',
+                'status': 'completed',
+                'result': self.image_base64(str(body.get('input')))
+            }]
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return
+        self.connections.add(tuple(scope.get('client') or ()))
+        if scope['method'] == 'GET' and scope['path'] == '/stats':
+            status, payload = 200, {'requests': self.requests, 'connections': len(self.connections)}
+        elif scope['method'] == 'POST' and scope['path'] == '/v1/responses':
+            chunks = []
+            more_body = True
+            while more_body:
+                message = await receive()
+                chunks.append(message.get('body', b''))
+                more_body = message.get('more_body', False)
+            status, payload = await self.respond(dict(scope['headers']), json.loads(b''.join(chunks) or b'{}'))
+        else:
+            status, payload = 404, {'error': {'message': "Not found"}}
+
+        data = json.dumps(payload).encode()
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(data)).encode())]
+        })
+        await send({'type': 'http.response.body', 'body': data})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local stub of the OpenAI image generation API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--delay', type=float, default=1.0, help="Seconds each image takes to 'generate'")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    uvicorn.run(ImageStubServer(args.delay), host=args.host, port=args.port, lifespan='off')
+
+
+if __name__ == "__main__":
+    main()
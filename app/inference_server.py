@@ -0,0 +1,272 @@
+import argparse
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from features import BINARY_SOURCES, INPUT_FEATURES, input_columns
+from live_model import LiveModel
+
+DEFAULT_MODEL = os.environ.get('PERSONALITY_MODEL', 'naive_bayes')
+DEFAULT_MODEL_VERSION = os.environ.get('PERSONALITY_MODEL_VERSION')
+DEFAULT_MAX_BATCH_SIZE = int(os.environ.get('MAX_BATCH_SIZE', 256))
+DEFAULT_MAX_WAIT_MS = float(os.environ.get('MAX_WAIT_MS', 2))
+
+# Upper bound on a request body, well above any realistic /predict_batch payload
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+# Fields read from each record; the Yes/No survey columns may stand in for the binary features
+INPUT_FIELDS = set(INPUT_FEATURES) | set(BINARY_SOURCES.values())
+
+
+class RequestError(Exception):
+    """Client error that is reported as an HTTP 4xx response"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def rows_from_records(records):
+    """Validate JSON records and return them as an (n, 7) float array in INPUT_FEATURES order"""
+    if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+        raise RequestError("Expected a JSON object or a list of JSON objects")
+    if not records:
+        return np.empty((0, len(INPUT_FEATURES)))
+
+    # Only columns present in every record count, so a partial record reports what it is missing
+    names = set.intersection(*(set(r) for r in records)) & INPUT_FIELDS
+    columns = {name: [r[name] for r in records] for name in names}
+    for name in sorted(names):
+        nested = [i for i, value in enumerate(columns[name]) if isinstance(value, (list, dict))]
+        if nested:
+            raise RequestError(f"{name} must be a single value, not a list or object, in rows: {nested[:10]}")
+    try:
+        inputs = input_columns(columns)
+    except ValueError as e:
+        raise RequestError(str(e))
+
+    X = np.column_stack([inputs[feature] for feature in INPUT_FEATURES])
+    bad_rows = np.flatnonzero(np.isnan(X).any(axis=1))
+    if len(bad_rows):
+        raise RequestError(f"Missing or non-numeric values in rows: {bad_rows[:10].tolist()}")
+    return X
+
+
+class MicroBatcher:
+    """Coalesce concurrent single-row requests into one vectorized predict_proba call
+
+    Each request waits at most ``max_wait_ms`` for others to join its batch, and
+    a batch is flushed as soon as it holds ``max_batch_size`` rows. Scoring runs
+    on a worker thread so the event loop keeps accepting requests meanwhile.
+    """
+
+    def __init__(self, predictor, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+        self.predictor = predictor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.queue = None
+        self.task = None
+
+    async def start(self):
+        """Start the background batching loop on the running event loop"""
+        self.queue = asyncio.Queue()
+        self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Cancel the batching loop and release the worker thread"""
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+        self.executor.shutdown(wait=False)
+
+    async def predict(self, row):
+        """Queue one (7,) input row and wait for its class probabilities"""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((row, future))
+        return await future
+
+    async def _collect(self):
+        """Wait for one request, then gather more until the batch is full or the wait expires"""
+        batch = [await self.queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            # Drain whatever is already queued without touching the timer
+            while len(batch) < self.max_batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            remaining = deadline - loop.time()
+            if len(batch) >= self.max_batch_size or remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            # Requests whose client disconnected while queued are dropped here
+            batch = [(row, future) for row, future in batch if not future.done()]
+            if not batch:
+                continue
+
+            X = np.vstack([row for row, _ in batch])
+            try:
+                proba = await loop.run_in_executor(self.executor, self.predictor.predict_proba, X)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), p in zip(batch, proba):
+                if not future.done():
+                    future.set_result(p)
+
+
+class InferenceServer:
+    """Minimal ASGI application serving /predict, /predict_batch and /health"""
+
+    def __init__(self, model_name=DEFAULT_MODEL, max_batch_size=DEFAULT_MAX_BATCH_SIZE,
+                 max_wait_ms=DEFAULT_MAX_WAIT_MS, predictor=None, version=DEFAULT_MODEL_VERSION):
+        # Follows new registry versions unless a version is pinned; see live_model.py
+        self.predictor = predictor or LiveModel(model_name, version=version)
+        self.batcher = MicroBatcher(self.predictor, max_batch_size, max_wait_ms)
+        self.routes = {
+            ('GET', '/health'): self.health,
+            ('POST', '/predict'): self.predict,
+            ('POST', '/predict_batch'): self.predict_batch
+        }
+
+    def format_result(self, proba):
+        """Same result format as PersonalityPredictor.predict_single"""
+        best = int(proba.argmax())
+        return {
+            'personality': self.predictor.classes[best],
+            'confidence': float(proba[best] * 100),
+            'probabilities': {name: float(p * 100) for name, p in zip(self.predictor.classes, proba)}
+        }
+
+    async def health(self, body):
+        return {'status': 'ok', 'model': self.predictor.model_name, 'version': self.predictor.version}
+
+    async def predict(self, body):
+        if not isinstance(body, dict):
+            raise RequestError("Expected a JSON object with the seven input features")
+        row = rows_from_records([body])[0]
+        return self.format_result(await self.batcher.predict(row))
+
+    async def predict_batch(self, body):
+        # Accept either a bare list of records or {"instances": [...]}
+        records = body.get('instances') if isinstance(body, dict) else body
+        X = rows_from_records(records)
+        if not len(X):
+            return {'predictions': []}
+
+        # Batches are already vectorized, so they skip the micro-batcher
+        loop = asyncio.get_running_loop()
+        proba = await loop.run_in_executor(self.batcher.executor, self.predictor.predict_proba, X)
+        return {'predictions': [self.format_result(p) for p in proba]}
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self._http(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await self.batcher.start()
+                if isinstance(self.predictor, LiveModel):
+                    self.predictor.start()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.batcher.stop()
+                if isinstance(self.predictor, LiveModel):
+                    self.predictor.stop()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _read_body(self, receive):
+        chunks = []
+        size = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                raise RequestError("Client disconnected", status=499)
+            chunk = message.get('body', b'')
+            size += len(chunk)
+            if size > MAX_BODY_BYTES:
+                raise RequestError("Request body too large", status=413)
+            chunks.append(chunk)
+            more_body = message.get('more_body', False)
+        return b''.join(chunks)
+
+    async def _http(self, scope, receive, send):
+        handler = self.routes.get((scope['method'], scope['path']))
+        try:
+            if handler is None:
+                known_path = any(path == scope['path'] for _, path in self.routes)
+                raise RequestError("Method not allowed" if known_path else "Not found",
+                                   status=405 if known_path else 404)
+
+            body = None
+            if scope['method'] == 'POST':
+                try:
+                    body = json.loads(await self._read_body(receive) or b'null')
+                except (UnicodeDecodeError, json.JSONDecodeError):
+                    raise RequestError("Request body is not valid JSON")
+
+            status, payload = 200, await handler(body)
+        except RequestError as e:
+            status, payload = e.status, {'error': str(e)}
+        except Exception as e:
+            status, payload = 500, {'error': f"Prediction failed: {e}"}
+
+        data = json.dumps(payload).encode()
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(data)).encode())]
+        })
+        await send({'type': 'http.response.body', 'body': data})
+
+
+def create_app(model_name=DEFAULT_MODEL, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait_ms=DEFAULT_MAX_WAIT_MS,
+               version=DEFAULT_MODEL_VERSION):
+    """Build the ASGI app; uvicorn can also load it with --factory"""
+    return InferenceServer(model_name, max_batch_size, max_wait_ms, version=version)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve personality predictions over HTTP")
+    parser.add_argument('--model', default=DEFAULT_MODEL, help="naive_bayes, logistic_regression or random_forest")
+    parser.add_argument('--version', default=DEFAULT_MODEL_VERSION, help="Registered model version (default: latest)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--max-batch-size', type=int, default=DEFAULT_MAX_BATCH_SIZE)
+    parser.add_argument('--max-wait-ms', type=float, default=DEFAULT_MAX_WAIT_MS,
+                        help="How long a request waits for others to join its batch")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    app = create_app(args.model, args.max_batch_size, args.max_wait_ms, args.version)
+    uvicorn.run(app, host=args.host, port=args.port, lifespan='on')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import codecs
+import threading
+import warnings
+
+import pandas as pd
+
+# Bytes read from the start of a file to guess its encoding
+SAMPLE_SIZE = 64 * 1024
+
+FALLBACK_ERRORS = 'ingest_cp1252_fallback'
+
+_fallback_counts = threading.local()
+
+
+def _decode_byte(byte):
+    # cp1252 leaves five bytes undefined; latin-1 maps every byte to a character
+    try:
+        return bytes([byte]).decode('cp1252')
+    except UnicodeDecodeError:
+        return chr(byte)
+
+
+def _cp1252_fallback(error):
+    """Codec error handler that decodes undecodable bytes one by one as cp1252"""
+    if not isinstance(error, UnicodeDecodeError):
+        raise error
+    bad = error.object[error.start:error.end]
+    _fallback_counts.value = getattr(_fallback_counts, 'value', 0) + len(bad)
+    return ''.join(_decode_byte(byte) for byte in bad), error.end
+
+
+codecs.register_error(FALLBACK_ERRORS, _cp1252_fallback)
+
+
+def sniff_encoding(path, sample_size=SAMPLE_SIZE):
+    """Guess a file's encoding from its first sample_size bytes
+
+    A byte-order mark decides outright. Otherwise the sample is UTF-8 if it
+    decodes as UTF-8 (a multi-byte character cut off at the end of the sample
+    is allowed), and cp1252 if it does not.
+    """
+    with open(path, 'rb') as f:
+        sample = f.read(sample_size)
+
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return 'utf-16'
+
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        decoder.decode(sample, final=len(sample) < sample_size)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'cp1252'
+
+
+def open_text(path, encoding=None, sample_size=SAMPLE_SIZE):
+    """Open a file for a single streaming decode; returns (file, encoding)
+
+    If the sniffed encoding turns out to be wrong further into the file, the
+    offending bytes are decoded as cp1252 instead of aborting, so the file
+    never has to be read a second time.
+    """
+    encoding = encoding or sniff_encoding(path, sample_size)
+    errors = 'strict' if encoding == 'utf-16' else FALLBACK_ERRORS
+    return open(path, encoding=encoding, errors=errors, newline=''), encoding
+
+
+def _warn_fallback(path, encoding, count):
+    if count:
+        warnings.warn(f"{path}: {count} bytes were not valid {encoding} and were decoded as cp1252")
+
+
+def read_csv(path, encoding=None, chunksize=None, **read_csv_kwargs):
+    """pd.read_csv that decodes the file exactly once
+
+    With chunksize, returns a generator of chunks that keeps the file open
+    until it is exhausted.
+    """
+    if chunksize is not None:
+        return _iter_chunks(path, encoding, chunksize, read_csv_kwargs)
+
+    _fallback_counts.value = 0
+    f, encoding = open_text(path, encoding)
+    with f:
+        df = pd.read_csv(f, **read_csv_kwargs)
+    _warn_fallback(path, encoding, _fallback_counts.value)
+    return df
+
+
+def _iter_chunks(path, encoding, chunksize, read_csv_kwargs):
+    _fallback_counts.value = 0
+    f, encoding = open_text(path, encoding)
+    with f:
+        for chunk in pd.read_csv(f, chunksize=chunksize, **read_csv_kwargs):
+            yield chunk
+    _warn_fallback(path, encoding, _fallback_counts.value)
@@ -0,0 +1,128 @@
+import os
+import threading
+import warnings
+
+from features import INPUT_FEATURES
+from model_registry import MANIFEST_NAME, MODELS_DIR, ModelRegistry, evict
+from personality_predictor import PersonalityPredictor
+
+# Seconds between checks for a new model version
+DEFAULT_POLL_INTERVAL = float(os.environ.get('MODEL_POLL_INTERVAL', 5))
+
+# One mid-range answer, scored once so a new model is fully loaded before it is swapped in
+WARMUP_SAMPLE = {feature: 5 for feature in INPUT_FEATURES[:5]}
+WARMUP_SAMPLE.update({feature: 0 for feature in INPUT_FEATURES[5:]})
+
+
+class LiveModel:
+    """A PersonalityPredictor that follows the registry's latest version without a restart
+
+    A background thread polls models/registry.json (or, without a manifest,
+    the artifact files) for changes. When the version to serve changes, the
+    new predictor is loaded and warmed up on that thread and then swapped in
+    with a single reference assignment. Each call reads ``current`` once, so
+    a request that started on the old model finishes on it. If the new
+    version fails to load, the old one keeps serving.
+
+    Attribute access and the predict methods are forwarded to ``current``.
+    """
+
+    def __init__(self, model_name='naive_bayes', models_dir=MODELS_DIR, version=None,
+                 poll_interval=DEFAULT_POLL_INTERVAL):
+        self.model_name = model_name
+        self.models_dir = models_dir
+        self.pinned_version = version
+        self.poll_interval = poll_interval
+        self.last_error = None
+        predictor = self._new_predictor(ModelRegistry(models_dir))
+        self._fingerprint = self._source_fingerprint(predictor)
+        self.current = self._warm(predictor)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __getattr__(self, name):
+        # Only called for attributes LiveModel does not define itself
+        if name == 'current':
+            raise AttributeError(name)
+        return getattr(self.current, name)
+
+    def predict_proba(self, data):
+        return self.current.predict_proba(data)
+
+    def predict_batch(self, data):
+        return self.current.predict_batch(data)
+
+    def predict_single(self, sample):
+        return self.current.predict_single(sample)
+
+    def _new_predictor(self, registry):
+        return PersonalityPredictor(self.model_name, version=self.pinned_version, registry=registry)
+
+    @staticmethod
+    def _warm(predictor):
+        predictor.predict_single(WARMUP_SAMPLE)
+        return predictor
+
+    def _source_fingerprint(self, predictor):
+        """Cheap signature of what decides the served version: the manifest, else the artifact files"""
+        manifest_path = os.path.join(self.models_dir, MANIFEST_NAME)
+        if os.path.exists(manifest_path):
+            stat = os.stat(manifest_path)
+            return ('manifest', stat.st_mtime_ns, stat.st_size)
+        keys = predictor.registry.artifact_keys(self.model_name, predictor.version)
+        return ('files',) + tuple((path, os.stat(path).st_mtime_ns) for path, _ in sorted(keys))
+
+    def _identity(self, predictor):
+        return predictor.version, predictor.registry.artifact_keys(self.model_name, predictor.version)
+
+    def check(self):
+        """Swap in a new predictor if the version to serve has changed; returns whether it did
+
+        Called periodically by the watcher thread, and safe to call directly.
+        """
+        old = self.current
+        fingerprint = self._source_fingerprint(old)
+        if fingerprint == self._fingerprint:
+            return False
+        self._fingerprint = fingerprint
+
+        new = self._new_predictor(ModelRegistry(self.models_dir))
+        if self._identity(new) == self._identity(old):
+            # The manifest changed for another model or an older version
+            return False
+
+        try:
+            self._warm(new)
+        except Exception as error:
+            # Retried on the next change; the current model keeps serving meanwhile
+            self.last_error = error
+            warnings.warn(f"Keeping {self.model_name} v{old.version}; loading v{new.version} failed: {error}")
+            return False
+
+        self.current = new
+        self.last_error = None
+        evict(self._identity(old)[1] - self._identity(new)[1])
+        return True
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.check()
+            except Exception as error:
+                # A manifest caught mid-write or a removed file; try again next poll
+                self.last_error = error
+
+    def start(self):
+        """Start polling in a daemon thread"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._watch, name=f'model-watcher-{self.model_name}',
+                                            daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -2,70 +2,15 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime
 
+from theme import apply_theme
+
 st.set_page_config(
     page_title="Personality Discovery Hub",
     page_icon="🧠",
     layout="wide"
 )
 
-st.markdown("""
-<style>
-    .app-card {
-        background: white;
-        padding: 3rem;
-        border-radius: 12px;
-        margin: 1.5rem 0;
-        box-shadow: 0 2px 8px rgba(0,0,0,0.08);
-        text-align: center;
-        border: 1px solid #e1e5e9;
-        transition: all 0.3s ease;
-        height: 280px;
-        display: flex;
-        flex-direction: column;
-        justify-content: space-between;
-    }
-    
-    .app-card:hover {
-        transform: translateY(-3px);
-        box-shadow: 0 4px 16px rgba(0,0,0,0.12);
-        border-color: #2c3e50;
-    }
-    
-    .app-title {
-        font-size: 1.5rem;
-        font-weight: 600;
-        color: #2c3e50;
-        margin-bottom: 1rem;
-    }
-    
-    .app-description {
-        color: #555;
-        line-height: 1.6;
-        margin-bottom: 1.5rem;
-        font-size: 1rem;
-        flex-grow: 1;
-    }
-    
-    .header-section {
-        text-align: center;
-        padding: 2rem 0;
-        margin-bottom: 2rem;
-    }
-    
-    .main-title {
-        font-size: 2.5rem;
-        font-weight: 700;
-        color: #2c3e50;
-        margin-bottom: 0.5rem;
-    }
-    
-    .subtitle {
-        font-size: 1.1rem;
-        color: #666;
-        font-weight: 400;
-    }
-</style>
-""", unsafe_allow_html=True)
+apply_theme('main_hub')
 
 def main():
     # Clean header
@@ -0,0 +1,324 @@
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import shutil
+import threading
+
+import joblib
+
+from compact_forest import CompactForest
+from features import INPUT_FEATURES
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'models')
+MANIFEST_NAME = 'registry.json'
+
+# Artifacts of the original flat models/ folder, recorded as version 1 of each model
+FLAT_MODEL_FILES = {
+    'naive_bayes': 'naive_bayes_model.pkl',
+    'logistic_regression': 'logistic_regression_model.pkl',
+    'random_forest': 'random_forest_model.pkl'
+}
+FLAT_SHARED_FILES = {
+    'scaler': 'standard_scaler.pkl',
+    'label_encoder': 'label_encoder.pkl',
+    'feature_names': 'feature_names.pkl'
+}
+FLAT_EXTRA_FILES = {'random_forest': {'compact': 'random_forest_compact'}}
+
+# model_metadata.pkl names models the way 04_Data_Modelling prints them
+DISPLAY_NAMES = {
+    'naive_bayes': 'Naive Bayes',
+    'logistic_regression': 'Logistic Regression',
+    'random_forest': 'Random Forest'
+}
+
+# Loaded artifacts shared by every registry (and Streamlit session) in this
+# process, keyed by path and content hash so a new version is never served stale
+_loaded = {}
+_load_lock = threading.Lock()
+
+
+def artifact_sha256(path, block_size=1 << 20):
+    """Hex SHA-256 of a file, or of every file in a directory together with its name"""
+    digest = hashlib.sha256()
+    if os.path.isdir(path):
+        files = sorted(os.listdir(path))
+    else:
+        files = [None]
+    for name in files:
+        file_path = path if name is None else os.path.join(path, name)
+        if name is not None:
+            digest.update(name.encode() + b'\0')
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def _load_artifact(path):
+    if os.path.isdir(path):
+        return CompactForest.load(path)
+    return joblib.load(path)
+
+
+class ModelRegistry:
+    """Versioned model artifacts described by models/registry.json
+
+    Every version of a model lists its artifacts (the model itself and the
+    scaler, label encoder and feature names it was trained with) with their
+    SHA-256, plus its metrics and feature schema. Paths in the manifest are
+    relative to the models folder. Without a manifest, the flat folder is read
+    as version 1 of each model.
+    """
+
+    def __init__(self, models_dir=MODELS_DIR):
+        self.models_dir = models_dir
+        self.manifest_path = os.path.join(models_dir, MANIFEST_NAME)
+        self.reload()
+
+    def reload(self):
+        """Re-read the manifest, e.g. after another process registered a version"""
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as f:
+                self.manifest = json.load(f)
+        else:
+            self.manifest = scan_flat_models(self.models_dir)
+
+    def save(self):
+        temp_path = self.manifest_path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(self.manifest, f, indent=2)
+            f.write('\n')
+        os.replace(temp_path, self.manifest_path)
+
+    def names(self):
+        return sorted(self.manifest['models'])
+
+    def versions(self, name):
+        return sorted(self._entry(name)['versions'], key=int)
+
+    def _entry(self, name):
+        if name not in self.manifest['models']:
+            raise ValueError(f"Unknown model '{name}'. Choose from: {self.names()}")
+        return self.manifest['models'][name]
+
+    def resolve(self, name, version=None):
+        """(version, record) of a model; version None or 'latest' means the current one"""
+        entry = self._entry(name)
+        version = entry['latest'] if version in (None, 'latest') else str(version)
+        if version not in entry['versions']:
+            raise ValueError(f"Model '{name}' has no version {version}. Available: {self.versions(name)}")
+        return version, entry['versions'][version]
+
+    def has_artifact(self, name, role, version=None):
+        return role in self.resolve(name, version)[1]['artifacts']
+
+    def artifact_path(self, name, role='model', version=None):
+        """Absolute path of one artifact of a model version"""
+        version, record = self.resolve(name, version)
+        if role not in record['artifacts']:
+            raise ValueError(f"Model '{name}' version {version} has no '{role}' artifact")
+        return os.path.join(self.models_dir, record['artifacts'][role]['path'])
+
+    def artifact_keys(self, name, version=None):
+        """Cache keys of every artifact of a model version, as used by load()"""
+        version, record = self.resolve(name, version)
+        return {
+            (os.path.realpath(os.path.join(self.models_dir, artifact['path'])), artifact['sha256'])
+            for artifact in record['artifacts'].values()
+        }
+
+    def load(self, name, role='model', version=None):
+        """Load an artifact on first use and share it across the process afterwards
+
+        The file's hash is checked against the manifest before it is first
+        loaded, so a corrupted or replaced artifact raises instead of being served.
+        """
+        version, record = self.resolve(name, version)
+        path = self.artifact_path(name, role, version)
+        expected = record['artifacts'][role]['sha256']
+        key = (os.path.realpath(path), expected)
+
+        with _load_lock:
+            if key not in _loaded:
+                actual = artifact_sha256(path)
+                if actual != expected:
+                    raise ValueError(f"{path} does not match the registry checksum "
+                                     f"(expected {expected[:12]}, got {actual[:12]})")
+                _loaded[key] = _load_artifact(path)
+            return _loaded[key]
+
+    def register(self, name, artifacts, metrics=None, features=None, classes=None, scaled=False,
+                 make_latest=True):
+        """Copy artifacts into models/<name>/<version>/ and record them as a new version
+
+        ``artifacts`` maps roles ('model', 'scaler', ...) to files or
+        directories. The scaler, label encoder and feature names are shared
+        with the current version unless given, and so are the features and
+        classes of its schema. Returns the new version.
+        """
+        entry = self.manifest['models'].setdefault(name, {'latest': None, 'versions': {}})
+        previous = entry['versions'].get(entry['latest'])
+        version = str(max((int(v) for v in entry['versions']), default=0) + 1)
+        version_dir = os.path.join(self.models_dir, name, version)
+        os.makedirs(version_dir, exist_ok=True)
+
+        recorded = {}
+        for role, source in artifacts.items():
+            target = os.path.join(version_dir, os.path.basename(os.path.normpath(source)))
+            if os.path.isdir(source):
+                shutil.copytree(source, target, dirs_exist_ok=True)
+            else:
+                shutil.copy2(source, target)
+            recorded[role] = {
+                'path': os.path.relpath(target, self.models_dir).replace(os.sep, '/'),
+                'sha256': artifact_sha256(target)
+            }
+        if previous is not None:
+            for role in FLAT_SHARED_FILES:
+                if role not in recorded and role in previous['artifacts']:
+                    recorded[role] = dict(previous['artifacts'][role])
+            features = features if features is not None else previous['schema']['model_features']
+            classes = classes if classes is not None else previous['schema']['classes']
+
+        entry['versions'][version] = _version_record(recorded, metrics, features, classes, scaled)
+        if make_latest or entry['latest'] is None:
+            entry['latest'] = version
+        self.save()
+        return version
+
+    def set_latest(self, name, version):
+        """Point a model at another registered version"""
+        version, _ = self.resolve(name, version)
+        self._entry(name)['latest'] = version
+        self.save()
+
+    def verify(self):
+        """(name, version, role) of every artifact whose file is missing or changed"""
+        problems = []
+        for name in self.names():
+            for version in self.versions(name):
+                for role, artifact in self.resolve(name, version)[1]['artifacts'].items():
+                    path = os.path.join(self.models_dir, artifact['path'])
+                    if not os.path.exists(path) or artifact_sha256(path) != artifact['sha256']:
+                        problems.append((name, version, role))
+        return problems
+
+
+def evict(keys):
+    """Drop loaded artifacts from the process-wide cache
+
+    Objects still referenced elsewhere (e.g. by a predictor finishing a
+    request) stay alive until that reference goes away.
+    """
+    with _load_lock:
+        for key in keys:
+            _loaded.pop(key, None)
+
+
+def _version_record(artifacts, metrics, features, classes, scaled):
+    return {
+        'created': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'artifacts': artifacts,
+        'metrics': metrics or {},
+        'schema': {
+            'input_features': list(INPUT_FEATURES),
+            'model_features': list(features) if features is not None else None,
+            'classes': list(classes) if classes is not None else None,
+            'scaled': scaled
+        }
+    }
+
+
+def scan_flat_models(models_dir=MODELS_DIR):
+    """Manifest describing the flat models/ folder as version 1 of each model"""
+    metadata_path = os.path.join(models_dir, 'model_metadata.pkl')
+    metadata = joblib.load(metadata_path) if os.path.exists(metadata_path) else {}
+    features_path = os.path.join(models_dir, FLAT_SHARED_FILES['feature_names'])
+    features = list(joblib.load(features_path)) if os.path.exists(features_path) else None
+
+    models = {}
+    for name, model_file in FLAT_MODEL_FILES.items():
+        files = {'model': model_file, **FLAT_SHARED_FILES, **FLAT_EXTRA_FILES.get(name, {})}
+        artifacts = {
+            role: {'path': path, 'sha256': artifact_sha256(os.path.join(models_dir, path))}
+            for role, path in files.items() if os.path.exists(os.path.join(models_dir, path))
+        }
+        if 'model' not in artifacts:
+            continue
+
+        metrics = {}
+        accuracy = metadata.get('model_performance', {}).get(DISPLAY_NAMES[name])
+        if accuracy is not None:
+            metrics = {'test_accuracy': accuracy, 'training_samples': metadata.get('training_samples')}
+        record = _version_record(artifacts, metrics, features, metadata.get('classes'),
+                                 scaled=name == 'logistic_regression')
+        if metadata.get('created_date'):
+            record['created'] = metadata['created_date']
+        models[name] = {'latest': '1', 'versions': {'1': record}}
+    return {'models': models}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage versioned model artifacts in models/registry.json")
+    parser.add_argument('--models-dir', default=MODELS_DIR)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('init', help="Write a manifest for the flat models/ folder")
+    commands.add_parser('list', help="Show every model version")
+    commands.add_parser('verify', help="Check every artifact against its recorded hash")
+
+    register = commands.add_parser('register', help="Add a new version of a model")
+    register.add_argument('name')
+    register.add_argument('--model', required=True, help="Model pickle or exported directory")
+    register.add_argument('--artifact', nargs=2, action='append', default=[], metavar=('ROLE', 'PATH'),
+                          help="Extra artifact, e.g. --artifact scaler standard_scaler.pkl")
+    register.add_argument('--metrics', help="JSON object of evaluation metrics")
+    register.add_argument('--scaled', action='store_true', help="The model expects standardized features")
+    register.add_argument('--no-latest', action='store_true', help="Register without making it current")
+
+    promote = commands.add_parser('set-latest', help="Make a registered version current")
+    promote.add_argument('name')
+    promote.add_argument('version')
+    args = parser.parse_args()
+
+    if args.command == 'init':
+        registry = ModelRegistry(args.models_dir)
+        registry.manifest = scan_flat_models(args.models_dir)
+        registry.save()
+        print(f"Wrote {registry.manifest_path}")
+        return
+
+    registry = ModelRegistry(args.models_dir)
+    if args.command == 'list':
+        for name in registry.names():
+            latest = registry.resolve(name)[0]
+            for version in registry.versions(name):
+                record = registry.resolve(name, version)[1]
+                marker = '*' if version == latest else ' '
+                print(f"{marker} {name} v{version}  {record['created']}  {json.dumps(record['metrics'])}")
+    elif args.command == 'verify':
+        problems = registry.verify()
+        for name, version, role in problems:
+            print(f"{name} v{version}: '{role}' is missing or changed")
+        if problems:
+            raise SystemExit(1)
+        print("All artifacts match the manifest")
+    elif args.command == 'register':
+        artifacts = {'model': args.model, **dict(args.artifact)}
+        feature_path = artifacts.get('feature_names')
+        features = list(joblib.load(feature_path)) if feature_path else None
+        encoder_path = artifacts.get('label_encoder')
+        classes = list(joblib.load(encoder_path).classes_) if encoder_path else None
+        version = registry.register(args.name, artifacts, json.loads(args.metrics) if args.metrics else None,
+                                    features, classes, args.scaled, make_latest=not args.no_latest)
+        print(f"Registered {args.name} v{version}")
+    elif args.command == 'set-latest':
+        registry.set_latest(args.name, args.version)
+        print(f"{args.name} now serves v{args.version}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,16 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import pickle
-import joblib
-import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime
 import random
 
+import chart_templates
+from answer_table import predict_answers
+from live_model import LiveModel
+from results_cache import RESULTS_CACHE, answers_key
+from theme import apply_theme
+
 # Configure page
 st.set_page_config(
     page_title="🎭 Personality Assessment",
@@ -23,119 +27,14 @@ with col1:
         st.switch_page("main_hub.py")
 
 # Enhanced styling for scenario-based assessment
-st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-    
-    .main {
-        font-family: 'Inter', sans-serif;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        min-height: 100vh;
-    }
-    
-    .assessment-header {
-        text-align: center;
-        font-size: 2.5rem;
-        font-weight: 700;
-        margin-bottom: 2rem;
-        text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-        background: linear-gradient(45deg, #ff6b6b, #4ecdc4, #45b7d1, #96ceb4);
-        background-size: 400% 400%;
-        animation: gradient 3s ease infinite;
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-    }
-    
-    @keyframes gradient {
-        0% { background-position: 0% 50%; }
-        50% { background-position: 100% 50%; }
-        100% { background-position: 0% 50%; }
-    }
-    
-    .scenario-card {
-        background: rgba(255, 255, 255, 0.95);
-        color: #2d3748;
-        padding: 2.5rem;
-        border-radius: 20px;
-        margin: 2rem auto;
-        max-width: 900px;
-        box-shadow: 0 20px 40px rgba(0,0,0,0.2);
-        backdrop-filter: blur(10px);
-        border: 1px solid rgba(255, 255, 255, 0.3);
-    }
-    
-    .scenario-title {
-        font-size: 1.8rem;
-        font-weight: 600;
-        color: #2c3e50;
-        margin-bottom: 1rem;
-        text-align: center;
-    }
-    
-    .scenario-story {
-        font-size: 1.2rem;
-        line-height: 1.6;
-        color: #4a5568;
-        margin-bottom: 2rem;
-        text-align: center;
-        font-style: italic;
-    }
-    
-    .result-card {
-        background: linear-gradient(135deg, #4ecdc4 0%, #44a08d 100%);
-        color: white;
-        padding: 3rem;
-        border-radius: 20px;
-        margin: 2rem auto;
-        text-align: center;
-        box-shadow: 0 20px 40px rgba(0,0,0,0.3);
-        max-width: 800px;
-    }
-    
-    .progress-bar {
-        background: rgba(255, 255, 255, 0.3);
-        height: 10px;
-        border-radius: 5px;
-        overflow: hidden;
-        margin: 1rem 0;
-    }
-    
-    .progress-fill {
-        background: linear-gradient(90deg, #ff6b6b, #4ecdc4);
-        height: 100%;
-        transition: width 0.3s ease;
-    }
-    
-    .emoji-large {
-        font-size: 4rem;
-        margin: 1rem 0;
-    }
-    
-    .stButton > button {
-        background: linear-gradient(135deg, #4ecdc4 0%, #44a08d 100%);
-        color: white;
-        border: none;
-        border-radius: 10px;
-        padding: 0.75rem 2rem;
-        font-weight: 600;
-        transition: all 0.3s ease;
-        box-shadow: 0 5px 15px rgba(0,0,0,0.2);
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 8px 20px rgba(0,0,0,0.3);
-    }
-</style>
-""", unsafe_allow_html=True)
+apply_theme('1_Assessment')
 
-# Load models and components
+# Load models and components once per process; the watcher thread swaps in
+# new registry versions without a restart
 @st.cache_resource
 def load_model_components():
     try:
-        model = joblib.load('../../models/naive_bayes_model.pkl')
+        model = LiveModel().start()
         return model, True
     except:
         return None, False
@@ -339,6 +238,16 @@ def get_assessment_scenarios():
 
 def calculate_personality(answers):
     """Calculate personality based on scenario answers"""
+    model, model_loaded = load_model_components()
+    if model_loaded:
+        # A precomputed table lookup for complete answers, a model call otherwise
+        personality, confidence = predict_answers(answers, 'assessment', model)
+        # Answers the model can barely separate are reported as a balanced profile
+        if confidence < 60:
+            return "Ambivert", confidence
+        return personality, confidence
+
+    # Fall back to the summed-score heuristic if the model files are unavailable
     total_score = sum(answers.values())
     max_score = len(answers) * 4
     extroversion_percentage = (total_score / max_score) * 100
@@ -354,32 +263,62 @@ def create_detailed_analysis_chart(answers):
     """Create comprehensive personality analysis chart"""
     scenarios = get_assessment_scenarios()
     
-    fig = go.Figure()
-    
     # Bar chart of individual scenario scores
     scenario_names = [s['title'].split(' ', 1)[1] for s in scenarios]  # Remove emoji
     scores = [answers.get(s['id'], 0) for s in scenarios]
     
     colors = ['#ff6b6b' if score >= 3 else '#4ecdc4' if score >= 2 else '#45b7d1' for score in scores]
     
-    fig.add_trace(go.Bar(
+    # Only the data is filled in; the styled base figure is built and validated once
+    return chart_templates.figure(
+        'scenario_bar',
         x=scenario_names,
         y=scores,
         marker_color=colors,
-        text=[f"{score}/4" for score in scores],
-        textposition='outside'
-    ))
-    
-    fig.update_layout(
-        title="Your Response Pattern Across Scenarios",
-        xaxis_title="Scenarios",
-        yaxis_title="Extroversion Score",
-        yaxis=dict(range=[0, 4.5]),
-        height=400,
-        showlegend=False
+        text=[f"{score}/4" for score in scores]
     )
+
+def create_report_body(personality, confidence, answers):
+    """Downloadable report of a result, without the timestamp header"""
+    scenarios = get_assessment_scenarios()
+    avg_score = sum(answers.values()) / len(answers)
+    report = f"""
+🧠 PERSONALITY TYPE: {personality}
+📊 CONFIDENCE LEVEL: {confidence:.1f}%
+⚡ AVERAGE RESPONSE: {avg_score:.2f}/4.0
+
+📋 DETAILED SCENARIO RESPONSES:
+"""
+    for i, (scenario_id, score) in enumerate(answers.items()):
+        scenario_title = scenarios[i]['title']
+        report += f"{i+1}. {scenario_title}: {score}/4\n"
     
-    return fig
+    report += f"""
+🎯 PERSONALITY INSIGHTS:
+- Energy Source: {"External interactions and stimulation" if personality == "Extrovert" else "Internal thoughts and reflection" if personality == "Introvert" else "Balanced between internal and external"}
+- Social Preference: {"Large groups and dynamic environments" if avg_score >= 3 else "Small groups and intimate settings" if avg_score <= 2 else "Flexible depending on situation"}
+- Communication Style: {"Expressive and outgoing" if personality == "Extrovert" else "Thoughtful and reserved" if personality == "Introvert" else "Adaptable to context"}
+- Decision Making: {"Quick and collaborative" if personality == "Extrovert" else "Careful and independent" if personality == "Introvert" else "Situationally appropriate"}
+
+Generated by AI-Powered Personality Assessment System
+"""
+    return report
+
+def get_results(answers):
+    """Prediction, chart and report for an answer set, computed once and shared across reruns and sessions"""
+    model, model_loaded = load_model_components()
+    key = answers_key(answers, 'assessment', model.version if model_loaded else None)
+
+    def compute():
+        personality, confidence = calculate_personality(answers)
+        return {
+            'personality': personality,
+            'confidence': confidence,
+            'figure': create_detailed_analysis_chart(answers),
+            'report': create_report_body(personality, confidence, answers)
+        }
+
+    return RESULTS_CACHE.get_or_compute(key, compute)
 
 def main():
     # Initialize session state
@@ -481,7 +420,8 @@ def main():
     
     # Results screen
     elif st.session_state.assessment_completed:
-        personality, confidence = calculate_personality(st.session_state.answers)
+        results = get_results(st.session_state.answers)
+        personality, confidence = results['personality'], results['confidence']
         
         st.markdown(f"""
         <div class="result-card">
@@ -501,8 +441,7 @@ def main():
         
         with col1:
             st.markdown("### 📊 Detailed Analysis")
-            fig = create_detailed_analysis_chart(st.session_state.answers)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(results['figure'], use_container_width=True)
         
         with col2:
             st.markdown("### 🎯 Key Insights")
@@ -554,26 +493,7 @@ def main():
             # Download comprehensive results
             results_summary = f"""🎭 Comprehensive Personality Assessment Results
 Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-🧠 PERSONALITY TYPE: {personality}
-📊 CONFIDENCE LEVEL: {confidence:.1f}%
-⚡ AVERAGE RESPONSE: {avg_score:.2f}/4.0
-
-📋 DETAILED SCENARIO RESPONSES:
-"""
-            for i, (scenario_id, score) in enumerate(st.session_state.answers.items()):
-                scenario_title = scenarios[i]['title']
-                results_summary += f"{i+1}. {scenario_title}: {score}/4\n"
-            
-            results_summary += f"""
-🎯 PERSONALITY INSIGHTS:
-- Energy Source: {"External interactions and stimulation" if personality == "Extrovert" else "Internal thoughts and reflection" if personality == "Introvert" else "Balanced between internal and external"}
-- Social Preference: {"Large groups and dynamic environments" if avg_score >= 3 else "Small groups and intimate settings" if avg_score <= 2 else "Flexible depending on situation"}
-- Communication Style: {"Expressive and outgoing" if personality == "Extrovert" else "Thoughtful and reserved" if personality == "Introvert" else "Adaptable to context"}
-- Decision Making: {"Quick and collaborative" if personality == "Extrovert" else "Careful and independent" if personality == "Introvert" else "Situationally appropriate"}
-
-Generated by AI-Powered Personality Assessment System
-"""
+""" + results['report']
             
             st.download_button(
                 label="📄 Download Report",
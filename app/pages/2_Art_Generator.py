@@ -7,10 +7,12 @@ from PIL import Image, ImageDraw, ImageFilter
 import io
 import random
 import math
-import base64
 import requests
 from datetime import datetime
 
+from image_client import IMAGE_CLIENT, NoImageError
+from theme import apply_theme
+
 # Configure page
 st.set_page_config(
     page_title="🎨 AI Art Generator",
@@ -26,99 +28,7 @@ with col1:
         st.switch_page("main_hub.py")
 
 # Enhanced styling for art generator
-st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-    
-    .main {
-        font-family: 'Inter', sans-serif;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        min-height: 100vh;
-    }
-    
-    .art-header {
-        text-align: center;
-        font-size: 2.5rem;
-        font-weight: 700;
-        margin-bottom: 2rem;
-        text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-        background: linear-gradient(45deg, #ff6b6b, #4ecdc4, #45b7d1, #96ceb4, #ff9a56);
-        background-size: 400% 400%;
-        animation: gradient 5s ease infinite;
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-    }
-    
-    @keyframes gradient {
-        0% { background-position: 0% 50%; }
-        50% { background-position: 100% 50%; }
-        100% { background-position: 0% 50%; }
-    }
-    
-    .questionnaire-card {
-        background: rgba(255, 255, 255, 0.95);
-        color: #2d3748;
-        padding: 2.5rem;
-        border-radius: 20px;
-        margin: 2rem auto;
-        max-width: 900px;
-        box-shadow: 0 20px 40px rgba(0,0,0,0.2);
-        backdrop-filter: blur(10px);
-        border: 1px solid rgba(255, 255, 255, 0.3);
-    }
-    
-    .question-title {
-        font-size: 1.4rem;
-        font-weight: 600;
-        color: #2c3e50;
-        margin-bottom: 1rem;
-        text-align: center;
-    }
-    
-    .art-showcase {
-        background: rgba(255, 255, 255, 0.1);
-        padding: 2rem;
-        border-radius: 15px;
-        margin: 2rem 0;
-        backdrop-filter: blur(10px);
-        text-align: center;
-    }
-    
-    .stButton > button {
-        background: linear-gradient(135deg, #ff6b6b 0%, #4ecdc4 100%);
-        color: white;
-        border: none;
-        border-radius: 10px;
-        padding: 0.75rem 2rem;
-        font-weight: 600;
-        transition: all 0.3s ease;
-        box-shadow: 0 5px 15px rgba(0,0,0,0.2);
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 8px 20px rgba(0,0,0,0.3);
-    }
-    
-    .personality-trait {
-        background: rgba(255, 255, 255, 0.1);
-        padding: 1rem;
-        border-radius: 10px;
-        margin: 0.5rem 0;
-        text-align: center;
-    }
-    
-    .api-info {
-        background: rgba(255, 255, 255, 0.1);
-        padding: 1.5rem;
-        border-radius: 10px;
-        margin: 1rem 0;
-        backdrop-filter: blur(10px);
-    }
-</style>
-""", unsafe_allow_html=True)
+apply_theme('2_Art_Generator')
 
 def get_personality_questions():
     """Interactive questions to determine personality traits for art generation"""
@@ -226,10 +136,6 @@ def generate_ai_image(prompt, api_key):
         return None, "API key appears to be too short. Please check your key."
     
     try:
-        import openai
-        import base64
-        client = openai.OpenAI(api_key=api_key)
-        
         # Keep the prompt extremely simple
         simple_prompt = prompt.replace("abstract", "").replace("flowing", "").replace("artistic", "")
         
@@ -239,29 +145,13 @@ def generate_ai_image(prompt, api_key):
         
         st.write(f"🎨 Generating art with simple prompt: {simple_prompt}")
         
-        # Use the new responses API with image generation tools
-        response = client.responses.create(
-            model="gpt-4o-mini",
-            input=simple_prompt,
-            tools=[{"type": "image_generation"}],
-        )
-        
-        # Extract image data from response
-        image_data = [
-            output.result
-            for output in response.output
-            if output.type == "image_generation_call"
-        ]
-        
-        if image_data:
-            image_base64 = image_data[0]
-            # Decode base64 image
-            img_bytes = base64.b64decode(image_base64)
-            img = Image.open(io.BytesIO(img_bytes))
-            return img, None
-        else:
-            return None, "No image data found in response"
+        # Pooled, shared client; prompts already in flight are not sent again and stored images are reused
+        img_bytes = IMAGE_CLIENT.generate(api_key, simple_prompt)
+        img = Image.open(io.BytesIO(img_bytes))
+        return img, None
             
+    except NoImageError:
+        return None, "No image data found in response"
     except Exception as e:
         error_msg = str(e)
         
@@ -272,26 +162,11 @@ def generate_ai_image(prompt, api_key):
             # Try the most basic prompt possible
             try:
                 st.write("🔄 Trying ultra-simple prompt...")
-                generic_response = client.responses.create(
-                    model="gpt-4o-mini",
-                    input="red and blue circles",
-                    tools=[{"type": "image_generation"}],
-                )
-                
-                # Extract image data from fallback response
-                fallback_image_data = [
-                    output.result
-                    for output in generic_response.output
-                    if output.type == "image_generation_call"
-                ]
-                
-                if fallback_image_data:
-                    image_base64 = fallback_image_data[0]
-                    img_bytes = base64.b64decode(image_base64)
-                    img = Image.open(io.BytesIO(img_bytes))
-                    return img, "⚠️ Used ultra-simple prompt. Your personality analysis is still accurate!"
-                else:
-                    return None, "No fallback image data found"
+                img_bytes = IMAGE_CLIENT.generate(api_key, "red and blue circles")
+                img = Image.open(io.BytesIO(img_bytes))
+                return img, "⚠️ Used ultra-simple prompt. Your personality analysis is still accurate!"
+            except NoImageError:
+                return None, "No fallback image data found"
             except:
                 return None, "❌ OpenAI filters are very strict. Try refreshing and generating again."
         elif "insufficient_quota" in error_msg:
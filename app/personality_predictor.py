@@ -0,0 +1,123 @@
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from compact_forest import CompactForest
+from compiled_models import GaussianNBScorer, LogisticScorer, StandardizedScorer
+from features import INPUT_FEATURES, build_feature_matrix
+from model_registry import MODELS_DIR, ModelRegistry
+
+
+class PersonalityPredictor:
+    """Score single answers or whole batches with one registered model version
+
+    Artifacts are resolved through the model registry when the predictor is
+    created and loaded on first use. Loaded artifacts are shared by every
+    predictor in the process.
+    """
+
+    def __init__(self, model_name='naive_bayes', models_dir=MODELS_DIR, version=None, registry=None):
+        self.registry = registry or ModelRegistry(models_dir)
+        self.model_name = model_name
+        self.version, self.record = self.registry.resolve(model_name, version)
+
+    def _load(self, role):
+        return self.registry.load(self.model_name, role, self.version)
+
+    @cached_property
+    def model(self):
+        if self.registry.has_artifact(self.model_name, 'compact', self.version):
+            # The exported array format loads without unpickling the 4 MB forest
+            return self._load('compact')
+        return self._load('model')
+
+    @cached_property
+    def scaler(self):
+        return self._load('scaler')
+
+    @cached_property
+    def label_encoder(self):
+        return self._load('label_encoder')
+
+    @cached_property
+    def feature_names(self):
+        return list(self._load('feature_names'))
+
+    @cached_property
+    def classes(self):
+        return list(self.label_encoder.inverse_transform(self.model.classes_))
+
+    @cached_property
+    def scaled(self):
+        """Whether the version was trained on standardized features"""
+        return bool(self.record['schema']['scaled'])
+
+    @cached_property
+    def scorer(self):
+        """NumPy scorer for Naive Bayes, logistic regression and the compact forest, else None
+
+        A scaled version's scaler is folded into logistic regression, and
+        wrapped around the other scorers.
+        """
+        if self.model_name == 'naive_bayes':
+            scorer = GaussianNBScorer.from_model(self.model)
+        elif self.model_name == 'logistic_regression':
+            return LogisticScorer.from_model(self.model, self.scaler if self.scaled else None)
+        elif isinstance(self.model, CompactForest):
+            scorer = self.model
+        else:
+            return None
+        return StandardizedScorer.from_scaler(scorer, self.scaler) if self.scaled else scorer
+
+    def _feature_matrix(self, data):
+        """Validate input and build the float32 feature matrix the model was trained on"""
+        if isinstance(data, dict):
+            data = pd.DataFrame([data])
+
+        if not isinstance(data, pd.DataFrame):
+            raw = np.asarray(data, dtype=float)
+            if raw.ndim == 1:
+                raw = raw.reshape(1, -1)
+            if raw.ndim != 2 or raw.shape[1] != len(INPUT_FEATURES):
+                raise ValueError(f"Expected an array with {len(INPUT_FEATURES)} columns ordered as {INPUT_FEATURES}")
+            data = dict(zip(INPUT_FEATURES, raw.T))
+
+        X = build_feature_matrix(data, feature_names=self.feature_names)
+        if np.isnan(X).any():
+            raise ValueError("Input contains missing or non-numeric values")
+        return X
+
+    def predict_proba(self, data):
+        """Class probabilities for every row, computed in one vectorized model call"""
+        X = self._feature_matrix(data)
+        if self.scorer is not None:
+            return self.scorer.predict_proba(X)
+
+        X = pd.DataFrame(X, columns=self.feature_names)
+        if self.scaled:
+            X = self.scaler.transform(X)
+        return self.model.predict_proba(X)
+
+    def predict_batch(self, data):
+        """Score a DataFrame or array and return predictions aligned to its rows"""
+        proba = self.predict_proba(data)
+        best = proba.argmax(axis=1)
+
+        index = data.index if isinstance(data, pd.DataFrame) else None
+        results = pd.DataFrame(index=index)
+        results['Predicted_Personality'] = np.asarray(self.classes)[best]
+        results['Confidence'] = proba.max(axis=1) * 100
+        for i, class_name in enumerate(self.classes):
+            results[f'{class_name}_Probability'] = proba[:, i] * 100
+        return results
+
+    def predict_single(self, sample):
+        """Score one answer dict and return the documented result format"""
+        proba = self.predict_proba(sample)[0]
+        best = int(proba.argmax())
+        return {
+            'personality': self.classes[best],
+            'confidence': float(proba[best] * 100),
+            'probabilities': {name: float(p * 100) for name, p in zip(self.classes, proba)}
+        }
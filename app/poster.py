@@ -0,0 +1,173 @@
+import argparse
+import os
+import struct
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import ImageColor
+
+import art_renderer
+
+# The Art Studio preview width; posters scale its layout up
+BASE_SIZE = 600
+
+DEFAULT_MEMORY_BUDGET = int(os.environ.get('POSTER_MEMORY_MB', 512)) * 2 ** 20
+
+# Peak bytes per pixel of a band while it is rendered: the RGBX canvas and its
+# blurred copy, uint16 blur sums and the RGB rows handed back
+BYTES_PER_PIXEL = 48
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def _chunk(kind, data):
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+
+class PNGStreamWriter:
+    """Writes an 8-bit RGB PNG row band by row band, never holding the whole image
+
+    Rows go through one zlib stream; every block it emits is written out as
+    an IDAT chunk straight away.
+    """
+
+    def __init__(self, file, width, height, compress_level=6):
+        self.file = file
+        self.width = width
+        self.height = height
+        self.rows_written = 0
+        self._compressor = zlib.compressobj(compress_level)
+        file.write(_PNG_SIGNATURE)
+        file.write(_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)))
+
+    def write_rows(self, rows):
+        """Append uint8 (n, width, 3) rows"""
+        n = len(rows)
+        if self.rows_written + n > self.height:
+            raise ValueError(f"{self.rows_written + n} rows written to a {self.height}-row PNG")
+        # Each scanline starts with its filter type; 0 keeps the bytes as they are
+        scanlines = np.zeros((n, 1 + self.width * 3), dtype=np.uint8)
+        scanlines[:, 1:] = rows.reshape(n, -1)
+        self._write_idat(self._compressor.compress(scanlines.tobytes()))
+        self.rows_written += n
+
+    def close(self):
+        if self.rows_written != self.height:
+            raise ValueError(f"PNG has {self.rows_written} of {self.height} rows")
+        self._write_idat(self._compressor.flush())
+        self.file.write(_chunk(b'IEND', b''))
+
+    def _write_idat(self, data):
+        if data:
+            self.file.write(_chunk(b'IDAT', data))
+
+
+def poster_layout(traits, width, height, seed=None):
+    """(shapes, palette) of a width x height poster
+
+    The shapes are the Art Studio layout for the seed with BASE_SIZE pixels
+    along the poster's shorter side, scaled up, so a square poster is a
+    high-resolution print of the preview. The base canvas is never smaller
+    than the preview, so every shape fits whatever the aspect ratio.
+    """
+    seed = art_renderer.art_seed(traits) if seed is None else seed
+    colors = art_renderer.personality_colors(traits, seed)
+    palette = [ImageColor.getrgb(color[1]) for color in colors]
+    factor = min(width, height) / BASE_SIZE
+    base_width = max(round(width / factor), BASE_SIZE)
+    base_height = max(round(height / factor), BASE_SIZE)
+    shapes = art_renderer.shape_params(traits, len(palette), base_width, base_height, np.random.default_rng(seed))
+    return art_renderer.scale_shapes(shapes, factor), palette
+
+
+def band_rows(width, memory_budget, in_flight):
+    """Rows per band so that in_flight bands stay within memory_budget bytes"""
+    rows = memory_budget // (in_flight * width * BYTES_PER_PIXEL)
+    return max(int(rows), 4 * art_renderer.BLUR_RADIUS)
+
+
+# Per-process state of pool workers, set once by _init_worker
+_worker = {}
+
+
+def _init_worker(shapes, palette, width, height, blurred):
+    _worker.update(shapes=shapes, palette=palette, width=width, height=height, blurred=blurred)
+
+
+def _render_band(top, bottom):
+    return art_renderer.render_rows(_worker['shapes'], _worker['palette'], _worker['width'],
+                                    _worker['height'], top, bottom, _worker['blurred'])
+
+
+def render_poster(traits, width, height, output, seed=None, n_jobs=-1,
+                  memory_budget=DEFAULT_MEMORY_BUDGET, compress_level=6):
+    """Render a poster to a PNG file in horizontal bands, in parallel
+
+    Bands are rendered by a pool of n_jobs processes (-1 uses every core)
+    and written in order as they finish. At most two bands per worker are
+    in flight, sized so they fit in memory_budget bytes together.
+    """
+    if n_jobs == 0 or n_jobs < -1:
+        raise ValueError(f"n_jobs must be a positive number of processes or -1 for every core, not {n_jobs}")
+    n_jobs = os.cpu_count() if n_jobs == -1 else n_jobs
+    shapes, palette = poster_layout(traits, width, height, seed)
+    blurred = traits.get('calm', 50) > 70
+    in_flight = 2 * n_jobs
+    rows = band_rows(width, memory_budget, in_flight)
+    bands = [(top, min(top + rows, height)) for top in range(0, height, rows)]
+
+    _init_worker(shapes, palette, width, height, blurred)
+    with open(output, 'wb') as f:
+        writer = PNGStreamWriter(f, width, height, compress_level)
+        if n_jobs == 1:
+            for top, bottom in bands:
+                writer.write_rows(_render_band(top, bottom))
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                                     initargs=(shapes, palette, width, height, blurred)) as pool:
+                pending = deque()
+                for band in bands:
+                    pending.append(pool.submit(_render_band, *band))
+                    if len(pending) >= in_flight:
+                        writer.write_rows(pending.popleft().result())
+                while pending:
+                    writer.write_rows(pending.popleft().result())
+        writer.close()
+    return output
+
+
+def _parse_trait(text):
+    name, _, value = text.partition('=')
+    return name, int(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render a print-size personality art poster")
+    parser.add_argument('traits', nargs='*', type=_parse_trait, metavar='TRAIT=SCORE',
+                        help="Trait scores (0-100), e.g. social_energy=80 calm=75; unset traits are 50")
+    parser.add_argument('--width', type=int, default=7680)
+    parser.add_argument('--height', type=int, help="Default: same as width")
+    parser.add_argument('--seed', type=int, help="Default: derived from the traits, as in the Art Studio")
+    parser.add_argument('--output', default='personality_poster.png')
+    parser.add_argument('--n-jobs', type=int, default=-1, help="Worker processes; -1 uses every core")
+    parser.add_argument('--memory-mb', type=int, default=DEFAULT_MEMORY_BUDGET // 2 ** 20,
+                        help="Budget for bands being rendered at once")
+    parser.add_argument('--compress-level', type=int, default=6)
+    args = parser.parse_args()
+
+    height = args.height or args.width
+    if args.width < 1 or height < 1:
+        parser.error("--width and --height must be at least 1 pixel")
+    if args.n_jobs == 0 or args.n_jobs < -1:
+        parser.error("--n-jobs must be a positive number of processes or -1 for every core")
+    start = time.perf_counter()
+    render_poster(dict(args.traits), args.width, height, args.output, args.seed, args.n_jobs,
+                  args.memory_mb * 2 ** 20, args.compress_level)
+    print(f"Wrote {args.width}x{height} poster to {args.output} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+import argparse
+import hashlib
+import io
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+import ingest
+from dedup import ROW_HASH_VERSION, SeenHashes, new_row_mask, row_hashes
+from features import BEHAVIORAL_FEATURES, PSYCHOLOGICAL_FEATURES, add_engineered_features
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+PROCESSED_DIR = os.path.join(DATA_DIR, 'processed')
+SOURCE_DATA = os.path.join(PROCESSED_DIR, 'raw_personality_data.csv')
+CLEANED_DATA = os.path.join(PROCESSED_DIR, 'personality_dataset_cleaned.csv')
+STATE_DIR = os.path.join(PROCESSED_DIR, 'prep_state')
+
+TARGET_COLUMN = 'Personality'
+
+# Spellings standardized by clean_categorical_features() in 02_Data_Preparation
+YES_NO_VARIANTS = {
+    'yes': 'Yes', 'YES': 'Yes', 'y': 'Yes', 'Y': 'Yes',
+    'no': 'No', 'NO': 'No', 'n': 'No', 'N': 'No'
+}
+
+# Bytes just before the watermark that must be unchanged for a run to resume
+TAIL_CHECK_BYTES = 64 * 1024
+
+
+def standardize_categories(values):
+    """Strip whitespace and unify Yes/No spellings, leaving missing answers as NaN"""
+    values = values.astype(object)
+    missing = values.isna() | (values.astype(str).str.strip() == 'nan')
+    cleaned = values.astype(str).str.strip().replace(YES_NO_VARIANTS)
+    return cleaned.astype(object).where(~missing, np.nan)
+
+
+def histogram_median(values, counts):
+    """Median of the data described by a value histogram, as Series.median() computes it"""
+    total = counts.sum()
+    if total == 0:
+        return np.nan
+    order = np.argsort(values)
+    values, cumulative = values[order], np.cumsum(counts[order])
+    lower = values[np.searchsorted(cumulative, (total - 1) // 2, side='right')]
+    upper = values[np.searchsorted(cumulative, total // 2, side='right')]
+    return (lower + upper) / 2
+
+
+def histogram_mode(values, counts):
+    """Most frequent value, breaking ties like Series.mode().iloc[0]"""
+    if not len(values):
+        return np.nan
+    best = counts.max()
+    return sorted(v for v, c in zip(values, counts) if c == best)[0]
+
+
+class PrepState:
+    """Persisted statistics that let the pipeline resume where its last run stopped
+
+    ``histograms`` hold value counts per feature, from which the median and
+    mode imputation values are recomputed exactly. Hashes of every source row
+    seen so far are kept in a dedup.SeenHashes set under ``seen/``, whose
+    segment list is saved here along with the dedup.ROW_HASH_VERSION that
+    made them. ``offset`` and ``rows`` mark how far into the source file
+    processing has got, and ``output_size`` is the length of the cleaned file
+    written up to that point.
+    """
+
+    def __init__(self, state_dir=STATE_DIR):
+        self.state_dir = state_dir
+        self.columns = None
+        self.encoding = None
+        self.offset = 0
+        self.rows = 0
+        self.output_size = None
+        self.tail_sha256 = None
+        self.histograms = {}
+        self.segments = []
+        self.row_hash_version = ROW_HASH_VERSION
+        self._seen = None
+
+    @property
+    def path(self):
+        return os.path.join(self.state_dir, 'state.json')
+
+    @classmethod
+    def load(cls, state_dir=STATE_DIR):
+        """Load saved state, or return an empty state if there is none"""
+        state = cls(state_dir)
+        if os.path.exists(state.path):
+            with open(state.path) as f:
+                saved = json.load(f)
+            state.columns = saved['columns']
+            state.encoding = saved['encoding']
+            state.offset = saved['offset']
+            state.rows = saved['rows']
+            state.output_size = saved.get('output_size')
+            state.tail_sha256 = saved['tail_sha256']
+            state.histograms = {
+                feature: (np.array(h['values'], dtype=object if feature in PSYCHOLOGICAL_FEATURES else float),
+                          np.array(h['counts'], dtype=np.int64))
+                for feature, h in saved['histograms'].items()
+            }
+            state.segments = saved['segments']
+            state.row_hash_version = saved.get('row_hash_version', 1)
+        return state
+
+    def save(self):
+        os.makedirs(self.state_dir, exist_ok=True)
+        saved = {
+            'columns': self.columns,
+            'encoding': self.encoding,
+            'offset': self.offset,
+            'rows': self.rows,
+            'output_size': self.output_size,
+            'tail_sha256': self.tail_sha256,
+            'histograms': {
+                feature: {'values': values.tolist(), 'counts': counts.tolist()}
+                for feature, (values, counts) in self.histograms.items()
+            },
+            'segments': self.segments,
+            'row_hash_version': self.row_hash_version
+        }
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(saved, f)
+        os.replace(temp_path, self.path)
+
+    def update_histogram(self, feature, values):
+        """Add one batch of observed (non-missing) values to a feature's histogram"""
+        new_values, new_counts = np.unique(values.dropna().to_numpy(), return_counts=True)
+        old_values, old_counts = self.histograms.get(feature, (new_values[:0], new_counts[:0]))
+        merged = pd.Series(old_counts, index=old_values).add(pd.Series(new_counts, index=new_values), fill_value=0)
+        self.histograms[feature] = (merged.index.to_numpy(), merged.to_numpy(dtype=np.int64))
+
+    def fill_value(self, feature):
+        values, counts = self.histograms.get(feature, (np.array([]), np.array([], dtype=np.int64)))
+        if feature in PSYCHOLOGICAL_FEATURES:
+            return histogram_mode(values, counts)
+        return histogram_median(values.astype(float), counts)
+
+    @property
+    def seen(self):
+        """Set of hashes of every source row processed so far"""
+        if self._seen is None:
+            self._seen = SeenHashes(os.path.join(self.state_dir, 'seen'), segments=self.segments)
+        return self._seen
+
+
+def _tail_sha256(path, offset):
+    """Hash of the bytes just before offset, used to detect a rewritten source file"""
+    start = max(0, offset - TAIL_CHECK_BYTES)
+    with open(path, 'rb') as f:
+        f.seek(start)
+        return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+
+def _restore_output(output_path, state):
+    """Cut rows appended after the last saved state off the cleaned file
+
+    A run that crashed between appending its batch and saving the state
+    leaves rows the state does not know about; the resumed run writes them
+    again.
+    """
+    if state.output_size is None:
+        return
+    size = os.path.getsize(output_path) if os.path.exists(output_path) else -1
+    if size < state.output_size:
+        raise ValueError(f"{output_path} is shorter than the last run left it; rerun with --rebuild")
+    if size > state.output_size:
+        with open(output_path, 'r+b') as f:
+            f.truncate(state.output_size)
+
+
+def _read_new_rows(source_path, state):
+    """Parse the complete lines appended to source_path since the watermark; returns (rows, end offset)
+
+    A trailing line without a newline may still be being written, so it is
+    left for the next run.
+    """
+    with open(source_path, 'rb') as f:
+        f.seek(state.offset)
+        data = f.read()
+    end = data.rfind(b'\n') + 1
+    if not end:
+        return None, state.offset
+
+    dtypes = {column: 'float64' for column in BEHAVIORAL_FEATURES}
+    dtypes.update({column: str for column in PSYCHOLOGICAL_FEATURES + [TARGET_COLUMN]})
+    text = io.TextIOWrapper(io.BytesIO(data[:end]), encoding=state.encoding, errors=ingest.FALLBACK_ERRORS, newline='')
+    if state.columns is None:
+        rows = pd.read_csv(text, dtype=dtypes)
+    else:
+        rows = pd.read_csv(text, header=None, names=state.columns, dtype=dtypes)
+    return rows, state.offset + end
+
+
+def clean_batch(raw, state):
+    """Apply the 02_Data_Preparation cleaning steps to a batch of new source rows
+
+    Rows already seen (in earlier runs or earlier in the batch) are dropped,
+    categories are standardized, behavioral values are capped to 0-10,
+    missing values are imputed with the running medians and modes, and the
+    engineered features are added.
+    """
+    hashes = row_hashes(raw)
+    keep = new_row_mask(hashes, state.seen)
+    state.seen.add(hashes[keep])
+    df = raw[keep].reset_index(drop=True)
+
+    for feature in PSYCHOLOGICAL_FEATURES:
+        df[feature] = standardize_categories(df[feature])
+    for feature in BEHAVIORAL_FEATURES:
+        df[feature] = df[feature].clip(0, 10)
+
+    # Statistics cover every deduplicated row, including rows later dropped for a missing target
+    for feature in BEHAVIORAL_FEATURES + PSYCHOLOGICAL_FEATURES:
+        state.update_histogram(feature, df[feature])
+        if df[feature].isna().any():
+            df[feature] = df[feature].fillna(state.fill_value(feature))
+
+    df = df.dropna(subset=[TARGET_COLUMN])
+    return add_engineered_features(df, target_column=TARGET_COLUMN)
+
+
+def run(source_path=SOURCE_DATA, output_path=CLEANED_DATA, state_dir=STATE_DIR, rebuild=False):
+    """Clean the rows added to source_path since the last run and append them to output_path
+
+    Returns the number of rows appended. The first run (or rebuild=True)
+    processes the whole file and rewrites output_path, matching
+    02_Data_Preparation exactly. Later runs impute new rows with the medians and
+    modes of everything seen so far; rows written earlier are not re-imputed.
+    """
+    state = PrepState(state_dir) if rebuild else PrepState.load(state_dir)
+    first_run = state.columns is None
+    if first_run:
+        state.encoding = ingest.sniff_encoding(source_path)
+        shutil.rmtree(os.path.join(state_dir, 'seen'), ignore_errors=True)
+    elif state.row_hash_version != ROW_HASH_VERSION:
+        raise ValueError(f"{state_dir} holds row hashes from an older version; rerun with --rebuild")
+    elif (os.path.getsize(source_path) < state.offset
+          or _tail_sha256(source_path, state.offset) != state.tail_sha256):
+        raise ValueError(f"{source_path} changed before the watermark; rerun with --rebuild")
+    else:
+        _restore_output(output_path, state)
+
+    raw, end = _read_new_rows(source_path, state)
+    if raw is None or not len(raw):
+        return 0
+
+    cleaned = clean_batch(raw, state)
+    if first_run:
+        state.columns = list(raw.columns)
+    cleaned.to_csv(output_path, mode='w' if first_run else 'a', header=first_run, index=False)
+
+    # Merged-away segments are deleted only after the new state is saved, so a
+    # crash leaves the previous state and its segments intact
+    state.segments = state.seen.flush()
+    state.offset = end
+    state.rows += len(raw)
+    state.output_size = os.path.getsize(output_path)
+    state.tail_sha256 = _tail_sha256(source_path, end)
+    state.save()
+    state.seen.remove_unused()
+    return len(cleaned)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally clean new survey responses")
+    parser.add_argument('--source', default=SOURCE_DATA, help="Raw CSV that new responses are appended to")
+    parser.add_argument('--output', default=CLEANED_DATA, help="Cleaned CSV that new rows are appended to")
+    parser.add_argument('--state-dir', default=STATE_DIR)
+    parser.add_argument('--rebuild', action='store_true', help="Discard saved state and process the whole file")
+    args = parser.parse_args()
+
+    appended = run(args.source, args.output, args.state_dir, args.rebuild)
+    print(f"Appended {appended:,} cleaned rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+from features import BEHAVIORAL_FEATURES, INPUT_FEATURES
+
+# Upper end of each behavioral scale in the training data (Going_outside tops out at 7)
+FEATURE_SCALES = {
+    'Time_spent_Alone': 10,
+    'Social_event_attendance': 10,
+    'Going_outside': 7,
+    'Friends_circle_size': 10,
+    'Post_frequency': 10
+}
+
+# Features that grow with introversion rather than extroversion
+INTROVERTED_FEATURES = {'Time_spent_Alone', 'Has_Stage_Fear', 'Gets_Drained_Socializing'}
+
+# streamlit_app.get_questions(): options are scored 1-4, higher is more introverted
+QUIZ_MAPPING = {
+    'question_ids': [
+        'social_energy', 'alone_time', 'communication', 'social_circles',
+        'public_speaking', 'social_media', 'weekend_plans', 'energy_levels'
+    ],
+    'introvert_high': True,
+    'features': {
+        'Time_spent_Alone': ['alone_time', 'weekend_plans'],
+        'Social_event_attendance': ['social_energy', 'communication', 'weekend_plans'],
+        'Going_outside': ['alone_time', 'weekend_plans'],
+        'Friends_circle_size': ['social_circles'],
+        'Post_frequency': ['social_media'],
+        'Has_Stage_Fear': ['public_speaking'],
+        'Gets_Drained_Socializing': ['energy_levels']
+    }
+}
+
+# pages/1_Assessment.get_assessment_scenarios(): choices are scored 1-4, higher is more extroverted
+ASSESSMENT_MAPPING = {
+    'question_ids': [
+        'weekend_plans', 'work_meeting', 'party_invitation', 'networking_event',
+        'team_conflict', 'energy_source', 'social_battery', 'decision_making'
+    ],
+    'introvert_high': False,
+    'features': {
+        'Time_spent_Alone': ['weekend_plans', 'energy_source'],
+        'Social_event_attendance': ['party_invitation', 'networking_event'],
+        'Going_outside': ['weekend_plans', 'energy_source'],
+        'Friends_circle_size': ['networking_event', 'decision_making'],
+        'Post_frequency': ['team_conflict', 'decision_making'],
+        'Has_Stage_Fear': ['work_meeting'],
+        'Gets_Drained_Socializing': ['social_battery']
+    }
+}
+
+
+def answers_to_scores(answers, mapping):
+    """Stack answer dicts into an (n, 8) score matrix in question order
+
+    Unanswered questions get the neutral score 2.5.
+    """
+    if isinstance(answers, dict):
+        answers = [answers]
+    return np.array(
+        [[a.get(q, 2.5) for q in mapping['question_ids']] for a in answers],
+        dtype=float
+    )
+
+
+def scores_to_features(scores, mapping):
+    """Map an (n, 8) matrix of 1-4 answer scores onto the model's seven input features"""
+    scores = np.atleast_2d(np.asarray(scores, dtype=float))
+    extroversion = (scores - 1) / 3
+    if mapping['introvert_high']:
+        extroversion = 1 - extroversion
+
+    columns = {q: extroversion[:, i] for i, q in enumerate(mapping['question_ids'])}
+    features = {}
+    for feature in INPUT_FEATURES:
+        level = np.mean([columns[q] for q in mapping['features'][feature]], axis=0)
+        if feature in INTROVERTED_FEATURES:
+            level = 1 - level
+
+        if feature in BEHAVIORAL_FEATURES:
+            features[feature] = np.round(level * FEATURE_SCALES[feature])
+        else:
+            features[feature] = (level > 0.5).astype(int)
+
+    return pd.DataFrame(features, columns=INPUT_FEATURES)
+
+
+def answers_to_features(answers, mapping):
+    """Map one answer dict (or a list of them) onto the model's input features"""
+    return scores_to_features(answers_to_scores(answers, mapping), mapping)
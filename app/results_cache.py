@@ -0,0 +1,95 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = int(os.environ.get('RESULTS_CACHE_SIZE', 4096))
+DEFAULT_TTL = float(os.environ.get('RESULTS_CACHE_TTL', 3600))
+ART_CACHE_SIZE = int(os.environ.get('ART_CACHE_SIZE', 256))
+
+
+def answers_key(answers, namespace, model_version=None):
+    """Canonical, hashable key for an answer dict: the same answers in any order map to one key
+
+    The model version is part of the key, so results are recomputed after a
+    new model version is swapped in.
+    """
+    return (namespace, model_version, tuple(sorted((str(q), float(s)) for q, s in answers.items())))
+
+
+class ResultsCache:
+    """Thread-safe LRU cache whose entries also expire after ttl seconds
+
+    Shared by every session in the process. Values must be treated as
+    read-only by callers, since the same object is handed to every hit.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self.clock():
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """Cached value for key, computing and storing it on a miss
+
+        compute() runs outside the lock; two sessions missing the same key at
+        once both compute it, and the later result is kept.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+
+# One cache per process, shared by every Streamlit session and page
+RESULTS_CACHE = ResultsCache()
+
+# Rendered artwork PNG bytes; renders are deterministic per key, so entries never expire
+ART_CACHE = ResultsCache(ART_CACHE_SIZE, ttl=float('inf'))
@@ -0,0 +1,78 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from compact_forest import CompactForest, flatten_forest
+from compiled_models import GaussianNBScorer, LogisticScorer, StandardizedScorer
+
+SCORER_TYPES = {cls.__name__: cls for cls in [GaussianNBScorer, LogisticScorer, CompactForest, StandardizedScorer]}
+
+# Keep every array in the block aligned for vectorized loads
+ALIGNMENT = 64
+
+
+def scorer_for(predictor):
+    """NumPy scorer equivalent to a PersonalityPredictor's model"""
+    if predictor.scorer is not None:
+        return predictor.scorer
+    # A forest loaded from the pickle is flattened the same way as the exported arrays
+    scorer = CompactForest(*flatten_forest(predictor.model))
+    return StandardizedScorer.from_scaler(scorer, predictor.scaler) if predictor.scaled else scorer
+
+
+class SharedScorer:
+    """Model weights published once in a multiprocessing.shared_memory block
+
+    The parent process copies every scorer array into a single block and
+    passes workers a small picklable ``spec``. Workers rebuild the scorer as
+    views onto that block with attach(), so the weights are neither pickled
+    nor duplicated per process.
+    """
+
+    def __init__(self, scorer):
+        arrays, meta = scorer.to_arrays()
+
+        layout = {}
+        size = 0
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            layout[name] = (size, array.shape, array.dtype.str)
+            size += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+
+        self.shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        for name, array in arrays.items():
+            offset, shape, dtype = layout[name]
+            view = np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=offset)
+            view[...] = array
+
+        self.spec = {
+            'name': self.shm.name,
+            'scorer': type(scorer).__name__,
+            'layout': layout,
+            'meta': meta
+        }
+
+    @staticmethod
+    def attach(spec):
+        """Map an existing block and rebuild its scorer; returns (scorer, shm)
+
+        The caller must keep ``shm`` alive for as long as the scorer is used.
+        """
+        shm = shared_memory.SharedMemory(name=spec['name'])
+        arrays = {}
+        for name, (offset, shape, dtype) in spec['layout'].items():
+            array = np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+            array.flags.writeable = False
+            arrays[name] = array
+        return SCORER_TYPES[spec['scorer']].from_arrays(arrays, spec['meta']), shm
+
+    def close(self):
+        """Release and remove the shared block"""
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -2,12 +2,16 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import pickle
-import joblib
-import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime
 import random
 
+import chart_templates
+from answer_table import predict_answers
+from live_model import LiveModel
+from results_cache import RESULTS_CACHE, answers_key
+from theme import apply_theme
+
 # Configure page
 st.set_page_config(
     page_title="Personality Discovery Hub",
@@ -17,356 +21,14 @@ st.set_page_config(
 )
 
 # Custom CSS for better styling
-st.markdown("""
-<style>
-    /* Import Google Fonts */
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-    
-    /* Global Styles */
-    .main {
-        font-family: 'Inter', sans-serif;
-        background: #fafbfc;
-        padding: 1rem;
-    }
-    
-    .main-header {
-        font-size: 2.8rem;
-        color: #1a202c;
-        text-align: center;
-        margin-bottom: 3rem;
-        font-weight: 600;
-        letter-spacing: -0.5px;
-    }
-    
-    .welcome-container {
-        background: #ffffff;
-        padding: 3rem 2rem;
-        border-radius: 16px;
-        margin: 2rem auto;
-        max-width: 800px;
-        color: #2d3748;
-        box-shadow: 0 4px 20px rgba(0,0,0,0.04);
-        border: 1px solid #e2e8f0;
-    }
-    
-    .welcome-container h2 {
-        font-size: 2rem;
-        font-weight: 600;
-        margin-bottom: 1.5rem;
-        color: #1a202c;
-        text-align: center;
-        line-height: 1.3;
-    }
-    
-    .welcome-container p {
-        font-size: 1.1rem;
-        line-height: 1.7;
-        margin-bottom: 2rem;
-        color: #4a5568;
-        text-align: center;
-        max-width: 600px;
-        margin-left: auto;
-        margin-right: auto;
-    }
-    
-    .features-card {
-        background: #ffffff;
-        color: #2d3748;
-        padding: 2rem 1.5rem;
-        border-radius: 12px;
-        margin: 1.5rem auto;
-        max-width: 600px;
-        box-shadow: 0 2px 8px rgba(0,0,0,0.04);
-        border: 1px solid #e2e8f0;
-    }
-    
-    .features-card h3 {
-        color: #1a202c;
-        font-weight: 600;
-        margin-bottom: 1.5rem;
-        font-size: 1.2rem;
-        text-align: center;
-    }
-    
-    .features-list {
-        font-size: 1rem;
-        line-height: 1.8;
-        color: #4a5568;
-        text-align: left;
-    }
-    
-    .question-container {
-        background: #ffffff;
-        padding: 2.5rem 2rem;
-        border-radius: 16px;
-        margin: 2rem auto;
-        max-width: 900px;
-        box-shadow: 0 2px 12px rgba(0,0,0,0.03);
-        border: 1px solid #e2e8f0;
-    }
-    
-    .question-text {
-        font-size: 1.4rem;
-        font-weight: 600;
-        color: #1a202c;
-        margin-bottom: 0.8rem;
-        text-align: center;
-        line-height: 1.5;
-        max-width: 700px;
-        margin-left: auto;
-        margin-right: auto;
-    }
-    
-    .question-subtitle {
-        font-size: 1rem;
-        color: #718096;
-        text-align: center;
-        margin-bottom: 2rem;
-        font-weight: 400;
-        max-width: 600px;
-        margin-left: auto;
-        margin-right: auto;
-    }
-    
-    /* Radio button styling */
-    .stRadio > div {
-        background: transparent;
-        padding: 0;
-        max-width: 800px;
-        margin: 0 auto;
-    }
-    
-    .stRadio > div > div > div {
-        background: #ffffff;
-        padding: 1.2rem 1.5rem;
-        border-radius: 12px;
-        border: 1px solid #e2e8f0;
-        margin: 0.8rem 0;
-        transition: all 0.2s ease;
-        box-shadow: 0 1px 3px rgba(0,0,0,0.02);
-    }
-    
-    .stRadio > div > div > div:hover {
-        border-color: #cbd5e0;
-        box-shadow: 0 2px 8px rgba(0,0,0,0.04);
-        background: #f7fafc;
-    }
-    
-    .stRadio > div > div > div > label {
-        color: #2d3748 !important;
-        font-weight: 400;
-        font-size: 1rem;
-        cursor: pointer;
-        line-height: 1.6;
-        display: block;
-        width: 100%;
-        margin: 0;
-    }
-    
-    /* Selected radio button styling */
-    .stRadio > div > div > div[data-checked="true"] {
-        background: #edf2f7;
-        border-color: #a0aec0;
-        box-shadow: 0 2px 8px rgba(0,0,0,0.06);
-    }
-    
-    .result-container {
-        padding: 3rem;
-        border-radius: 20px;
-        margin: 2rem 0;
-        text-align: center;
-        box-shadow: 0 15px 35px rgba(0,0,0,0.1);
-        position: relative;
-        overflow: hidden;
-    }
-    
-    .introvert-result {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-    }
-    
-    .extrovert-result {
-        background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
-        color: white;
-    }
-    
-    .result-title {
-        font-size: 2.8rem;
-        font-weight: 700;
-        margin-bottom: 1rem;
-        text-shadow: 0 2px 4px rgba(0,0,0,0.2);
-    }
-    
-    .result-confidence {
-        font-size: 1.6rem;
-        font-weight: 500;
-        opacity: 0.95;
-    }
-    
-    .traits-card {
-        background: linear-gradient(135deg, #ffffff 0%, #f7f9fc 100%);
-        padding: 2.5rem;
-        border-radius: 16px;
-        margin: 1rem 0;
-        box-shadow: 0 8px 25px rgba(0,0,0,0.06);
-        border: 1px solid #e2e8f0;
-    }
-    
-    .traits-card h3 {
-        color: #2c3e50;
-        font-weight: 600;
-        font-size: 1.3rem;
-        margin-bottom: 1.5rem;
-    }
-    
-    .insights-card {
-        background: linear-gradient(135deg, #ffffff 0%, #f7f9fc 100%);
-        padding: 2.5rem;
-        border-radius: 16px;
-        margin: 1rem 0;
-        box-shadow: 0 8px 25px rgba(0,0,0,0.06);
-        border: 1px solid #e2e8f0;
-    }
-    
-    .insights-card h3 {
-        color: #2c3e50;
-        font-weight: 600;
-        font-size: 1.3rem;
-        margin-bottom: 1.5rem;
-    }
-    
-    .fun-fact {
-        background: #f7fafc;
-        padding: 1.5rem;
-        border-radius: 12px;
-        border-left: 3px solid #68d391;
-        margin: 1.5rem auto;
-        max-width: 600px;
-        box-shadow: 0 1px 3px rgba(0,0,0,0.02);
-    }
-    
-    .fun-fact-title {
-        color: #1a202c;
-        font-weight: 600;
-        font-size: 1rem;
-        margin-bottom: 0.8rem;
-    }
-    
-    .fun-fact-text {
-        color: #4a5568;
-        font-size: 0.95rem;
-        line-height: 1.6;
-    }
-    
-    /* Progress bar styling */
-    .stProgress > div > div > div {
-        background: linear-gradient(90deg, #3498db, #2c3e50);
-        border-radius: 10px;
-    }
-    
-    /* Button styling */
-    .stButton > button {
-        background: #4299e1;
-        color: white;
-        border: none;
-        border-radius: 8px;
-        padding: 0.75rem 1.5rem;
-        font-weight: 500;
-        font-size: 1rem;
-        transition: all 0.2s ease;
-        box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-        font-family: 'Inter', sans-serif;
-    }
-    
-    .stButton > button:hover {
-        background: #3182ce;
-        box-shadow: 0 2px 6px rgba(0,0,0,0.15);
-    }
-    
-    /* Chart styling */
-    .js-plotly-plot {
-        border-radius: 16px;
-        box-shadow: 0 8px 25px rgba(0,0,0,0.06);
-        overflow: hidden;
-        background: white;
-    }
-    
-    /* Trait and insight items */
-    .trait-item {
-        background: linear-gradient(135deg, #ffffff 0%, #f8f9fa 100%);
-        padding: 1.2rem;
-        margin: 0.8rem 0;
-        border-radius: 10px;
-        border-left: 4px solid #3498db;
-        box-shadow: 0 2px 8px rgba(0,0,0,0.04);
-        font-size: 1rem;
-        color: #2d3748;
-        transition: all 0.2s ease;
-    }
-    
-    .trait-item:hover {
-        transform: translateX(5px);
-        box-shadow: 0 4px 12px rgba(0,0,0,0.08);
-    }
-    
-    .insight-item {
-        background: linear-gradient(135deg, #ffffff 0%, #f8f9fa 100%);
-        padding: 1.2rem;
-        margin: 0.8rem 0;
-        border-radius: 10px;
-        border-left: 4px solid #2c3e50;
-        box-shadow: 0 2px 8px rgba(0,0,0,0.04);
-        color: #2d3748;
-        line-height: 1.5;
-        transition: all 0.2s ease;
-    }
-    
-    .insight-item:hover {
-        transform: translateX(5px);
-        box-shadow: 0 4px 12px rgba(0,0,0,0.08);
-    }
-    
-    /* Hide Streamlit elements */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-    
-    /* Animations */
-    .fade-in {
-        animation: fadeIn 0.6s ease-in;
-    }
-    
-    @keyframes fadeIn {
-        from { opacity: 0; transform: translateY(15px); }
-        to { opacity: 1; transform: translateY(0); }
-    }
-    
-    /* Custom scrollbar */
-    ::-webkit-scrollbar {
-        width: 8px;
-    }
-    
-    ::-webkit-scrollbar-track {
-        background: #f1f1f1;
-        border-radius: 4px;
-    }
-    
-    ::-webkit-scrollbar-thumb {
-        background: #c1c1c1;
-        border-radius: 4px;
-    }
-    
-    ::-webkit-scrollbar-thumb:hover {
-        background: #a8a8a8;
-    }
-</style>
-""", unsafe_allow_html=True)
+apply_theme('streamlit_app')
 
-# Load models and components
+# Load models and components once per process; the watcher thread swaps in
+# new registry versions without a restart
 @st.cache_resource
 def load_model_components():
     try:
-        model = joblib.load('../models/naive_bayes_model.pkl')
+        model = LiveModel().start()
         return model, True
     except:
         return None, False
@@ -482,6 +144,12 @@ def get_questions():
 
 def calculate_personality(answers):
     """Calculate personality based on quiz answers"""
+    model, model_loaded = load_model_components()
+    if model_loaded:
+        # A precomputed table lookup for complete answers, a model call otherwise
+        return predict_answers(answers, 'quiz', model)
+
+    # Fall back to the summed-score heuristic if the model files are unavailable
     total_score = sum(answers.values())
     max_score = len(answers) * 4
     introversion_percentage = (total_score / max_score) * 100
@@ -500,26 +168,40 @@ def create_personality_chart(personality, confidence):
         extro_val = confidence  
         intro_val = 100 - confidence
     
-    fig = go.Figure()
-    
-    fig.add_trace(go.Bar(
-        x=['Extrovert', 'Introvert'],
+    # Only the data is filled in; the styled base figure is built and validated once
+    return chart_templates.figure(
+        'personality_bar',
         y=[extro_val, intro_val],
-        marker_color=['#ff7f0e', '#9467bd'],
         text=[f'{extro_val:.1f}%', f'{intro_val:.1f}%'],
-        textposition='auto',
-    ))
-    
-    fig.update_layout(
-        title="Your Personality Profile",
-        yaxis_title="Percentage",
-        showlegend=False,
-        height=400,
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
     )
-    
-    return fig
+
+def create_report_body(personality, confidence, answers):
+    """Downloadable summary of a result, without the timestamp header"""
+    body = f"""
+Result: {personality}
+Confidence: {confidence:.1f}%
+
+Your responses:
+"""
+    for q_id, score in answers.items():
+        body += f"- {q_id}: {score}/4\n"
+    return body
+
+def get_results(answers):
+    """Prediction, chart and report for an answer set, computed once and shared across reruns and sessions"""
+    model, model_loaded = load_model_components()
+    key = answers_key(answers, 'quiz', model.version if model_loaded else None)
+
+    def compute():
+        personality, confidence = calculate_personality(answers)
+        return {
+            'personality': personality,
+            'confidence': confidence,
+            'figure': create_personality_chart(personality, confidence),
+            'report': create_report_body(personality, confidence, answers)
+        }
+
+    return RESULTS_CACHE.get_or_compute(key, compute)
 
 def main():
     # Initialize session state
@@ -648,7 +330,8 @@ def main():
     
     # Results Screen
     elif st.session_state.quiz_completed:
-        personality, confidence = calculate_personality(st.session_state.answers)
+        results = get_results(st.session_state.answers)
+        personality, confidence = results['personality'], results['confidence']
         
         # Results header
         if personality == "Introvert":
@@ -668,8 +351,7 @@ def main():
         """, unsafe_allow_html=True)
         
         # Personality chart
-        fig = create_personality_chart(personality, confidence)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(results['figure'], use_container_width=True)
         
         # Detailed analysis
         col1, col2 = st.columns(2)
@@ -757,14 +439,7 @@ def main():
             summary = f"""
 Personality Assessment Results
 Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-Result: {personality}
-Confidence: {confidence:.1f}%
-
-Your responses:
-"""
-            for q_id, score in st.session_state.answers.items():
-                summary += f"- {q_id}: {score}/4\n"
+""" + results['report']
             
             st.download_button(
                 label="📄 Download Results",
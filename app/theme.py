@@ -0,0 +1,122 @@
+import argparse
+import functools
+import hashlib
+import os
+import re
+
+import streamlit as st
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+STYLES_DIR = os.path.join(APP_DIR, 'styles')
+# Streamlit serves <main script dir>/static at app/static/ when server.enableStaticServing is on
+STATIC_DIR = os.path.join(APP_DIR, 'static')
+STATIC_URL = 'app/static'
+
+# Quoted strings are kept verbatim; comments are dropped
+_TOKENS = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?\*/', re.S)
+
+
+def _minify_chunk(css):
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    return css.replace(';}', '}')
+
+
+def minify_css(css):
+    """CSS with comments removed and whitespace collapsed, leaving quoted strings untouched
+
+    Spaces before ':' are kept, since they are significant in selectors
+    such as ``.card :hover``.
+    """
+    out = []
+    pos = 0
+    for match in _TOKENS.finditer(css):
+        out.append(_minify_chunk(css[pos:match.start()]))
+        out.append(match.group(1) or '')
+        pos = match.end()
+    out.append(_minify_chunk(css[pos:]))
+    return ''.join(out).strip()
+
+
+def style_names():
+    return sorted(os.path.splitext(name)[0] for name in os.listdir(STYLES_DIR) if name.endswith('.css'))
+
+
+@functools.lru_cache(maxsize=None)
+def build_stylesheet(name, static_dir=STATIC_DIR):
+    """(file name, minified CSS) of styles/<name>.css, written once per process
+
+    The file name carries a hash of the content, e.g. ``streamlit_app.3f2a9c01d4e5.min.css``,
+    so browsers can cache it and an edited stylesheet gets a new URL. The
+    file name is None if the static directory cannot be written.
+    """
+    with open(os.path.join(STYLES_DIR, f'{name}.css'), encoding='utf-8') as f:
+        css = minify_css(f.read())
+    filename = f"{name}.{hashlib.sha256(css.encode()).hexdigest()[:12]}.min.css"
+    path = os.path.join(static_dir, filename)
+    if not os.path.exists(path):
+        try:
+            os.makedirs(static_dir, exist_ok=True)
+            with open(path + '.tmp', 'w', encoding='utf-8') as f:
+                f.write(css)
+            os.replace(path + '.tmp', path)
+        except OSError:
+            return None, css
+    return filename, css
+
+
+@functools.lru_cache(maxsize=None)
+def serves_static_css():
+    """Whether the running server serves app/static/*.css with a text/css content type
+
+    The Tornado server sends unlisted file types as text/plain with nosniff,
+    which browsers refuse to apply as a stylesheet.
+    """
+    if not st.get_option('server.enableStaticServing'):
+        return False
+    try:
+        from streamlit.web.server.app_static_file_handler import SAFE_APP_STATIC_FILE_EXTENSIONS
+    except ImportError:
+        # No Tornado handler: the Starlette server serves files by their real type
+        return True
+    try:
+        if st.get_option('server.useStarlette'):
+            return True
+    except Exception:
+        pass
+    return '.css' in SAFE_APP_STATIC_FILE_EXTENSIONS
+
+
+def apply_theme(name):
+    """Style the current page with styles/<name>.css
+
+    Streamlit removes elements a rerun does not emit again, so this runs on
+    every rerun. Where static CSS can be served it only sends a short <link>
+    to the content-hashed file, which the browser downloads once; otherwise
+    the minified stylesheet is sent inline.
+    """
+    filename, css = build_stylesheet(name)
+    if filename is not None and serves_static_css():
+        st.markdown(f'<link rel="stylesheet" href="{STATIC_URL}/{filename}">', unsafe_allow_html=True)
+    else:
+        st.markdown(f'<style>{css}</style>', unsafe_allow_html=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the minified, content-hashed page stylesheets")
+    parser.add_argument('names', nargs='*', help="Stylesheets to build (default: all in styles/)")
+    parser.add_argument('--output-dir', default=STATIC_DIR)
+    args = parser.parse_args()
+
+    for name in args.names or style_names():
+        filename, css = build_stylesheet(name, args.output_dir)
+        if filename is None:
+            raise SystemExit(f"Could not write {name} to {args.output_dir}")
+        with open(os.path.join(STYLES_DIR, f'{name}.css'), encoding='utf-8') as f:
+            size = len(f.read().encode())
+        print(f"{name}: {size:,} -> {len(css.encode()):,} bytes, {os.path.join(args.output_dir, filename)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
+from sklearn.model_selection import StratifiedKFold, train_test_split
+from sklearn.naive_bayes import GaussianNB
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+from sklearn.svm import SVC
+from sklearn.tree import DecisionTreeClassifier
+from threadpoolctl import threadpool_limits
+
+from features import MODEL_FEATURES
+
+try:
+    import xgboost as xgb
+except ImportError:
+    xgb = None
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+CACHE_DIR = os.path.join(DATA_DIR, 'processed', 'cv_cache')
+
+RANDOM_STATE = 42
+
+METRICS = ['Accuracy', 'Precision', 'Recall', 'F1-Score']
+
+
+def candidate_models():
+    """The seven models compared in 04_Data_Modelling: name -> (estimator, needs scaled features)"""
+    candidates = {
+        'Logistic Regression': (LogisticRegression(random_state=RANDOM_STATE, max_iter=1000), True),
+        'Naive Bayes': (GaussianNB(), False),
+        'Random Forest': (RandomForestClassifier(n_estimators=100, random_state=RANDOM_STATE), False),
+        'SVM': (SVC(kernel='rbf', random_state=RANDOM_STATE), True),
+        'Decision Tree': (DecisionTreeClassifier(random_state=RANDOM_STATE, max_depth=10), False),
+        'KNN': (KNeighborsClassifier(n_neighbors=5), True)
+    }
+    if xgb is not None:
+        # One thread per model; parallelism comes from the process pool
+        candidates['XGBoost'] = (xgb.XGBClassifier(random_state=RANDOM_STATE, eval_metric='logloss', n_jobs=1), False)
+    else:
+        warnings.warn("xgboost is not installed; skipping the XGBoost candidate")
+    return candidates
+
+
+class FoldCache:
+    """Stratified k-fold splits and per-fold scaled matrices, computed once and stored as .npy files
+
+    The cache directory is keyed by a hash of the data and the split
+    settings, so repeated runs on the same data reuse it. Workers open the
+    arrays memory-mapped instead of receiving copies.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, 'folds.json')) as f:
+            self.n_splits = json.load(f)['n_splits']
+
+    @classmethod
+    def build(cls, X, y, n_splits=5, random_state=RANDOM_STATE, cache_dir=CACHE_DIR):
+        """Compute (or reuse) fold indices and scaled train/test matrices for X, y"""
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        y = np.ascontiguousarray(y)
+        digest = hashlib.sha256()
+        for part in [X.tobytes(), y.tobytes(), repr((X.shape, y.dtype.str, n_splits, random_state)).encode()]:
+            digest.update(part)
+        directory = os.path.join(cache_dir, digest.hexdigest()[:16])
+
+        if not os.path.exists(os.path.join(directory, 'folds.json')):
+            os.makedirs(directory, exist_ok=True)
+            np.save(os.path.join(directory, 'X.npy'), X)
+            np.save(os.path.join(directory, 'y.npy'), y)
+
+            splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+            for fold, (train, test) in enumerate(splitter.split(X, y)):
+                scaler = StandardScaler().fit(X[train])
+                np.save(os.path.join(directory, f'fold{fold}_train_idx.npy'), train)
+                np.save(os.path.join(directory, f'fold{fold}_test_idx.npy'), test)
+                np.save(os.path.join(directory, f'fold{fold}_train_scaled.npy'), scaler.transform(X[train]))
+                np.save(os.path.join(directory, f'fold{fold}_test_scaled.npy'), scaler.transform(X[test]))
+
+            # Written last, so an interrupted build is redone rather than half-used
+            with open(os.path.join(directory, 'folds.json'), 'w') as f:
+                json.dump({'n_splits': n_splits, 'random_state': random_state}, f)
+        return cls(directory)
+
+    def _load(self, name):
+        return np.load(os.path.join(self.directory, f'{name}.npy'), mmap_mode='r')
+
+    def fold(self, fold, scaled):
+        """(X_train, X_test, y_train, y_test) for one fold"""
+        y = self._load('y')
+        train, test = self._load(f'fold{fold}_train_idx'), self._load(f'fold{fold}_test_idx')
+        if scaled:
+            X_train, X_test = self._load(f'fold{fold}_train_scaled'), self._load(f'fold{fold}_test_scaled')
+        else:
+            X = self._load('X')
+            X_train, X_test = X[train], X[test]
+        return np.asarray(X_train), np.asarray(X_test), y[train], y[test]
+
+
+# Per-process state of pool workers, set once by _init_worker
+_worker = {}
+
+
+def _init_worker(cache_dir):
+    _worker['cache'] = FoldCache(cache_dir)
+    # Keep BLAS/OpenMP to one thread so n_jobs processes do not oversubscribe the cores
+    _worker['limits'] = threadpool_limits(1)
+
+
+def evaluate_fold(cache, name, estimator, scaled, fold, train_fraction=1.0):
+    """Fit one candidate on one fold and score it on the held-out part
+
+    With ``train_fraction`` below 1 the model is fit on a fixed stratified
+    subsample of the fold's training rows; the held-out part is unchanged.
+    """
+    X_train, X_test, y_train, y_test = cache.fold(fold, scaled)
+    if train_fraction < 1:
+        keep, _ = train_test_split(np.arange(len(y_train)), train_size=train_fraction,
+                                   stratify=y_train, random_state=RANDOM_STATE)
+        X_train, y_train = X_train[keep], y_train[keep]
+    model = clone(estimator)
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_time = time.perf_counter() - start
+    pred = model.predict(X_test)
+    return {
+        'Model': name,
+        'Fold': fold,
+        'Accuracy': accuracy_score(y_test, pred),
+        'Precision': precision_score(y_test, pred, zero_division=0),
+        'Recall': recall_score(y_test, pred, zero_division=0),
+        'F1-Score': f1_score(y_test, pred, zero_division=0),
+        'Fit_Time': fit_time
+    }
+
+
+def _evaluate_in_worker(name, estimator, scaled, fold):
+    return evaluate_fold(_worker['cache'], name, estimator, scaled, fold)
+
+
+def summarize(fold_results):
+    """Mean and standard deviation of every metric per model, best accuracy first"""
+    grouped = pd.DataFrame(fold_results).groupby('Model')
+    table = grouped[METRICS + ['Fit_Time']].mean()
+    for metric in METRICS:
+        table[f'{metric}_Std'] = grouped[metric].std(ddof=0)
+    table = table[[column for metric in METRICS for column in (metric, f'{metric}_Std')] + ['Fit_Time']]
+    return table.sort_values('Accuracy', ascending=False).reset_index()
+
+
+def cross_validate_models(X, y, models=None, n_splits=5, n_jobs=-1, cache_dir=CACHE_DIR):
+    """Stratified k-fold CV of every candidate, one (model, fold) task per pool job
+
+    Returns (metrics table, per-fold results). ``n_jobs=-1`` uses every core and
+    ``n_jobs=1`` runs everything in this process.
+    """
+    models = models if models is not None else candidate_models()
+    cache = FoldCache.build(X, y, n_splits=n_splits, cache_dir=cache_dir)
+    tasks = [(name, estimator, scaled, fold)
+             for name, (estimator, scaled) in models.items()
+             for fold in range(cache.n_splits)]
+
+    n_jobs = os.cpu_count() if n_jobs in (None, -1) else n_jobs
+    if n_jobs == 1:
+        fold_results = [evaluate_fold(cache, *task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(tasks)), initializer=_init_worker,
+                                 initargs=(cache.directory,)) as pool:
+            fold_results = list(pool.map(_evaluate_in_worker, *zip(*tasks)))
+
+    fold_results = pd.DataFrame(fold_results)
+    return summarize(fold_results), fold_results
+
+
+def load_training_data(csv_path=None):
+    """Feature matrix and encoded target of the cleaned dataset, as in 04_Data_Modelling"""
+    from data_store import CLEANED_DATA, load_dataset
+
+    df = load_dataset(csv_path or CLEANED_DATA)
+    X = df[MODEL_FEATURES].to_numpy(dtype=np.float64)
+    y = LabelEncoder().fit_transform(np.asarray(df['Personality']))
+    return X, y
+
+
+def main():
+    models = candidate_models()
+    parser = argparse.ArgumentParser(description="Cross-validate every candidate model in parallel")
+    parser.add_argument('--data', help="Cleaned CSV (default: personality_dataset_cleaned.csv)")
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--n-jobs', type=int, default=-1, help="Worker processes; -1 uses every core")
+    parser.add_argument('--models', nargs='+', choices=list(models), metavar='MODEL',
+                        help=f"Subset of candidate names to run: {', '.join(models)}")
+    parser.add_argument('--output', help="Also write the metrics table to this CSV")
+    args = parser.parse_args()
+    if args.n_jobs == 0 or args.n_jobs < -1:
+        parser.error("--n-jobs must be a positive number of processes or -1 for every core")
+
+    X, y = load_training_data(args.data)
+    if args.models:
+        models = {name: models[name] for name in args.models}
+
+    start = time.perf_counter()
+    table, _ = cross_validate_models(X, y, models, n_splits=args.folds, n_jobs=args.n_jobs)
+    print(table.round(4).to_string(index=False))
+    print(f"\n{len(models)} models x {args.folds} folds in {time.perf_counter() - start:.1f}s")
+    if args.output:
+        table.to_csv(args.output, index=False)
+
+
+if __name__ == "__main__":
+    main()
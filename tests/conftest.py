@@ -0,0 +1,74 @@
+import os
+import sys
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+# The app modules import each other as top-level modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app'))
+
+from compact_forest import export_forest  # noqa: E402
+from features import BEHAVIORAL_FEATURES, BINARY_FEATURES, MODEL_FEATURES, build_feature_matrix  # noqa: E402
+from model_registry import ModelRegistry  # noqa: E402
+
+
+def random_answers(n, seed):
+    """n rows of the seven model inputs on the survey's scales"""
+    rng = np.random.default_rng(seed)
+    answers = {feature: rng.integers(0, 11, n).astype(float) for feature in BEHAVIORAL_FEATURES}
+    answers.update({feature: rng.integers(0, 2, n).astype(float) for feature in BINARY_FEATURES})
+    return pd.DataFrame(answers)
+
+
+def _make_model(model_name):
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.naive_bayes import GaussianNB
+
+    return {
+        'naive_bayes': lambda: GaussianNB(),
+        'logistic_regression': lambda: LogisticRegression(max_iter=1000),
+        'random_forest': lambda: RandomForestClassifier(n_estimators=5, max_depth=4, random_state=0)
+    }[model_name]()
+
+
+@pytest.fixture
+def register_version(tmp_path):
+    """Factory fitting a small model and registering it in a fresh registry; returns (registry, model, scaler)
+
+    Scaled versions are fitted on StandardScaler output and registered with
+    scaled=True; random forests also get a compact artifact.
+    """
+    from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+    def register(model_name, scaled):
+        answers = random_answers(400, seed=0)
+        X = pd.DataFrame(build_feature_matrix(answers), columns=MODEL_FEATURES)
+        labels = np.where(answers['Time_spent_Alone'] + 5 * answers['Gets_Drained_Socializing'] > 7,
+                          'Introvert', 'Extrovert')
+        label_encoder = LabelEncoder().fit(labels)
+        scaler = StandardScaler().fit(X)
+        X_fit = pd.DataFrame(scaler.transform(X), columns=MODEL_FEATURES) if scaled else X
+        model = _make_model(model_name).fit(X_fit, label_encoder.transform(labels))
+
+        sources = tmp_path / f'{model_name}_{scaled}'
+        sources.mkdir()
+        artifacts = {}
+        for role, value in [('model', model), ('scaler', scaler), ('label_encoder', label_encoder),
+                            ('feature_names', MODEL_FEATURES)]:
+            joblib.dump(value, sources / f'{role}.pkl')
+            artifacts[role] = str(sources / f'{role}.pkl')
+        if model_name == 'random_forest':
+            artifacts['compact'] = str(sources / 'compact')
+            export_forest(model, artifacts['compact'])
+
+        models_dir = tmp_path / 'models'
+        models_dir.mkdir(exist_ok=True)
+        registry = ModelRegistry(str(models_dir))
+        registry.register(model_name, artifacts, features=MODEL_FEATURES, classes=label_encoder.classes_,
+                          scaled=scaled)
+        return registry, model, scaler
+
+    return register
@@ -0,0 +1,47 @@
+import itertools
+
+import numpy as np
+import pytest
+
+import answer_table
+from personality_predictor import PersonalityPredictor
+from quiz_features import answers_to_features
+
+
+@pytest.fixture
+def predictor(register_version):
+    registry, _, _ = register_version('random_forest', False)
+    return PersonalityPredictor('random_forest', registry=registry)
+
+
+@pytest.mark.parametrize('name', sorted(answer_table.MAPPINGS))
+def test_table_matches_the_model_on_every_answer(tmp_path, predictor, name):
+    answer_table.build_table(name, predictor, str(tmp_path))
+    table, meta = answer_table.load_table(name, str(tmp_path))
+
+    questions = answer_table.MAPPINGS[name]['question_ids']
+    answers = [dict(zip(questions, scores))
+               for scores in itertools.product(range(1, answer_table.N_OPTIONS + 1), repeat=len(questions))]
+    expected = predictor.predict_batch(answers_to_features(answers, answer_table.MAPPINGS[name]))
+    rows = table[[answer_table.answer_index(a, answer_table.MAPPINGS[name]) for a in answers]]
+
+    assert np.array(meta['classes'])[rows['label']].tolist() == expected['Predicted_Personality'].tolist()
+    # Confidence is stored as float16
+    np.testing.assert_allclose(rows['confidence'].astype(float), expected['Confidence'], rtol=1e-3)
+
+
+def test_lookup_falls_back_when_it_cannot_answer(tmp_path, predictor, register_version, monkeypatch):
+    answer_table.build_table('quiz', predictor, str(tmp_path))
+    questions = answer_table.QUIZ_MAPPING['question_ids']
+    answers = {question: 3 for question in questions}
+    assert answer_table.lookup(answers, 'quiz', predictor, str(tmp_path)) is not None
+
+    # Partial answers, answers out of range and tables of another model version
+    assert answer_table.lookup({questions[0]: 3}, 'quiz', predictor, str(tmp_path)) is None
+    assert answer_table.lookup({**answers, questions[0]: 5}, 'quiz', predictor, str(tmp_path)) is None
+    other_registry, _, _ = register_version('naive_bayes', False)
+    other = PersonalityPredictor('naive_bayes', registry=other_registry)
+    assert answer_table.lookup(answers, 'quiz', other, str(tmp_path)) is None
+
+    monkeypatch.setitem(answer_table._MAPPING_SHA256, 'quiz', 'changed')
+    assert answer_table.lookup(answers, 'quiz', predictor, str(tmp_path)) is None
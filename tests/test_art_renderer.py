@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+from PIL import ImageFilter
+
+import art_renderer
+
+PALETTE = ['#ff6b6b', '#ff9a56', '#ff6b9d', '#ffc16b']
+
+
+@pytest.mark.parametrize('organization', [30, 90])
+def test_blur_matches_pillow(organization):
+    traits = {'calm': 90, 'organization': organization, 'social_energy': 80, 'confidence': 70}
+    art = art_renderer.abstract_art(traits, PALETTE, 300, 200, rng=np.random.default_rng(3))
+
+    shapes = art_renderer.shape_params(traits, len(PALETTE), 300, 200, np.random.default_rng(3))
+    palette = [tuple(int(color[i:i + 2], 16) for i in (1, 3, 5)) for color in PALETTE]
+    expected = art_renderer.draw_shapes(shapes, palette, 300, 200).filter(ImageFilter.BLUR)
+    assert np.array_equal(np.asarray(art), np.asarray(expected))
+
+
+@pytest.mark.parametrize('blurred', [False, True])
+def test_bands_match_full_image(blurred):
+    traits = {'organization': 20, 'confidence': 40}
+    shapes = art_renderer.shape_params(traits, 3, 150, 150, np.random.default_rng(0))
+    shapes = art_renderer.scale_shapes(shapes, 2.5)
+    palette = [(255, 0, 0), (0, 128, 0), (0, 0, 255)]
+    width, height = 375, 375
+
+    full = art_renderer.render_rows(shapes, palette, width, height, 0, height, blurred)
+    bands = [art_renderer.render_rows(shapes, palette, width, height, top, min(top + 37, height), blurred)
+             for top in range(0, height, 37)]
+    assert np.array_equal(np.concatenate(bands), full)
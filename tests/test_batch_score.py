@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import batch_score
+from conftest import random_answers
+from features import BEHAVIORAL_FEATURES, BINARY_FEATURES
+from personality_predictor import PersonalityPredictor
+
+FILL_VALUES = {**{feature: 5.0 for feature in BEHAVIORAL_FEATURES}, **{feature: 0.0 for feature in BINARY_FEATURES}}
+
+
+@pytest.mark.parametrize('model_name', ['logistic_regression', 'naive_bayes', 'random_forest'])
+@pytest.mark.parametrize('scaled', [False, True])
+def test_parallel_output_matches_serial(tmp_path, register_version, model_name, scaled):
+    registry, _, _ = register_version(model_name, scaled)
+    answers = random_answers(1000, seed=2)
+    answers.loc[::7, 'Time_spent_Alone'] = np.nan
+    input_path = tmp_path / 'answers.csv'
+    answers.to_csv(input_path, index=False)
+
+    outputs = []
+    for workers in (1, 2):
+        predictor = PersonalityPredictor(model_name, registry=registry)
+        output_path = tmp_path / f'scored_{workers}.csv'
+        rows = batch_score.score_csv(str(input_path), str(output_path), predictor, FILL_VALUES,
+                                     chunksize=150, workers=workers, verbose=False)
+        assert rows == len(answers)
+        outputs.append(output_path.read_bytes())
+    assert outputs[0] == outputs[1]
+
+
+def test_output_does_not_depend_on_chunksize(tmp_path, register_version):
+    registry, _, _ = register_version('naive_bayes', False)
+    predictor = PersonalityPredictor('naive_bayes', registry=registry)
+    answers = random_answers(300, seed=3)
+    answers.loc[::5, 'Going_outside'] = np.nan
+    answers.loc[::4, 'Post_frequency'] = 14.0
+    input_path = tmp_path / 'answers.csv'
+    answers.to_csv(input_path, index=False)
+
+    outputs = []
+    for chunksize in (1, 37, 1000):
+        output_path = tmp_path / f'scored_{chunksize}.csv'
+        batch_score.score_csv(str(input_path), str(output_path), predictor, FILL_VALUES,
+                              chunksize=chunksize, verbose=False)
+        outputs.append(output_path.read_bytes())
+    assert outputs[0] == outputs[1] == outputs[2]
+
+    # Every row is scored as if the whole file had been cleaned at once
+    scored = pd.read_csv(tmp_path / 'scored_1000.csv')
+    cleaned = answers.fillna(FILL_VALUES).clip(upper=10)
+    proba = predictor.predict_proba(cleaned)
+    assert scored['Predicted_Personality'].tolist() == list(np.asarray(predictor.classes)[proba.argmax(axis=1)])
+    np.testing.assert_allclose(scored['Confidence'], (proba.max(axis=1) * 100).round(2))
@@ -0,0 +1,47 @@
+import json
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from compact_forest import CompactForest, export_forest
+
+
+@pytest.fixture
+def forest(tmp_path):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(500, 6))
+    y = (X[:, 0] + X[:, 1] * X[:, 2] > 0).astype(int)
+    model = RandomForestClassifier(n_estimators=8, max_depth=6, random_state=0).fit(X, y)
+    export_forest(model, str(tmp_path / 'compact'))
+    return model, tmp_path / 'compact'
+
+
+def test_matches_sklearn(forest):
+    model, path = forest
+    X = np.random.default_rng(1).normal(size=(300, 6)).astype(np.float32)
+    np.testing.assert_allclose(CompactForest.load(str(path)).predict_proba(X), model.predict_proba(X), atol=1e-6)
+
+
+def test_traverses_the_mapped_arrays(forest):
+    _, path = forest
+    compact = CompactForest.load(str(path))
+    for name in ['left', 'right']:
+        array = getattr(compact, name)
+        assert isinstance(array.base, np.memmap)
+        assert array.dtype == np.int32
+
+
+def test_loads_tree_local_pointers(forest):
+    model, path = forest
+    # Exports made before child pointers were global
+    compact = CompactForest.load(str(path))
+    tree_start = np.repeat(compact.roots, np.diff(np.append(compact.roots, len(compact.feature))))
+    for name in ['left', 'right']:
+        np.save(path / f'{name}.npy', (getattr(compact, name) - tree_start).astype(np.int16))
+    meta = json.loads((path / 'forest.json').read_text())
+    del meta['child_pointers']
+    (path / 'forest.json').write_text(json.dumps(meta))
+
+    X = np.random.default_rng(1).normal(size=(300, 6)).astype(np.float32)
+    np.testing.assert_allclose(CompactForest.load(str(path)).predict_proba(X), model.predict_proba(X), atol=1e-6)
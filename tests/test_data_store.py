@@ -0,0 +1,58 @@
+import multiprocessing
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_store
+
+
+@pytest.fixture
+def survey_csv(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 500
+    df = pd.DataFrame({
+        'Time_spent_Alone': rng.integers(0, 11, n).astype(float),
+        'Stage_fear': rng.choice(['Yes', 'No'], n),
+        'Has_Stage_Fear': rng.integers(0, 2, n),
+        'Personality': rng.choice(['Introvert', 'Extrovert'], n),
+        'Comment': [f'note {i}' for i in range(n)]
+    })
+    df.loc[::9, 'Time_spent_Alone'] = np.nan
+    df.loc[::11, 'Stage_fear'] = np.nan
+    path = tmp_path / 'survey.csv'
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+def test_matches_read_csv(survey_csv):
+    df = data_store.load_dataset(survey_csv)
+    expected = pd.read_csv(survey_csv)
+    assert list(df.columns) == list(expected.columns)
+    assert isinstance(df['Stage_fear'].dtype, pd.CategoricalDtype)
+    assert df['Has_Stage_Fear'].dtype == np.int8
+    for column in expected.columns:
+        assert df[column].astype(object).where(df[column].notna(), None).tolist() == \
+            expected[column].astype(object).where(expected[column].notna(), None).tolist()
+
+
+def test_rebuilt_after_the_csv_changes(survey_csv):
+    data_store.load_dataset(survey_csv)
+    assert data_store.cache_is_valid(survey_csv)
+
+    with open(survey_csv, 'a') as f:
+        f.write('3.0,Yes,1,Introvert,added\n')
+    assert not data_store.cache_is_valid(survey_csv)
+    df = data_store.load_dataset(survey_csv)
+    assert df['Comment'].iloc[-1] == 'added'
+
+
+def test_concurrent_builds(survey_csv):
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(3) as pool:
+        pool.map(data_store.build_cache, [survey_csv] * 6)
+
+    assert data_store.cache_is_valid(survey_csv)
+    assert len(data_store.load_table(survey_csv, rebuild=False)) == 500
+    assert not [name for name in os.listdir(os.path.dirname(survey_csv)) if name.endswith('.tmp')]
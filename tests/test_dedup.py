@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import dedup
+import ingest
+
+
+def _deduplicated(path, chunksize, seen=None):
+    chunks = dedup.unique_rows(ingest.read_csv(str(path), chunksize=chunksize), seen)
+    return pd.concat(list(chunks)).reset_index(drop=True)
+
+
+def test_dtype_drift_between_chunks(tmp_path):
+    # Column a is float in the first chunk and text in the second
+    path = tmp_path / 'drift.csv'
+    path.write_text('a,b\n4,Yes\n5,No\n4,Yes\nx,No\n')
+
+    kept = _deduplicated(path, chunksize=2)
+    expected = pd.read_csv(path).drop_duplicates().reset_index(drop=True)
+    assert kept.astype(str).values.tolist() == expected.astype(str).values.tolist()
+
+
+@pytest.mark.parametrize('chunksize', [1, 7, 50, 1000])
+def test_matches_drop_duplicates(tmp_path, chunksize):
+    rng = np.random.default_rng(0)
+    n = 600
+    frame = pd.DataFrame({
+        'score': rng.integers(0, 4, n).astype(float),
+        'answer': rng.choice(['Yes', 'No'], n),
+        'label': rng.choice(['a', 'b', 'c'], n)
+    })
+    frame.loc[rng.random(n) < 0.1, 'score'] = np.nan
+    frame.loc[rng.random(n) < 0.1, 'answer'] = np.nan
+    # Text appears late, so earlier chunks read the column as numbers
+    frame['score'] = frame['score'].astype(object)
+    frame.loc[n - 5:, 'score'] = 'unknown'
+    path = tmp_path / 'rows.csv'
+    frame.to_csv(path, index=False)
+
+    kept = _deduplicated(path, chunksize)
+    expected = pd.read_csv(path).drop_duplicates().reset_index(drop=True)
+    assert len(kept) == len(expected)
+    assert kept.astype(str).values.tolist() == expected.astype(str).values.tolist()
+
+
+def test_seen_set_spans_files(tmp_path):
+    first, second = tmp_path / 'first.csv', tmp_path / 'second.csv'
+    first.write_text('a,b\n1,Yes\n2,No\n')
+    second.write_text('a,b\n2.0,No\n3,No\n1, Yes\n')
+
+    seen = dedup.SeenHashes(str(tmp_path / 'seen'), bloom_capacity=1000)
+    assert len(_deduplicated(first, chunksize=1, seen=seen)) == 2
+    kept = _deduplicated(second, chunksize=1, seen=seen)
+    assert kept['a'].astype(float).tolist() == [3.0]
+    assert kept['b'].tolist() == ['No']
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+import hyperparameter_search
+from training_harness import candidate_models
+
+MODELS = ['Naive Bayes', 'Decision Tree']
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 4))
+    y = (X[:, 0] - X[:, 2] + rng.normal(scale=0.7, size=300) > 0).astype(int)
+    return X, y
+
+
+def _search(tmp_path, data, **kwargs):
+    candidates = candidate_models()
+    settings = {'models': {name: candidates[name] for name in MODELS}, 'n_configs': 9, 'eta': 3, 'n_splits': 3,
+                'n_jobs': 1, 'db_path': str(tmp_path / 'trials.sqlite'), 'cache_dir': str(tmp_path / 'cache')}
+    return hyperparameter_search.search(*data, **{**settings, **kwargs})
+
+
+def test_rung_budgets():
+    assert hyperparameter_search.rung_budgets('Random Forest', 3) == [50, 150, 450]
+    assert hyperparameter_search.rung_budgets('KNN', 3) == pytest.approx([1 / 9, 1 / 3, 1.0])
+
+
+def test_successive_halving_keeps_the_best_third(tmp_path, data):
+    best, trials = _search(tmp_path, data)
+    for name in MODELS:
+        model_trials = trials[trials['model'] == name]
+        assert model_trials.groupby('rung').size().tolist() == [9, 3, 1]
+        for rung in (0, 1):
+            scores = model_trials[model_trials['rung'] == rung].sort_values(['score', 'config'],
+                                                                           ascending=[False, True])
+            promoted = set(model_trials[model_trials['rung'] == rung + 1]['config'])
+            assert promoted == set(scores['config'].iloc[:len(promoted)])
+    assert sorted(best['model']) == sorted(MODELS)
+    assert (best['budget'] == 1.0).all()
+
+
+def test_rerun_resumes_from_the_trial_store(tmp_path, data, monkeypatch):
+    best, trials = _search(tmp_path, data)
+
+    def evaluate_trial(*args, **kwargs):
+        raise AssertionError("finished trials were evaluated again")
+
+    monkeypatch.setattr(hyperparameter_search, 'evaluate_trial', evaluate_trial)
+    resumed_best, resumed_trials = _search(tmp_path, data)
+    assert resumed_best.equals(best)
+    assert resumed_trials.equals(trials)
+
+
+def test_parallel_matches_serial(tmp_path, data):
+    serial, _ = _search(tmp_path, data, study='serial')
+    parallel, _ = _search(tmp_path, data, study='parallel', n_jobs=2)
+    assert serial[['model', 'params', 'score']].equals(parallel[['model', 'params', 'score']])
+
+
+def test_study_settings_cannot_change(tmp_path, data):
+    _search(tmp_path, data)
+    with pytest.raises(ValueError, match='new study name'):
+        _search(tmp_path, data, eta=2)
@@ -0,0 +1,118 @@
+import asyncio
+import base64
+from types import SimpleNamespace
+
+import pytest
+
+from image_client import ImageClient, NoImageError
+from image_store import ImageStore
+
+
+class FakeOpenAI:
+    """Stands in for one API key's AsyncOpenAI client"""
+
+    def __init__(self, api_key, calls, delay=0.05):
+        self.api_key = api_key
+        self.calls = calls
+        self.delay = delay
+        self.responses = SimpleNamespace(create=self.create)
+
+    async def create(self, model, input, tools):
+        self.calls.append((self.api_key, input))
+        await asyncio.sleep(self.delay)
+        if self.api_key == 'bad-key':
+            raise RuntimeError("invalid API key")
+        if input == 'blank':
+            return SimpleNamespace(output=[SimpleNamespace(type='message', result=None)])
+        image = f'{input} for {self.api_key}'.encode()
+        return SimpleNamespace(output=[SimpleNamespace(type='image_generation_call',
+                                                       result=base64.b64encode(image).decode())])
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def client(monkeypatch):
+    calls = []
+    fakes = {}
+    client = ImageClient(model='test-model')
+    monkeypatch.setattr(client, '_client', lambda api_key: fakes.setdefault(api_key, FakeOpenAI(api_key, calls)))
+    client.calls = calls
+    yield client
+    client.close()
+
+
+def _gather(client, *requests):
+    async def run():
+        return await asyncio.gather(*(client.agenerate(key, prompt) for key, prompt in requests),
+                                    return_exceptions=True)
+    return asyncio.run_coroutine_threadsafe(run(), client.loop).result(10)
+
+
+def test_identical_requests_in_flight_are_coalesced(client):
+    images = _gather(client, *[('key-a', 'a fox')] * 5, ('key-b', 'an owl'))
+    assert images == [b'a fox for key-a'] * 5 + [b'an owl for key-b']
+    assert sorted(client.calls) == [('key-a', 'a fox'), ('key-b', 'an owl')]
+    assert client.stats()['coalesced'] == 4
+
+    # Once the first request has finished, the prompt is sent again
+    assert client.generate('key-b', 'a fox') == b'a fox for key-b'
+    assert len(client.calls) == 3
+
+
+def test_failed_leader_does_not_fail_other_keys(client):
+    images = _gather(client, ('bad-key', 'a fox'), ('key-a', 'a fox'), ('bad-key', 'a fox'))
+    assert isinstance(images[0], RuntimeError)
+    assert images[1] == b'a fox for key-a'
+    # Waiters with the failing key get its error without a retry
+    assert isinstance(images[2], RuntimeError)
+    assert client.calls == [('bad-key', 'a fox'), ('key-a', 'a fox')]
+
+
+def test_response_without_an_image(client):
+    with pytest.raises(NoImageError):
+        client.generate('key-a', 'blank')
+
+
+def test_store_answers_requests_it_has_enough_images_for(client, tmp_path):
+    client.store = ImageStore(str(tmp_path / 'store'), variants=1)
+    assert client.generate('key-a', 'a fox') == b'a fox for key-a'
+    assert client.generate('key-b', 'a fox') == b'a fox for key-a'
+    assert client.calls == [('key-a', 'a fox')]
+    client.store.close()
+
+
+def test_evicted_client_is_closed_after_its_requests_finish(monkeypatch):
+    openai = pytest.importorskip('openai')
+    calls, created = [], []
+
+    class ClosingOpenAI(FakeOpenAI):
+        closed = False
+
+        def __init__(self, api_key, base_url, http_client):
+            super().__init__(api_key, calls, delay=0.2)
+            created.append(self)
+
+        async def create(self, model, input, tools):
+            image = await super().create(model, input, tools)
+            assert not self.closed, "client closed while its request was running"
+            return image
+
+        async def close(self):
+            self.closed = True
+
+    monkeypatch.setattr(openai, 'AsyncOpenAI', ClosingOpenAI)
+    client = ImageClient(model='test-model', max_clients=1)
+
+    async def run():
+        slow = asyncio.ensure_future(client.agenerate('key-a', 'a fox'))
+        await asyncio.sleep(0.05)
+        # key-b's client evicts key-a's while its request is still running
+        return await asyncio.gather(slow, client.agenerate('key-b', 'an owl'))
+
+    images = asyncio.run_coroutine_threadsafe(run(), client.loop).result(10)
+    assert images == [b'a fox for key-a', b'an owl for key-b']
+    assert [fake.closed for fake in created] == [True, False]
+    client.close()
+    assert created[1].closed
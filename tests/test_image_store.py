@@ -0,0 +1,88 @@
+import os
+
+import pytest
+
+from image_store import ImageStore, request_key
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ImageStore(str(tmp_path / 'store'), max_bytes=10_000, variants=3)
+    yield store
+    store.close()
+
+
+def test_request_key_ignores_parameter_order():
+    assert request_key('m', 'a fox', {'size': 1, 'quality': 2}) == request_key('m', 'a fox', {'quality': 2, 'size': 1})
+    assert request_key('m', 'a fox') != request_key('m', 'an owl')
+    assert request_key('m', 'a fox') != request_key('other', 'a fox')
+
+
+def test_misses_until_a_request_has_every_variant(store):
+    variants = [b'fox 1', b'fox 2', b'fox 3']
+    for image in variants:
+        assert store.get('m', 'a fox') is None
+        store.put('m', 'a fox', image)
+
+    assert {store.get('m', 'a fox') for _ in range(60)} == set(variants)
+    assert store.get('m', 'an owl') is None
+    assert store.get('other', 'a fox') is None
+    assert store.stats()['requests'] == 1
+
+
+def test_repeated_image_ends_the_search_for_variants(store):
+    store.put('m', 'a fox', b'fox')
+    assert store.get('m', 'a fox') is None
+    # The API gave the same image again, so more calls add no variety
+    store.put('m', 'a fox', b'fox')
+    assert store.get('m', 'a fox') == b'fox'
+
+
+def test_identical_images_are_stored_once(store):
+    store.put('m', 'a fox', b'same')
+    store.put('m', 'an owl', b'same')
+    stats = store.stats()
+    assert (stats['images'], stats['requests'], stats['bytes']) == (1, 2, 4)
+
+
+def test_least_recently_used_images_are_evicted(tmp_path):
+    store = ImageStore(str(tmp_path / 'store'), max_bytes=3000, variants=1)
+    for prompt in ['a', 'b', 'c']:
+        store.put('m', prompt, prompt.encode() * 1000)
+    # 'a' is used again, so 'b' is the least recently used
+    assert store.get('m', 'a') is not None
+    store.put('m', 'd', b'd' * 1000)
+
+    assert store.get('m', 'b') is None
+    assert store.get('m', 'a') == b'a' * 1000
+    stats = store.stats()
+    assert stats['bytes'] <= 3000
+    assert stats['evictions'] == 1
+    blobs = [name for _, _, names in os.walk(tmp_path / 'store' / 'blobs') for name in names]
+    assert len(blobs) == stats['images'] == 3
+    store.close()
+
+
+def test_blob_removed_from_disk_is_regenerated(store, tmp_path):
+    store.variants = 1
+    store.put('m', 'a fox', b'fox')
+    for root, _, names in os.walk(tmp_path / 'store' / 'blobs'):
+        for name in names:
+            os.remove(os.path.join(root, name))
+    assert store.get('m', 'a fox') is None
+    assert store.stats()['images'] == 0
+
+
+def test_shared_between_store_instances(store, tmp_path):
+    store.variants = 1
+    store.put('m', 'a fox', b'fox')
+    other = ImageStore(str(tmp_path / 'store'), variants=1)
+    assert other.get('m', 'a fox') == b'fox'
+    other.close()
+
+
+def test_zero_variants_turns_the_store_off(tmp_path):
+    store = ImageStore(str(tmp_path / 'store'), variants=0)
+    store.put('m', 'a fox', b'fox')
+    assert store.get('m', 'a fox') is None
+    assert not os.path.exists(tmp_path / 'store')
@@ -0,0 +1,103 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from inference_server import InferenceServer, MicroBatcher
+
+RECORD = {
+    'Time_spent_Alone': 4, 'Social_event_attendance': 6, 'Going_outside': 5, 'Friends_circle_size': 9,
+    'Post_frequency': 3, 'Stage_fear': 'No', 'Drained_after_socializing': 'Yes'
+}
+
+
+class FakePredictor:
+    """Scores each row by its first input and records the batch sizes it was called with"""
+
+    model_name = 'fake'
+    version = '1'
+    classes = ['Extrovert', 'Introvert']
+
+    def __init__(self):
+        self.batches = []
+
+    def predict_proba(self, X):
+        self.batches.append(len(X))
+        introvert = X[:, 0] / 10
+        return np.column_stack([1 - introvert, introvert])
+
+
+def _post(app, path, body):
+    """Send one POST through the ASGI app; returns (status, JSON payload)"""
+    messages = [{'type': 'http.request', 'body': json.dumps(body).encode(), 'more_body': False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app({'type': 'http', 'method': 'POST', 'path': path}, receive, send))
+    return sent[0]['status'], json.loads(sent[1]['body'])
+
+
+@pytest.mark.parametrize('path', ['/predict', '/predict_batch'])
+@pytest.mark.parametrize('value', [[1, 2], {'hours': 2}])
+def test_nested_value_is_a_client_error(path, value):
+    record = {**RECORD, 'Time_spent_Alone': value}
+    status, payload = _post(InferenceServer(predictor=FakePredictor()), path,
+                            record if path == '/predict' else [record])
+    assert status == 400
+    assert 'Time_spent_Alone' in payload['error']
+
+
+def test_unrelated_nested_fields_are_ignored():
+    status, payload = _post(InferenceServer(predictor=FakePredictor()), '/predict_batch',
+                            [{**RECORD, 'metadata': {'source': 'web'}}])
+    assert status == 200
+    assert payload['predictions'][0]['personality'] == 'Extrovert'
+
+
+def test_micro_batcher_coalesces_concurrent_requests():
+    predictor = FakePredictor()
+    batcher = MicroBatcher(predictor, max_batch_size=64, max_wait_ms=50)
+    rows = [np.full(7, i % 11, dtype=float) for i in range(40)]
+
+    async def run():
+        await batcher.start()
+        try:
+            return await asyncio.gather(*(batcher.predict(row) for row in rows))
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(run())
+    assert predictor.batches == [40]
+    # Every request gets the probabilities of its own row
+    for row, proba in zip(rows, results):
+        np.testing.assert_allclose(proba, [1 - row[0] / 10, row[0] / 10])
+
+
+def test_micro_batcher_flushes_full_batches():
+    predictor = FakePredictor()
+    batcher = MicroBatcher(predictor, max_batch_size=16, max_wait_ms=1000)
+
+    async def run():
+        await batcher.start()
+        try:
+            return await asyncio.wait_for(
+                asyncio.gather(*(batcher.predict(np.full(7, i % 11, dtype=float)) for i in range(48))), 5)
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(run())
+    assert predictor.batches == [16, 16, 16]
+    assert [proba[1] for proba in results] == pytest.approx([(i % 11) / 10 for i in range(48)])
+
+
+def test_predict_batch_keeps_record_order():
+    records = [{**RECORD, 'Time_spent_Alone': value} for value in [9, 1, 7, 3]]
+    status, payload = _post(InferenceServer(predictor=FakePredictor()), '/predict_batch', {'instances': records})
+    assert status == 200
+    assert [p['personality'] for p in payload['predictions']] == ['Introvert', 'Extrovert', 'Introvert', 'Extrovert']
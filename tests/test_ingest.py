@@ -0,0 +1,58 @@
+import codecs
+
+import pandas as pd
+import pytest
+
+import ingest
+
+NAMES = ['Zoë', 'Renée', 'Łukasz', 'Ana']
+
+
+def _write(path, text, encoding):
+    path.write_bytes(text.encode(encoding))
+    return str(path)
+
+
+@pytest.mark.parametrize('encoding, expected', [
+    ('utf-8', 'utf-8'), ('utf-8-sig', 'utf-8-sig'), ('utf-16', 'utf-16'), ('cp1252', 'cp1252')
+])
+def test_sniffs_encoding(tmp_path, encoding, expected):
+    names = NAMES if encoding != 'cp1252' else ['Zoë', 'Renée']
+    text = 'name,score\n' + ''.join(f'{name},{i}\n' for i, name in enumerate(names))
+    path = _write(tmp_path / 'names.csv', text, encoding)
+
+    assert ingest.sniff_encoding(path) == expected
+    assert ingest.read_csv(path)['name'].tolist() == names
+
+
+def test_multibyte_character_cut_by_the_sample(tmp_path):
+    # 'ë' is two bytes in UTF-8; the sample ends between them
+    path = _write(tmp_path / 'cut.csv', 'name\n' + 'a' * 9 + 'ë\n', 'utf-8')
+    assert ingest.sniff_encoding(path, sample_size=16) == 'utf-8'
+
+
+def test_invalid_bytes_after_the_sample_fall_back_to_cp1252(tmp_path):
+    rows = ''.join(f'Zoë,{i}\n' for i in range(20000))
+    path = tmp_path / 'late.csv'
+    # A cp1252 row far past the sniffed sample
+    path.write_bytes(('name,score\n' + rows).encode('utf-8') + 'Renée,1\n'.encode('cp1252'))
+    assert ingest.sniff_encoding(str(path)) == 'utf-8'
+
+    with pytest.warns(UserWarning, match='1 bytes were not valid utf-8'):
+        df = ingest.read_csv(str(path))
+    assert df['name'].iloc[-1] == 'Renée'
+    assert (df['name'].iloc[:-1] == 'Zoë').all()
+
+
+def test_chunks_decode_in_one_pass(tmp_path):
+    text = 'name,score\n' + ''.join(f'{NAMES[i % 4]},{i}\n' for i in range(100))
+    path = _write(tmp_path / 'names.csv', text, 'utf-8')
+    chunks = list(ingest.read_csv(path, chunksize=7))
+    assert pd.concat(chunks).reset_index(drop=True).equals(pd.read_csv(path, encoding='utf-8'))
+
+
+def test_utf16_is_strict(tmp_path):
+    path = tmp_path / 'broken.csv'
+    path.write_bytes(codecs.BOM_UTF16_LE + 'name\nAna\n'.encode('utf-16-le') + b'\x00')
+    with pytest.raises(UnicodeDecodeError):
+        ingest.read_csv(str(path))
@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import random_answers
+from features import MODEL_FEATURES, build_feature_matrix
+from personality_predictor import PersonalityPredictor
+
+
+@pytest.mark.parametrize('model_name', ['logistic_regression', 'naive_bayes', 'random_forest'])
+@pytest.mark.parametrize('scaled', [False, True])
+def test_registered_scaled_flag_matches_sklearn(register_version, model_name, scaled):
+    registry, model, scaler = register_version(model_name, scaled)
+    predictor = PersonalityPredictor(model_name, registry=registry)
+    assert predictor.scorer is not None
+
+    answers = random_answers(200, seed=1)
+    X_test = pd.DataFrame(build_feature_matrix(answers), columns=MODEL_FEATURES)
+    if scaled:
+        X_test = pd.DataFrame(scaler.transform(X_test), columns=MODEL_FEATURES)
+    expected = model.predict_proba(X_test)
+    np.testing.assert_allclose(predictor.predict_proba(answers), expected, atol=1e-4)
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from PIL import Image, ImageFilter
+
+import art_renderer
+import poster
+
+
+@pytest.mark.parametrize('n_jobs', [0, -2])
+def test_rejects_invalid_n_jobs(tmp_path, n_jobs):
+    with pytest.raises(ValueError, match='n_jobs'):
+        poster.render_poster({}, 64, 64, str(tmp_path / 'poster.png'), n_jobs=n_jobs)
+
+
+def test_png_writer_output_decodes(tmp_path):
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, (53, 31, 3), dtype=np.uint8)
+    path = tmp_path / 'rows.png'
+    with open(path, 'wb') as f:
+        writer = poster.PNGStreamWriter(f, 31, 53)
+        for top in range(0, 53, 10):
+            writer.write_rows(image[top:top + 10])
+        writer.close()
+
+    with Image.open(path) as decoded:
+        decoded.load()
+        assert decoded.mode == 'RGB'
+        assert np.array_equal(np.asarray(decoded), image)
+
+
+def test_png_writer_checks_the_row_count(tmp_path):
+    with open(tmp_path / 'short.png', 'wb') as f:
+        writer = poster.PNGStreamWriter(f, 4, 4)
+        writer.write_rows(np.zeros((3, 4, 3), dtype=np.uint8))
+        with pytest.raises(ValueError):
+            writer.write_rows(np.zeros((2, 4, 3), dtype=np.uint8))
+        with pytest.raises(ValueError):
+            writer.close()
+
+
+@pytest.mark.parametrize('width, height', [(300, 200), (150, 420)])
+def test_poster_matches_the_layout_drawn_whole(tmp_path, width, height):
+    traits = {'calm': 90, 'organization': 30, 'confidence': 80}
+    path = tmp_path / 'poster.png'
+    # A small budget splits the poster into many bands
+    poster.render_poster(traits, width, height, str(path), seed=7, n_jobs=2, memory_budget=width * 48 * 40)
+
+    shapes, palette = poster.poster_layout(traits, width, height, seed=7)
+    expected = art_renderer.draw_shapes(shapes, palette, width, height).filter(ImageFilter.BLUR)
+    with Image.open(path) as decoded:
+        assert np.array_equal(np.asarray(decoded), np.asarray(expected))
@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import prep_pipeline
+from features import BEHAVIORAL_FEATURES, PSYCHOLOGICAL_FEATURES
+
+
+def raw_rows(n, seed, missing=True):
+    """Raw survey rows with untidy Yes/No spellings, out-of-range values and repeats"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({feature: rng.integers(0, 13, n).astype(float) for feature in BEHAVIORAL_FEATURES})
+    for feature in PSYCHOLOGICAL_FEATURES:
+        df[feature] = rng.choice(['Yes', 'No', ' yes', 'N'], n)
+    df['Personality'] = rng.choice(['Introvert', 'Extrovert'], n)
+    if missing:
+        df.loc[rng.random(n) < 0.1, 'Going_outside'] = np.nan
+        df.loc[rng.random(n) < 0.1, 'Stage_fear'] = np.nan
+    # Repeat some earlier rows
+    return pd.concat([df, df.iloc[:n // 10]]).reset_index(drop=True)
+
+
+def _append(path, rows, header=False):
+    rows.to_csv(path, mode='w' if header else 'a', header=header, index=False)
+
+
+def _run(tmp_path, **kwargs):
+    return prep_pipeline.run(str(tmp_path / 'raw.csv'), str(tmp_path / 'cleaned.csv'), str(tmp_path / 'state'),
+                             **kwargs)
+
+
+def test_incremental_runs_match_one_run(tmp_path):
+    rows = raw_rows(300, seed=0, missing=False)
+    _append(tmp_path / 'raw.csv', rows, header=True)
+    _run(tmp_path, rebuild=True)
+    expected = (tmp_path / 'cleaned.csv').read_bytes()
+
+    _append(tmp_path / 'raw.csv', rows.iloc[:100], header=True)
+    _run(tmp_path, rebuild=True)
+    for start, stop in [(100, 180), (180, 181), (181, len(rows))]:
+        _append(tmp_path / 'raw.csv', rows.iloc[start:stop])
+        _run(tmp_path)
+    assert (tmp_path / 'cleaned.csv').read_bytes() == expected
+    assert _run(tmp_path) == 0
+
+
+def test_partial_last_line_waits_for_the_next_run(tmp_path):
+    rows = raw_rows(50, seed=1, missing=False)
+    reference = tmp_path / 'reference'
+    reference.mkdir()
+    _append(reference / 'raw.csv', rows, header=True)
+    _run(reference, rebuild=True)
+
+    _append(tmp_path / 'raw.csv', rows.iloc[:20], header=True)
+    _run(tmp_path, rebuild=True)
+    text = rows.iloc[20:].to_csv(header=False, index=False)
+    middle = len(text) // 2
+    assert text[middle - 1] != '\n'
+    with open(tmp_path / 'raw.csv', 'a') as f:
+        f.write(text[:middle])
+    _run(tmp_path)
+    with open(tmp_path / 'raw.csv', 'a') as f:
+        f.write(text[middle:])
+    _run(tmp_path)
+
+    assert (tmp_path / 'cleaned.csv').read_bytes() == (reference / 'cleaned.csv').read_bytes()
+
+
+def test_resume_after_crash_before_the_state_is_saved(tmp_path, monkeypatch):
+    rows = raw_rows(200, seed=2)
+    batches = [rows.iloc[:80], rows.iloc[80:150], rows.iloc[150:]]
+
+    # Uninterrupted runs
+    reference = tmp_path / 'reference'
+    reference.mkdir()
+    _append(reference / 'raw.csv', batches[0], header=True)
+    _run(reference, rebuild=True)
+    for batch in batches[1:]:
+        _append(reference / 'raw.csv', batch)
+        _run(reference)
+
+    _append(tmp_path / 'raw.csv', batches[0], header=True)
+    _run(tmp_path, rebuild=True)
+    _append(tmp_path / 'raw.csv', batches[1])
+
+    def crash(state):
+        raise KeyboardInterrupt
+
+    # The cleaned rows are appended, then the process dies
+    monkeypatch.setattr(prep_pipeline.PrepState, 'save', crash)
+    with pytest.raises(KeyboardInterrupt):
+        _run(tmp_path)
+    monkeypatch.undo()
+    _run(tmp_path)
+    _append(tmp_path / 'raw.csv', batches[2])
+    _run(tmp_path)
+
+    assert (tmp_path / 'cleaned.csv').read_bytes() == (reference / 'cleaned.csv').read_bytes()
+
+
+def test_rewritten_source_needs_a_rebuild(tmp_path):
+    rows = raw_rows(40, seed=3)
+    _append(tmp_path / 'raw.csv', rows, header=True)
+    _run(tmp_path, rebuild=True)
+
+    _append(tmp_path / 'raw.csv', rows.iloc[::-1], header=True)
+    with pytest.raises(ValueError, match='--rebuild'):
+        _run(tmp_path)
+    assert _run(tmp_path, rebuild=True) > 0
+
+
+def test_state_from_an_older_row_hash_needs_a_rebuild(tmp_path):
+    rows = raw_rows(40, seed=4)
+    _append(tmp_path / 'raw.csv', rows, header=True)
+    _run(tmp_path, rebuild=True)
+
+    state = prep_pipeline.PrepState.load(str(tmp_path / 'state'))
+    state.row_hash_version -= 1
+    state.save()
+    _append(tmp_path / 'raw.csv', rows.iloc[:5])
+    with pytest.raises(ValueError, match='--rebuild'):
+        _run(tmp_path)
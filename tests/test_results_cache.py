@@ -0,0 +1,66 @@
+from results_cache import ResultsCache, answers_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_answers_key_is_canonical():
+    assert answers_key({'q1': 3, 'q2': 1}, 'quiz', '1') == answers_key({'q2': 1.0, 'q1': 3}, 'quiz', '1')
+    assert answers_key({'q1': 3}, 'quiz', '1') != answers_key({'q1': 3}, 'quiz', '2')
+    assert answers_key({'q1': 3}, 'quiz', '1') != answers_key({'q1': 3}, 'assessment', '1')
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResultsCache(max_entries=2, ttl=60)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert cache.stats()['evictions'] == 1
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = ResultsCache(max_entries=10, ttl=30, clock=clock)
+    cache.put('a', 1)
+    clock.now = 29.9
+    assert cache.get('a') == 1
+    # A hit does not extend an entry's life
+    clock.now = 30
+    assert cache.get('a') is None
+    assert cache.stats()['expirations'] == 1
+
+    cache.put('a', 2)
+    clock.now = 59
+    assert cache.get('a') == 2
+
+
+def test_get_or_compute_counts_hits_and_misses():
+    cache = ResultsCache(max_entries=10, ttl=60)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    assert cache.get_or_compute('a', compute) == 1
+    assert cache.get_or_compute('a', compute) == 1
+    assert cache.get_or_compute('b', compute) == 2
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (1, 2, 2)
+    assert stats['hit_rate'] == 1 / 3
+
+
+def test_cached_none_is_a_hit():
+    cache = ResultsCache()
+    cache.put('a', None)
+    assert cache.get_or_compute('a', lambda: 'computed') is None
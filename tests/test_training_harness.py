@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from sklearn.model_selection import StratifiedKFold, cross_validate
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+import training_harness
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(240, 5))
+    y = (X[:, 0] + 0.5 * X[:, 1] + rng.normal(scale=0.5, size=240) > 0).astype(int)
+    return X, y
+
+
+def _models(*names):
+    candidates = training_harness.candidate_models()
+    return {name: candidates[name] for name in names}
+
+
+def test_matches_sklearn_cross_validate(tmp_path, data):
+    X, y = data
+    models = _models('Logistic Regression', 'Naive Bayes', 'Decision Tree')
+    table, folds = training_harness.cross_validate_models(X, y, models, n_splits=4, n_jobs=1, cache_dir=str(tmp_path))
+    assert len(folds) == 3 * 4
+
+    splitter = StratifiedKFold(n_splits=4, shuffle=True, random_state=training_harness.RANDOM_STATE)
+    for name, (estimator, scaled) in models.items():
+        estimator = make_pipeline(StandardScaler(), estimator) if scaled else estimator
+        expected = cross_validate(estimator, X, y, cv=splitter, scoring=['accuracy', 'precision', 'recall', 'f1'])
+        row = table.set_index('Model').loc[name]
+        for metric, key in [('Accuracy', 'accuracy'), ('Precision', 'precision'), ('Recall', 'recall'),
+                            ('F1-Score', 'f1')]:
+            assert row[metric] == pytest.approx(expected[f'test_{key}'].mean())
+            assert row[f'{metric}_Std'] == pytest.approx(expected[f'test_{key}'].std())
+
+
+def test_parallel_matches_serial(tmp_path, data):
+    X, y = data
+    models = _models('Naive Bayes', 'KNN')
+    serial, _ = training_harness.cross_validate_models(X, y, models, n_splits=3, n_jobs=1, cache_dir=str(tmp_path))
+    parallel, _ = training_harness.cross_validate_models(X, y, models, n_splits=3, n_jobs=2, cache_dir=str(tmp_path))
+    metrics = [column for column in serial.columns if column != 'Fit_Time']
+    assert serial[metrics].equals(parallel[metrics])
+    # Both runs share one fold cache
+    assert len(list(tmp_path.iterdir())) == 1